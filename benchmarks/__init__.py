@@ -0,0 +1,3 @@
+"""
+Notepad micro-benchmarks. Each module can be run on its own, e.g. `python -m benchmarks.piece_table`
+"""
@@ -0,0 +1,90 @@
+"""
+Shared benchmark helpers
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+import typing
+
+
+def summarize(name: str, samples: typing.List[float], **params) -> dict:
+    """Timing summary in microseconds"""
+    ordered = sorted(samples)
+    return {
+        "name": name,
+        **params,
+        "count": len(ordered),
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "p50_us": ordered[len(ordered) // 2] * 1e6,
+        "p99_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6,
+        "max_us": ordered[-1] * 1e6,
+    }
+
+
+def time_each(func: typing.Callable, args_list: typing.Iterable[tuple]) -> typing.List[float]:
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(results: typing.Iterable[dict]):
+    for result in results:
+        print(json.dumps(result))
+
+
+class FakeRoot:
+    """Stand-in for `tk.Tk` scheduling: callbacks only run when `run` is called"""
+
+    def __init__(self):
+        self.after_calls = {}
+        self._next_id = 0
+
+    def after(self, ms, func=None, *args):
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.after_calls[after_id] = (func, args)
+        return after_id
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        self.after_calls.pop(after_id, None)
+
+    def run(self):
+        calls, self.after_calls = self.after_calls, {}
+        for func, args in calls.values():
+            func(*args)
+
+
+class DisplayUnavailable(Exception):
+    pass
+
+
+def start_display():
+    """Start a virtual framebuffer when there is no display. Returns it, so it can be stopped"""
+    if os.environ.get("DISPLAY") or not sys.platform.startswith("linux"):
+        return None
+    try:
+        from pyvirtualdisplay import Display
+    except ImportError as e:
+        raise DisplayUnavailable("no display and pyvirtualdisplay is not installed") from e
+    return Display(visible=False).start()
+
+
+def rss_bytes() -> int:
+    """Current resident set size, or the peak where the current one is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource  # not available on windows
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
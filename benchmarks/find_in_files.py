@@ -0,0 +1,92 @@
+"""
+Find in Files throughput as worker processes are added: searches the same synthetic tree
+of log files with 1, 2, 4... workers, up to the number of cores
+
+    python -m benchmarks.find_in_files --files 400 --size-kb 1024
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import common
+from notepad.features import find_in_files, search
+
+MB = 1024 * 1024
+WORDS = ("request", "served", "cache", "miss", "user", "timeout", "retry", "disk", "queue", "ok")
+
+
+def synthetic_tree(root: Path, files: int, size: int) -> int:
+    """Log files spread over a few directories, with a rare "ERROR" line. Returns the total size"""
+    total = 0
+    for i in range(files):
+        directory = root / f"service{i % 8}"
+        directory.mkdir(exist_ok=True)
+        lines = []
+        written = 0
+        while written < size:
+            line = " ".join(random.choices(WORDS, k=12))
+            if random.random() < 0.001:
+                line = f"ERROR {line}"
+            lines.append(line)
+            written += len(line) + 1
+        text = "\n".join(lines) + "\n"
+        (directory / f"{i}.log").write_text(text)
+        total += len(text)
+    return total
+
+
+def job_counts(limit: int) -> list:
+    counts = [1]
+    while counts[-1] * 2 <= limit:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != limit:
+        counts.append(limit)
+    return counts
+
+
+def bench_find_in_files(root: Path, total: int, jobs: int, pattern: str, runs: int) -> dict:
+    query = search.Query(pattern, match_case=True)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        job = find_in_files.FindInFiles(str(root), query, jobs=jobs, max_results=10 ** 9).start()
+        job.join()
+        samples.append(time.perf_counter() - start)
+
+    best = min(samples)
+    return {
+        **common.summarize("find_in_files", samples, jobs=jobs, bytes=total),
+        "matches": len(job.hits),
+        "throughput_mb_s": total / best / MB,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--size-kb", type=int, default=1024)
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pattern", default="ERROR")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workdir", help="Where the synthetic tree is kept. Default: a temp dir")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with tempfile.TemporaryDirectory() as temp:
+        root = Path(args.workdir or temp)
+        root.mkdir(parents=True, exist_ok=True)
+        total = synthetic_tree(root, args.files, args.size_kb * 1024)
+
+        results = [bench_find_in_files(root, total, jobs, args.pattern, args.runs) for jobs in job_counts(args.max_jobs)]
+        for result in results:
+            result["speedup"] = result["throughput_mb_s"] / results[0]["throughput_mb_s"]
+        common.report(results)
+
+
+if __name__ == "__main__":
+    main()
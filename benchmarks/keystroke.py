@@ -0,0 +1,82 @@
+"""
+Per-keystroke cost of the status bar update, called directly on every key versus coalesced
+through the update scheduler
+
+    python -m benchmarks.keystroke --keys 100000 --keys-per-frame 50
+"""
+
+import argparse
+import logging
+import time
+
+from benchmarks import common
+from notepad.features import scheduler
+
+LOG = logging.getLogger("benchmarks.keystroke")
+
+
+class FakeStatus:
+    def __init__(self):
+        self.value = ""
+
+    def set(self, value):
+        self.value = value
+
+
+def make_update_location(status: FakeStatus):
+    """Same work as `Notepad._update_location`, against a fixed index"""
+
+    def update_location(*args, **kwargs):
+        x, y = "1234.56".split(".")
+        LOG.debug("Updating location (%s, %s) after %s", x, y, args)
+        status.set(f"Ln {x}, Col {int(y) + 1}")
+
+    return update_location
+
+
+def bench_direct(keys: int, keys_per_frame: int) -> dict:
+    update = make_update_location(FakeStatus())
+    start = time.perf_counter()
+    for _ in range(keys):
+        update("<KeyPress event>")
+    elapsed = time.perf_counter() - start
+    return {"name": "keystroke.direct", "keys": keys, "updates": keys, "per_key_us": elapsed / keys * 1e6}
+
+
+def bench_coalesced(keys: int, keys_per_frame: int) -> dict:
+    root = common.FakeRoot()
+    updates = scheduler.UpdateScheduler(root)
+    status = FakeStatus()
+    calls = 0
+    update = make_update_location(status)
+
+    def counted_update():
+        nonlocal calls
+        calls += 1
+        update()
+
+    updates.register("location", counted_update)
+
+    start = time.perf_counter()
+    for key in range(keys):
+        updates.request("location", "<KeyPress event>")
+        if key % keys_per_frame == keys_per_frame - 1:
+            root.run()
+    root.run()
+    elapsed = time.perf_counter() - start
+    return {"name": "keystroke.coalesced", "keys": keys, "updates": calls, "per_key_us": elapsed / keys * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--keys-per-frame", type=int, default=50, help="Key repeat or paste burst")
+    args = parser.parse_args()
+
+    common.report(
+        [bench_direct(args.keys, args.keys_per_frame), bench_coalesced(args.keys, args.keys_per_frame)]
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Piece table micro-benchmarks: inserts and deletes at random positions in a large document
+
+    python -m benchmarks.piece_table --size-mb 100 --edits 10000
+"""
+
+import argparse
+import random
+
+from benchmarks import common
+from notepad.features import piece_table
+
+MB = 1024 * 1024
+
+
+def random_offsets(size: int, count: int) -> list:
+    return [random.randrange(size) for _ in range(count)]
+
+
+def bench_piece_table(size: int, edits: int) -> list:
+    table = piece_table.PieceTable("x" * size)
+
+    inserts = common.time_each(table.insert, ((o, "abc") for o in random_offsets(size, edits)))
+    inserted = common.summarize("piece_table.insert", inserts, size=size, pieces=table.piece_count)
+
+    deletes = common.time_each(table.delete, ((o, 3) for o in random_offsets(size, edits)))
+    deleted = common.summarize("piece_table.delete", deletes, size=size, pieces=table.piece_count)
+    return [inserted, deleted]
+
+
+def bench_typing(size: int, keys: int) -> list:
+    """Characters typed one after the other in the middle of the document, like a user would"""
+    table = piece_table.PieceTable("x" * size)
+    offsets = range(size // 2, size // 2 + keys)
+    typed = common.time_each(table.insert, ((o, "a") for o in offsets))
+    return [common.summarize("piece_table.typing", typed, size=size, pieces=table.piece_count)]
+
+
+def bench_str(size: int, edits: int) -> list:
+    """Baseline: what a plain string costs per edit"""
+    text = "x" * size
+
+    def insert(offset):
+        nonlocal text
+        text = text[:offset] + "abc" + text[offset:]
+
+    inserts = common.time_each(insert, ((o,) for o in random_offsets(size, edits)))
+    return [common.summarize("str.insert", inserts, size=size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--edits", type=int, default=10_000)
+    parser.add_argument("--baseline-edits", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    size = args.size_mb * MB
+    common.report(bench_piece_table(size, args.edits))
+    common.report(bench_typing(size, args.edits))
+    common.report(bench_str(size, args.baseline_edits))
+
+
+if __name__ == "__main__":
+    main()
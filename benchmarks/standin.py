@@ -0,0 +1,46 @@
+"""
+Headless stand-in for the notepad text area, so hot paths can be benchmarked without a display
+"""
+
+import typing
+
+from notepad import document
+
+
+class TextStandIn:
+    """
+    The subset of `tk.Text` the app drives, backed by the same document model. Indexes are
+    "line.column", "end", "end-1c" or a mark name.
+    """
+
+    def __init__(self):
+        self.document = document.Document()
+        self._marks: typing.Dict[str, int] = {"insert": 0}
+
+    def _offset(self, index: str) -> int:
+        if index in ("end", "end-1c"):
+            return len(self.document)
+        if index in self._marks:
+            return min(self._marks[index], len(self.document))
+        line, column = index.split(".")
+        return self.document.offset(int(line), int(column))
+
+    def index(self, index: str) -> str:
+        return self.document.index(self._offset(index))
+
+    def mark_set(self, mark: str, index: str):
+        self._marks[mark] = self._offset(index)
+
+    def insert(self, index: str, chars: str):
+        offset = self._offset(index)
+        self.document.insert(offset, chars)
+        if self._marks["insert"] >= offset:
+            self._marks["insert"] += len(chars)
+
+    def delete(self, start: str, end: typing.Optional[str] = None):
+        first = self._offset(start)
+        last = self._offset(end) if end is not None else first + 1
+        self.document.delete(first, last - first)
+
+    def get(self, start: str = "1.0", end: str = "end") -> str:
+        return self.document.get(self._offset(start), self._offset(end))
@@ -0,0 +1,316 @@
+"""
+Headless benchmark suite for the open, save, find, paste and keystroke hot paths
+
+    python -m benchmarks --sizes 1K,1M,100M --out results.json
+    python -m benchmarks --compare results.json
+
+Runs against a real notepad window when a display (or pyvirtualdisplay) is available,
+otherwise against a text widget stand-in backed by the same document model.
+Files from LARGE_FILE_THRESHOLD up open in the read only large file viewer, so for them the
+first window, the line index and scrolling are timed instead (as "large-*" results).
+"""
+
+from pathlib import Path
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import typing
+
+from benchmarks import common, standin
+from notepad import constants
+from notepad.features import largefile, line_index, loader, saver, scheduler, search
+
+import notepad
+
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+LINE_LENGTHS = {"many-lines": 80, "long-lines": 1024 ** 2}
+DEFAULT_SIZES = "1K,1M,10M"
+FIND_PATTERN = "needle"
+PASTE_SIZE = 64 * 1024
+LARGE_FILE_SCROLLS = 50
+
+
+def parse_size(size: str) -> int:
+    size = size.strip().upper()
+    if size[-1] in UNITS:
+        return int(float(size[:-1]) * UNITS[size[-1]])
+    return int(size)
+
+
+def synthetic_file(directory: Path, size: int, variant: str) -> Path:
+    """`size` bytes of text, lines of the variant's length, with a findable word in each line"""
+    path = directory / f"{variant}-{size}.txt"
+    if path.exists() and path.stat().st_size == size:
+        return path
+
+    line_length = LINE_LENGTHS[variant]
+    words = "lorem ipsum dolor sit amet " * (line_length // 27 + 1)
+    line = (FIND_PATTERN + " " + words)[: line_length - 1] + "\n"
+    block = line * max(1, (1024 ** 2) // len(line))
+    with open(path, "w") as f:
+        written = 0
+        while written < size:
+            written += f.write(block[: size - written])
+    return path
+
+
+class StandInBackend:
+    name = "standin"
+
+    def __init__(self):
+        self.text = standin.TextStandIn()
+        self.root = common.FakeRoot()
+        self.updates = scheduler.UpdateScheduler(self.root)
+        self.updates.register("location", lambda: self.text.index("insert"))
+
+    def open(self, path: Path) -> dict:
+        start = time.perf_counter()
+        first_chunk = None
+        load = loader.StreamingLoad(path).start()
+        while not load.done:
+            chunks = load.drain(4)
+            if not chunks:
+                time.sleep(0.0005)  # let the reader thread run
+            for chunk in chunks:
+                self.text.document.insert(len(self.text.document), chunk.text, notify=False)
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+        seconds = time.perf_counter() - start
+        return {"seconds": seconds, "first_chunk_s": first_chunk or seconds}
+
+    def save(self, path: Path) -> dict:
+        chunks = self.text.document.text.snapshot().iter_chunks()
+        result = saver.save(chunks, path)
+        return {"seconds": result.seconds, "throughput_mb_s": result.throughput / saver.MB}
+
+    def find(self, pattern: str) -> dict:
+        start = time.perf_counter()
+        job = search.SearchJob(self.text.document.text.snapshot(), search.Query(pattern)).start()
+        job._thread.join()
+        return {"seconds": time.perf_counter() - start, "matches": len(job.starts)}
+
+    def paste(self, text: str):
+        self.text.insert("insert", text)
+
+    def keystroke(self, char: str):
+        self.text.insert("insert", char)
+        self.updates.request("location")
+        self.root.run()
+
+    def move_cursor(self, fraction: float):
+        self.text.mark_set("insert", self.text.document.index(int(len(self.text.document) * fraction)))
+
+    def open_large(self, path: Path) -> dict:
+        start = time.perf_counter()
+        self.large_file = largefile.MappedFile(path)
+        self.large_file.read_window(0, max_lines=constants.LARGE_FILE_WINDOW_LINES)
+        first_window = time.perf_counter() - start
+        line_index.LineIndex.from_buffer(self.large_file.buffer)
+        return {"seconds": first_window, "index_s": time.perf_counter() - start}
+
+    def scroll_large(self, fraction: float):
+        offset = self.large_file.offset_at_fraction(fraction)
+        self.large_file.read_window(offset, max_lines=constants.LARGE_FILE_WINDOW_LINES)
+
+    def close(self):
+        if getattr(self, "large_file", None) is not None:
+            self.large_file.close()
+
+
+class TkBackend:
+    name = "tk"
+
+    def __init__(self):
+        self._display = common.start_display()
+
+        import tkinter as tk
+        from notepad import app
+
+        try:
+            self.notepad = app.Notepad(root=tk.Tk())
+        except tk.TclError as e:
+            raise common.DisplayUnavailable(str(e)) from e
+        self.root = self.notepad._root
+
+    def _wait(self, done: typing.Callable[[], bool]):
+        while not done():
+            self.root.update()
+
+    def open(self, path: Path) -> dict:
+        start = time.perf_counter()
+        first_chunk = None
+        self.notepad._helper_open_file(path)
+        while self.notepad._load is not None:
+            self.root.update()
+            if first_chunk is None and len(self.notepad._document):
+                first_chunk = time.perf_counter() - start
+        seconds = time.perf_counter() - start
+        return {"seconds": seconds, "first_chunk_s": first_chunk or seconds}
+
+    def save(self, path: Path) -> dict:
+        start = time.perf_counter()
+        self.notepad._helper_save_text(path)
+        self._wait(lambda: self.notepad._save is None)
+        return {"seconds": time.perf_counter() - start}
+
+    def find(self, pattern: str) -> dict:
+        start = time.perf_counter()
+        self.notepad._helper_start_search(search.Query(pattern))
+        job = self.notepad._search_job
+        self._wait(lambda: job is None or job.done)
+        self.notepad._helper_stop_search()
+        return {"seconds": time.perf_counter() - start, "matches": len(job.starts) if job else 0}
+
+    def paste(self, text: str):
+        self.notepad._text_area.insert("insert", text)
+        self.root.update_idletasks()
+
+    def keystroke(self, char: str):
+        self.notepad._text_area.insert("insert", char)
+        self.notepad._updates.request("location")
+        self.root.update()
+
+    def move_cursor(self, fraction: float):
+        offset = int(len(self.notepad._document) * fraction)
+        self.notepad._text_area.mark_set("insert", self.notepad._document.index(offset))
+
+    def open_large(self, path: Path) -> dict:
+        start = time.perf_counter()
+        self.notepad._helper_open_file(path)
+        if self.notepad._large_file is None:
+            raise RuntimeError(f"{path} did not open in the large file viewer")
+        self.root.update_idletasks()
+        first_window = time.perf_counter() - start
+        self._wait(lambda: self.notepad._large_file_index is not None)
+        return {"seconds": first_window, "index_s": time.perf_counter() - start}
+
+    def scroll_large(self, fraction: float):
+        self.notepad._helper_scroll_large_file("moveto", str(fraction))
+        self.root.update_idletasks()
+
+    def close(self):
+        self.notepad._helper_discard_journal()
+        self.notepad._manager.watcher.close()
+        self.root.destroy()
+        if self._display is not None:
+            self._display.stop()
+
+
+BACKENDS = {"standin": StandInBackend, "tk": TkBackend}
+
+
+def resolve_backend(name: str) -> str:
+    if name != "auto":
+        return name
+    try:
+        TkBackend().close()
+    except common.DisplayUnavailable as e:
+        print(f"Using the text widget stand-in: {e}", file=sys.stderr)
+        return StandInBackend.name
+    return TkBackend.name
+
+
+def run_large_file(backend, path: Path, params: dict) -> typing.List[dict]:
+    """The viewer is read only and Find sees only its window: save, paste and typing do not apply"""
+    opened = backend.open_large(path)
+    results = [
+        {"name": "large-open", **params, "seconds": opened["seconds"]},
+        {"name": "large-index", **params, "seconds": opened["index_s"]},
+    ]
+    fractions = [(random.random(),) for _ in range(LARGE_FILE_SCROLLS)]
+    summary = common.summarize("large-scroll", common.time_each(backend.scroll_large, fractions), **params)
+    results.append({**summary, "seconds": summary["mean_us"] / 1e6})
+    return results
+
+
+def run_file(backend_name: str, path: Path, size: int, variant: str, keystrokes: int) -> typing.List[dict]:
+    backend = BACKENDS[backend_name]()
+    params = {"backend": backend.name, "size": size, "variant": variant}
+    if size >= constants.LARGE_FILE_THRESHOLD:
+        try:
+            return run_large_file(backend, path, params)
+        finally:
+            backend.close()
+
+    try:
+        results = [{"name": "open", **params, **backend.open(path)}]
+        results.append({"name": "save", **params, **backend.save(path.with_suffix(".saved"))})
+        results.append({"name": "find", **params, **backend.find(FIND_PATTERN)})
+
+        backend.move_cursor(0.5)
+        paste = common.time_each(backend.paste, [("x" * PASTE_SIZE,)])
+        results.append({"name": "paste", **params, "seconds": paste[0], "paste_size": PASTE_SIZE})
+
+        backend.move_cursor(random.random())
+        samples = common.time_each(backend.keystroke, [("x",)] * keystrokes)
+        summary = common.summarize("keystroke", samples, **params)
+        results.append({**summary, "seconds": summary["mean_us"] / 1e6})
+    finally:
+        backend.close()
+        path.with_suffix(".saved").unlink(missing_ok=True)
+    return results
+
+
+def compare(results: typing.List[dict], baseline_path: str, threshold: float) -> typing.List[str]:
+    def key(result):
+        return result["name"], result["backend"], result["size"], result["variant"]
+
+    with open(baseline_path) as f:
+        baseline = {key(result): result for result in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        before = baseline.get(key(result))
+        if before and before["seconds"] and result["seconds"] > before["seconds"] * threshold:
+            ratio = result["seconds"] / before["seconds"]
+            regressions.append(f"{' '.join(map(str, key(result)))}: {ratio:.2f}x slower")
+    return regressions
+
+
+def main(argv: typing.Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma separated, e.g. 1K,1M,1G")
+    parser.add_argument("--variants", default=",".join(LINE_LENGTHS), help="Comma separated")
+    parser.add_argument("--backend", default="auto", choices=["auto", *BACKENDS])
+    parser.add_argument("--keystrokes", type=int, default=200)
+    parser.add_argument("--workdir", help="Where synthetic files are kept. Default: a temp dir")
+    parser.add_argument("--out", help="Write all results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Fail if slower than a previous --out")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed slowdown ratio")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    backend = resolve_backend(args.backend)
+    with tempfile.TemporaryDirectory() as temp:
+        workdir = Path(args.workdir or temp)
+        workdir.mkdir(parents=True, exist_ok=True)
+
+        results = []
+        for size in map(parse_size, args.sizes.split(",")):
+            for variant in args.variants.split(","):
+                path = synthetic_file(workdir, size, variant)
+                file_results = run_file(backend, path, size, variant, args.keystrokes)
+                common.report(file_results)
+                results.extend(file_results)
+
+    if args.out:
+        meta = {
+            "notepad": notepad.__version__,
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            "time": time.time(),
+        }
+        with open(args.out, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,58 @@
+"""
+Memory and open latency with many notepad windows sharing one event loop
+
+    python -m benchmarks.windows --windows 100
+
+Needs a display, or pyvirtualdisplay to start a virtual one.
+"""
+
+import argparse
+import sys
+
+from benchmarks import common
+
+
+def bench_windows(count: int) -> list:
+    display = common.start_display()
+    from notepad import manager
+
+    window_manager = manager.WindowManager()
+    window_manager.root.update()
+    rss_before = common.rss_bytes()
+
+    def open_window():
+        window_manager.open_window()
+        window_manager.root.update()
+
+    latencies = common.time_each(open_window, [()] * count)
+    rss_after = common.rss_bytes()
+
+    window_manager.root.destroy()
+    if display is not None:
+        display.stop()
+
+    return [
+        common.summarize("windows.open", latencies, windows=count),
+        {
+            "name": "windows.rss",
+            "windows": count,
+            "rss_before_mb": rss_before / 1024 ** 2,
+            "rss_after_mb": rss_after / 1024 ** 2,
+            "per_window_kb": (rss_after - rss_before) / count / 1024,
+        },
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--windows", type=int, default=100)
+    args = parser.parse_args()
+
+    try:
+        common.report(bench_windows(args.windows))
+    except common.DisplayUnavailable as e:
+        sys.exit(f"Cannot benchmark windows: {e}")
+
+
+if __name__ == "__main__":
+    main()
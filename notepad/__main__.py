@@ -1,21 +1,60 @@
+import time
+
+STARTED = time.perf_counter()
 
 import argparse
+import sys
 
-from notepad.features import logger
-from notepad import app
+from notepad.features import logger, startup
 
 import notepad
 
 HELP_TEXT = f"""{notepad.__doc__}
-VERSION: {notepad.__version__}"""
+VERSION: {notepad.__version__}
+
+Run "python -m notepad batch --help" to edit files without a window."""
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["batch"]:
+        # headless: decided before anything imports tkinter
+        from notepad import batch
+
+        sys.exit(batch.main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(description=HELP_TEXT)
     parser.add_argument(
         "-v", action="count", default=0, help="Change log level. Default: no logging."
     )
-    logger.configure_logging(parser.parse_args().v)
+    parser.add_argument(
+        "--profile-out",
+        metavar="FILE",
+        help="Record per-method timing histograms and write them to FILE as JSON on exit.",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Print the time spent in each startup phase until the first paint.",
+    )
+    args = parser.parse_args()
+    logger.configure_logging(args.v, profile=bool(args.profile_out))
+    if args.startup_profile:
+        startup.enable(STARTED)
+        startup.mark("arguments")
+
+    # imported after logging is configured: decorators depend on it
+    from notepad import app, constants, manager
+
+    startup.mark("import app")
+
+    window_manager = manager.WindowManager(
+        session_file=constants.SESSION_FILE, keymap_file=constants.KEYMAP_FILE
+    )
+    recovered = window_manager.recover_windows()
+    restored = window_manager.restore_session()
+    if not recovered and not restored:
+        window_manager.open_window()
+    window_manager.run()
 
-    notepad = app.Notepad()
-    notepad.run()
+    if args.profile_out:
+        logger.dump_timings(args.profile_out)
@@ -1,62 +1,154 @@
-from functools import lru_cache
+from functools import partial
 from pathlib import Path
 from tkinter import ttk
+import os
 import sys
 import tkinter as tk
-import tkinter.filedialog as tkfd
-import tkinter.messagebox as tkm
+import threading
 import typing
 
 import notepad
-from notepad import constants, window, menu
-from notepad.features import shortcuts, themes, logger
+from notepad import constants, document, lazy, manager, window, menu
+from notepad.features import (
+    actions,
+    compression,
+    encoding,
+    find_in_files,
+    fonts,
+    highlight,
+    journal,
+    keymap,
+    largefile,
+    line_index,
+    loader,
+    long_lines,
+    saver,
+    scheduler,
+    search,
+    session,
+    shortcuts,
+    startup,
+    stats,
+    themes,
+    undo,
+    watcher,
+    logger,
+)
+
+# the text widget's command: edits go through python to be mirrored, everything else straight to tk
+TEXT_PROXY = """
+if {$command in {insert delete replace}} {
+    lassign [%(mirror)s $command {*}$args] code result
+    return -code $code $result
+}
+%(view)s $command {*}$args
+"""
 
-class Notepad:
+# dialogs are only imported the first time one is opened
+tkfd = lazy.LazyModule("tkinter.filedialog")
+tkm = lazy.LazyModule("tkinter.messagebox")
+tksd = lazy.LazyModule("tkinter.simpledialog")
 
-    _root = tk.Tk()
-    _is_status_bar_visible = tk.BooleanVar()
-    _wrap_words = tk.BooleanVar()
 
-    _file: typing.Optional[Path] = None
+@actions.registered  # methods named `action_{menu}_{option}` are menu option commands
+class Notepad:
 
-    status_location = tk.StringVar()
-    status_location.set("Ln 1, Col 1")
+    _file: typing.Optional[Path] = None
+    _load: typing.Optional[loader.StreamingLoad] = None
+    _save: typing.Optional[saver.BackgroundSave] = None
+    _search_query: typing.Optional[search.Query] = None
+    _search_job: typing.Optional[search.SearchJob] = None
+    _find_job: typing.Optional[search.FindJob] = None  # Find Next, Find Previous or Replace All
+    _search_restart: typing.Optional[str] = None
+    _large_file: typing.Optional[largefile.MappedFile] = None
+    _large_file_index: typing.Optional[line_index.LineIndex] = None
+    _large_file_view_line: typing.Optional[int] = None
+    _large_file_lines: typing.Sequence[str] = ()
+    _highlighter: typing.Optional[highlight.Highlighter] = None
+    _long_lines: typing.Optional[long_lines.LineSegmenter] = None
+    _wrap_before_long_lines: typing.Optional[str] = None
+    _undecodable: int = 0  # invalid byte sequences in the file: it is then read only
+    _zoom: int = fonts.DEFAULT_ZOOM
+    _dirty: bool = False
+    _edits: int = 0  # document edits so far, to tell whether a save is still current
+    _saved_edits: int = 0
+    _journal: typing.Optional[journal.Journal] = None
+    _journal_base: typing.Optional[journal.Base] = None
+    _journal_job: typing.Optional[str] = None
+    _zoom_job: typing.Optional[str] = None
+    _tail: typing.Optional[watcher.Tail] = None
+    _follow_job: typing.Optional[str] = None
+    _restore: typing.Optional[session.DocumentState] = None  # shown once the load reaches it
+    _go_to_line: typing.Optional[int] = None  # 1-based, shown once the load reaches it
 
-    status_zoom: str = "100%"  # todo
     status_platform: str = sys.platform
-    status_encoding: str = "UTF-8"  # todo
-
-    theme = tk.StringVar()
-    theme.set("light")  # because most developers love this
-
-    variable_bindings = {
-        "view_status_bar": _is_status_bar_visible,
-        "format_wrap_words": _wrap_words,
-    }
 
     @logger.log_info
-    def __init__(self, root=None, window_dimension: window.WindowDimension = window.WindowDimension()):
+    def __init__(
+        self,
+        root=None,
+        window_dimension: window.WindowDimension = window.WindowDimension(),
+        manager: typing.Optional["manager.WindowManager"] = None,
+    ):
         """
         root: specify top level root. initiated by "File>New Window"
         window_dimension: specifically for window start up
+        manager: shares the event loop, theme and shortcuts between windows
         """
-        self._initialize_root(root)
+        self._initialize_root(root, manager)
+        self._initialize_variables()
+        startup.mark("root")
         self._set_window_size(window_dimension)
         self._create_menu_bar()
+        startup.mark("menu bar")
         self._create_text()
+        startup.mark("text area")
         self._create_scrollbar()
         self._create_status_bar()
+        startup.mark("status bar")
+
+        if startup.is_enabled():
+            self._root.bind("<Expose>", self._helper_first_paint)  # the toplevel's, or any child's
 
     @logger.log_debug
-    def _initialize_root(self, root):
-        if root:
-            self._root = root
+    def _initialize_root(self, root, window_manager):
+        self._root = root or tk.Tk()
+        self._manager = window_manager or manager.WindowManager(self._root)
+        self._manager.register(self)
         self._root.wm_iconbitmap(constants.DEFAULT_WINDOW_ICON)
+        self._updates = scheduler.UpdateScheduler(self._root)
         self._set_window_title()
 
+    def _initialize_variables(self):
+        """tkinter variables need a root, so they are only created with the window"""
+        self._is_status_bar_visible = tk.BooleanVar(self._root)
+        self._wrap_words = tk.BooleanVar(self._root)
+        self._following = tk.BooleanVar(self._root)
+
+        self.status_location = tk.StringVar(self._root, value="Ln 1, Col 1")
+        self.status_activity = tk.StringVar(self._root)
+        self.status_zoom = tk.StringVar(self._root, value=f"{self._zoom}%")
+        self.status_encoding = tk.StringVar(self._root)
+        self.status_eol = tk.StringVar(self._root)
+        self.status_stats = tk.StringVar(self._root)
+        self._helper_show_encoding(encoding.DEFAULT_ENCODING, os.linesep)
+
+        self.theme = self._manager.theme
+
+        self.variable_bindings = {
+            "view_status_bar": self._is_status_bar_visible,
+            "format_wrap_words": self._wrap_words,
+            "view_follow": self._following,
+        }
+
+    def _helper_first_paint(self, event):
+        self._root.unbind("<Expose>")
+        startup.mark("first paint")
+        print(startup.report())
+
     @logger.log_debug
-    def _set_window_title(self, current: typing.Optional[str] = None):
-        self._root.title(window.get_title(current))
+    def _set_window_title(self):
+        self._root.title(window.get_title(self._file and Path(self._file).name, dirty=self._dirty))
 
     @logger.log_debug
     def _set_window_size(self, window_dimension: window.WindowDimension):
@@ -67,15 +159,20 @@ class Notepad:
         self._root.geometry(geometry)
 
     def _helper_sub_menu(self, menu_label: str, options: tuple) -> tk.Menu:
+        """Entries are only built the first time the menu is posted. Shortcuts live in the manager"""
         sub_menu = tk.Menu(self._menu_bar, tearoff=0)
-        for option_label in options:
-            option = menu.MenuOption(menu_label, option_label, self)
+        sub_menu.configure(
+            postcommand=partial(self._helper_populate_sub_menu, sub_menu, menu_label, options)
+        )
+        return sub_menu
 
-            if option.has_shortcut:
-                self._root.bind_all(option.shortcut.key_binding, option.command)
+    def _helper_populate_sub_menu(self, sub_menu: tk.Menu, menu_label: str, options: tuple):
+        if sub_menu.index(tk.END) is not None:
+            return
 
+        for option_label in options:
+            option = menu.MenuOption(menu_label, option_label, self)
             getattr(sub_menu, option.widget_function)(**option.args)
-        return sub_menu
 
     @logger.log_debug
     def _create_menu_bar(self):
@@ -90,10 +187,13 @@ class Notepad:
         self._status_bar = tk.Frame(self._text_area)
 
         for var, width in (
+            (self.status_eol, 25),
             (self.status_encoding, 50),
             (self.status_platform, 25),
             (self.status_zoom, 15),
             (self.status_location, 75),
+            (self.status_stats, 50),
+            (self.status_activity, 75),
         ):
             try:
                 padx = width - len(var)
@@ -109,8 +209,20 @@ class Notepad:
 
     def _update_location(self, *args, **kwargs):
         x, y = self._text_area.index(tk.INSERT).split(".")
+        if self._large_file is not None:
+            if self._large_file_index is None:
+                self.status_location.set("Ln ?, Col ?")
+                return
+            if self._large_file_view_line is None:
+                self._large_file_view_line = self._large_file_index.line_of(self._large_file_view.start)
+            x = self._large_file_view_line + int(x)
+        elif self._long_lines:
+            line, column = self._document.lines.position(self._helper_text_offset(tk.INSERT))
+            x, y = line + 1, column
+
         logger.LOG.debug("Updating location (%s, %s) after %s", x, y, args)
         self.status_location.set(f"Ln {x}, Col {int(y) + 1}")
+        self._manager.session_changed()
 
     @logger.log_debug
     def _create_text(self):
@@ -118,47 +230,207 @@ class Notepad:
         self._root.grid_columnconfigure(0, weight=1)
         self._text_area = tk.Text(self._root)
         self._text_area.grid(sticky=tk.N + tk.E + tk.S + tk.W)
-
-        self._text_area.bindtags(("Text", "post-class-bindings", ".", "all"))
-        self._text_area.bind_class("post-class-bindings", "<KeyPress>", self._update_location)
-        self._text_area.bind_class("post-class-bindings", "<Button-1>", self._update_location)
+        self._document = document.Document()
+        self._helper_track_edits()
+        self._history = undo.UndoHistory(
+            self._document, max_bytes=constants.UNDO_MAX_BYTES, max_spill_bytes=constants.UNDO_SPILL_BYTES
+        )
+        self._document.subscribe(self._history.record)
+        self._document.subscribe(self._helper_on_document_edit)
+        self._stats = stats.DocumentStats(self._document)
+        self._document.subscribe(self._stats.edited)
+        self._text_area.tag_configure("found", background=constants.SEARCH_HIGHLIGHT_COLOR)
+        for tag in highlight.TAGS:
+            self._text_area.tag_configure(f"syntax_{tag}", foreground=constants.SYNTAX_COLORS[tag])
+
+        # the widget's own tag comes before "Text", so its bindings (wheel zoom) can break out of
+        # the class bindings
+        self._text_area.bindtags(
+            (keymap.BINDTAG, str(self._text_area), "Text", "post-class-bindings", str(self._root), "all")
+        )
+        self._updates.register("location", self._update_location)
+        self._updates.register("search_highlight", self._helper_highlight_matches)
+        self._updates.register("syntax", self._helper_highlight_syntax)
+        self._updates.register("stats", self._helper_update_stats)
+        self._root.bind("<Escape>", self._cancel_load)
         self._set_theme()
 
+    def _helper_track_edits(self):
+        """
+        Intercept the text widget's tcl command so every edit is mirrored into the document.
+        The proxy is a tcl proc: only edits reach python, and errors stay tcl errors, so the
+        `catch` probes of tk's text bindings still see them
+        """
+        widget = self._text_area
+        self._text_area_command = f"{widget._w}_view"
+        mirror = f"{widget._w}_mirror"
+        widget.tk.call("rename", widget._w, self._text_area_command)
+        widget.tk.createcommand(mirror, self._helper_text_command)
+        proxy = TEXT_PROXY % {"mirror": mirror, "view": self._text_area_command}
+        widget.tk.call("proc", widget._w, "command args", proxy)
+        widget._tclCommands = (widget._tclCommands or []) + [widget._w, mirror]
+
+    def _helper_view(self, *args):
+        """Call the text widget directly, without touching the document"""
+        return self._text_area.tk.call((self._text_area_command,) + args)
+
+    def _helper_text_offset(self, index: str) -> int:
+        line, column = str(self._helper_view("index", index)).split(".")
+        if self._long_lines:
+            return self._long_lines.document_offset(self._document.lines, int(line) - 1, int(column))
+        return self._document.offset(int(line), int(column))
+
+    def _helper_index(self, offset: int) -> str:
+        """Text widget index of a document offset"""
+        if self._long_lines:
+            line, column = self._long_lines.view_position(self._document.lines, offset)
+            return f"{line + 1}.{column}"
+        return self._document.index(offset)
+
+    def _helper_is_tracking_edits(self) -> bool:
+        return (
+            self._large_file is None
+            and not self._long_lines
+            and str(self._helper_view("cget", "-state")) == tk.NORMAL
+        )
+
+    def _helper_text_command(self, command: str, *args) -> tuple:
+        """
+        An edit, as a (tcl return code, result) pair. A python exception here would not be a
+        tcl error a `catch` can handle: it would end the event loop
+        """
+        try:
+            if self._helper_is_tracking_edits():
+                return "ok", getattr(self, f"_helper_text_{command}")(*args)
+            return "ok", self._helper_view(command, *args)
+        except tk.TclError as e:  # the view rejected the edit, so the document was not changed
+            return "error", str(e)
+
+    def _helper_text_insert(self, index: str, *chars_and_tags):
+        offset = self._helper_text_offset(index)
+        result = self._helper_view("insert", index, *chars_and_tags)
+        self._document.insert(offset, "".join(chars_and_tags[::2]))
+        return result
+
+    def _helper_text_delete(self, *indexes):
+        ranges = []
+        for i in range(0, len(indexes), 2):
+            start = self._helper_text_offset(indexes[i])
+            end = self._helper_text_offset(indexes[i + 1]) if i + 1 < len(indexes) else start + 1
+            ranges.append((start, end))
+
+        result = self._helper_view("delete", *indexes)
+        for start, end in sorted(ranges, reverse=True):
+            self._document.delete(start, end - start)
+        return result
+
+    def _helper_text_replace(self, start: str, end: str, *chars_and_tags):
+        start_offset = self._helper_text_offset(start)
+        end_offset = self._helper_text_offset(end)
+        result = self._helper_view("replace", start, end, *chars_and_tags)
+        self._document.replace(start_offset, end_offset - start_offset, "".join(chars_and_tags[::2]))
+        return result
+
+    def _helper_reset_document(self):
+        self._helper_stop_search()
+        self._helper_leave_long_lines()
+        self._history.clear()
+        self._helper_discard_journal()
+        self._journal_base = None
+        self._dirty = False
+        self._restore = None
+        self._go_to_line = None
+        if self._undecodable:
+            self._undecodable = 0
+            self._text_area.configure(state=tk.NORMAL)
+        self._document.reset()
+        self._stats.reset()
+        self._updates.request("stats")
+        self._helper_view("delete", "1.0", tk.END)
+        self._highlighter = highlight.highlighter_for(self._file)
+        self._helper_show_encoding(self._document.encoding, self._document.newline)
+
+    def _helper_show_encoding(self, file_encoding: str, newline: typing.Optional[str]):
+        self.status_encoding.set(encoding.display_name(file_encoding))
+        self.status_eol.set(encoding.newline_name(newline))
+
     @logger.log_info
-    def _set_theme(self):
-        theme = themes.get_theme(self.theme.get())
-        self._text_area.configure(**theme.as_dict())
+    def _set_theme(self, theme: typing.Optional[themes.Theme] = None):
+        theme = theme or themes.get_theme(self.theme.get())
+        options = theme.as_dict()
+        options.pop("font", None)  # fonts come from the shared cache, at this window's zoom
+        self._text_area.configure(**options)
+        self._font = (theme.font_style, theme.font_size or themes.DEFAULT_FONT_SIZE)
+        self._helper_apply_zoom()
+
+    def _helper_apply_zoom(self):
+        self._zoom_job = None
+        family, size = self._font
+        font = self._manager.fonts.get(family, fonts.zoomed_size(size, self._zoom))
+        if str(self._text_area.cget("font")) != str(font):
+            self._text_area.configure(font=font)
+
+    def _helper_zoom(self, zoom: int):
+        """The status bar follows at once, the text is relaid out once zooming pauses"""
+        self._zoom = zoom
+        self.status_zoom.set(f"{zoom}%")
+        if self._zoom_job is not None:
+            self._root.after_cancel(self._zoom_job)
+        self._zoom_job = self._root.after(constants.ZOOM_SETTLE_MS, self._helper_apply_zoom)
+        self._manager.session_changed()
+
+    def _helper_wheel_zoom(self, event):
+        notches = 1 if event.num == 4 or event.delta > 0 else -1
+        self._helper_zoom(fonts.step_zoom(self._zoom, notches))
+        return "break"
 
     @logger.log_debug
     def _create_scrollbar(self):
-        scroll_bar = tk.Scrollbar(self._text_area)
-        scroll_bar.pack(side=tk.RIGHT, fill=tk.Y)
-        scroll_bar.config(command=self._text_area.yview)
-        self._text_area.config(yscrollcommand=scroll_bar.set)
+        self._scroll_bar = tk.Scrollbar(self._text_area)
+        self._scroll_bar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._attach_scrollbar_to_text()
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self._text_area.bind(sequence, self._helper_wheel_large_file)
+            self._text_area.bind(f"<Control-{sequence[1:]}", self._helper_wheel_zoom)
+
+    def _attach_scrollbar_to_text(self):
+        self._scroll_bar.config(command=self._text_area.yview)
+        self._text_area.config(yscrollcommand=self._helper_on_text_scroll)
+
+    def _helper_on_text_scroll(self, first: str, last: str):
+        self._scroll_bar.set(first, last)
+        self._updates.request("search_highlight")
+        self._updates.request("syntax")
+        self._manager.session_changed()
+
+    def _helper_visible_lines(self) -> typing.Tuple[int, int]:
+        """1-based first and last visible lines, plus a margin above and below"""
+        top = int(str(self._helper_view("index", "@0,0")).split(".")[0])
+        height = self._text_area.winfo_height()
+        bottom = int(str(self._helper_view("index", f"@0,{height}")).split(".")[0])
+
+        margin = constants.VISIBLE_MARGIN_LINES
+        return max(1, top - margin), bottom + margin
+
+    def _helper_visible_range(self) -> typing.Tuple[int, int]:
+        """Offsets of the visible lines, plus a margin above and below"""
+        first, last = self._helper_visible_lines()
+        return self._helper_text_offset(f"{first}.0"), self._helper_text_offset(f"{last + 1}.0")
+
+    def _attach_scrollbar_to_large_file(self):
+        self._scroll_bar.config(command=self._helper_scroll_large_file)
+        self._text_area.config(yscrollcommand="")
 
     def run(self):
-        logger.LOG.info("Running app")
-        self._root.mainloop()
-
-    @lru_cache()
-    def _collect_actions(self) -> set:
-        actions = {
-            name.replace(self.__PREFIX_ACTION_METHOD, ""): getattr(self, name)
-            for name in dir(self)
-            if name.startswith(self.__PREFIX_ACTION_METHOD) and callable(getattr(self, name))
-        }
-        logger.LOG.debug("Found %s actions: %s", len(actions.keys()), list(actions.keys()))
-        return actions
-
-    __PREFIX_ACTION_METHOD = "action_"
-
-    """
-    Use `{__prefix_action_method}{menu_bar_name}` naming convention to mark menu option commands
-    (case insensitive)
-    """
+        self._manager.run()
 
     @logger.log_debug
     def _helper_would_you_like_to_save_before_performing_action(self, endaction):
+        if not self._dirty:
+            endaction()
+            return
+
         w = tk.Toplevel()
         tk.Label(
             w,
@@ -190,17 +462,19 @@ class Notepad:
     @logger.log_action
     def action_file_new(self, *args, **kwargs):
         def new():
-            self._set_window_title()
+            self._cancel_load()
+            self._helper_unwatch()
+            self._helper_close_large_file()
             self._file = None
-            self._text_area.delete(1.0, tk.END)
+            self._helper_reset_document()
+            self._set_window_title()
+            self._manager.session_changed()
 
         self._helper_would_you_like_to_save_before_performing_action(new)
 
     @logger.log_action
     def action_file_new_window(self, *args, **kwargs):
-        orig_root = tk.Toplevel(self._root)
-        new = Notepad(root=orig_root)
-        new.run()
+        self._manager.open_window()
 
     @logger.log_action
     def action_file_open(self, *args, **kwargs):
@@ -209,23 +483,292 @@ class Notepad:
         if not file:
             return
 
-        self._file = Path(file)
+        self._helper_open_file(Path(file))
+
+    @logger.log_debug
+    def _helper_open_file(self, file: Path):
+        self._cancel_load()
+        self._helper_unwatch()
+        self._helper_close_large_file()
+        self._file = file
+        self._helper_reset_document()
+        self._set_window_title()
+
+        large = self._file.stat().st_size >= constants.LARGE_FILE_THRESHOLD
+        if large and compression.detect(self._file) is None:  # compressed files cannot be mapped
+            with open(self._file, "rb") as f:
+                detection = encoding.detect(f.read(encoding.SNIFF_SIZE))
+            if not encoding.is_wide(detection.encoding):  # byte newline scans do not apply
+                self._helper_open_large_file(detection)
+                return
+
+        self._load = loader.StreamingLoad(self._file).start()
+        self._stats.invalidate()  # loaded text is counted once, off the UI thread
+        self._long_lines = long_lines.LineSegmenter(constants.LONG_LINE_WIDTH)
+        self._helper_pump_load()
+
+    def _helper_pump_load(self):
+        load = self._load
+        if load is None or load.cancelled:
+            return
+
+        chunks = load.drain(constants.LOAD_BATCH_CHUNKS)
+        if chunks and not len(self._document):
+            self._helper_show_encoding(load.encoding, load.newline)
+        for chunk in chunks:
+            self._helper_append_text(chunk.text)
+        if self._long_lines and self._wrap_before_long_lines is None:
+            self._helper_enter_long_lines()
+        if self._restore is not None:
+            self._helper_apply_session_state(final=load.done)
+        if self._go_to_line is not None and (load.done or len(self._document.lines) > self._go_to_line):
+            line, self._go_to_line = self._go_to_line, None
+            self._helper_show_line(line)
+        self._updates.request("syntax")
+        if load.compression is None:
+            self.status_activity.set(f"Loading {load.progress:.0%}")
+        else:
+            rate = load.rate / saver.MB
+            self.status_activity.set(f"Loading {load.progress:.0%}, decompressing {rate:.1f} MB/s")
+
+        if not load.done:
+            self._root.after(constants.LOAD_POLL_MS, self._helper_pump_load)
+            return
+
+        self._load = None
+        self._helper_recount()
+        self._document.encoding = load.encoding or self._document.encoding
+        self._document.newline = load.newline or self._document.newline
+        self._document.compression = load.compression
+        self._journal_base = self._helper_journal_base(load.path)
+        self._helper_show_encoding(self._document.encoding, self._document.newline)
+        if self._long_lines:
+            self.status_activity.set("Read only (long lines)")
+        else:
+            self._long_lines = None
+            self.status_activity.set("")
+        if load.error:
+            tkm.showerror(constants.APP_NAME, f"Could not open {load.path}: {load.error}")
+        elif load.undecodable:
+            self._helper_enter_undecodable(load)
+        elif load.compression is None:  # compressed files are not appended to
+            self._helper_watch(load.path, load.bytes_read)
+        self._manager.session_changed()
+
+    @logger.log_debug
+    def _helper_enter_undecodable(self, load: loader.StreamingLoad):
+        """
+        Invalid bytes were loaded as U+FFFD, which saving would write back in their place (or
+        fail to encode at all), so the file is shown read only
+        """
+        self._undecodable = load.undecodable
+        self._text_area.configure(state=tk.DISABLED)
+        name = encoding.display_name(self._document.encoding)
+        self.status_activity.set(f"Read only (invalid {name})")
+        tkm.showwarning(
+            constants.APP_NAME,
+            f"{load.path} is not valid {name}: {load.undecodable:,} invalid byte sequences are shown "
+            "as \ufffd. It is opened read only, so saving cannot corrupt it",
+        )
+
+    def _helper_append_text(self, text: str):
+        """Add text read from the file to the end of the document and the view"""
+        if self._highlighter is not None:
+            self._highlighter.edited(len(self._document.lines) - 1, 0, text.count("\n"))
+        offset = len(self._document)
+        self._document.insert(offset, text, notify=False)
+        self._stats.edited(document.Edit(offset, "", text))
+        self._updates.request("stats")
+        if self._long_lines is None:
+            self._helper_view("insert", "end-1c", text)
+        else:
+            self._helper_append_segmented(text)
+
+    @logger.log_debug
+    def _helper_enter_long_lines(self):
+        """
+        Lines too long for the text widget are shown split, so the view no longer mirrors the
+        document: it is read only, unwrapped and unhighlighted until another file is opened
+        """
+        logger.LOG.info("Long lines in %s, showing them in segments", self._file)
+        self._wrap_before_long_lines = str(self._text_area.cget("wrap"))
+        self._text_area.configure(state=tk.DISABLED, wrap=tk.NONE)
+        self._highlighter = None
+
+    def _helper_append_segmented(self, text: str):
+        """
+        Once long line mode made the view read only, a disabled text widget silently drops
+        inserts, so it is enabled around each one
+        """
+        read_only = self._wrap_before_long_lines is not None
+        if read_only:
+            self._helper_view("configure", "-state", tk.NORMAL)
+        self._helper_view("insert", "end-1c", self._long_lines.segment(text))
+        if read_only:
+            self._helper_view("configure", "-state", tk.DISABLED)
+
+    def _helper_leave_long_lines(self):
+        self._long_lines = None
+        if self._wrap_before_long_lines is not None:
+            self._text_area.configure(state=tk.NORMAL, wrap=self._wrap_before_long_lines)
+            self._wrap_before_long_lines = None
+
+    @logger.log_debug
+    def _helper_open_large_file(self, detection: encoding.Detection):
+        self._large_file = largefile.MappedFile(self._file, encoding=detection.encoding)
+        self._helper_show_encoding(detection.encoding, detection.newline)
+        threading.Thread(
+            target=self._helper_index_large_file, args=(self._large_file,), daemon=True
+        ).start()
+        self._attach_scrollbar_to_large_file()
+        self._helper_show_large_file_window(0)
+        self._updates.request("stats")
+        self.status_activity.set("Read only (large file)")
+
+    @logger.log_debug
+    def _helper_close_large_file(self):
+        if self._large_file is None:
+            return
+
+        self._large_file.close()
+        self._large_file = None
+        self._large_file_index = None
+        self._large_file_view_line = None
+        self._text_area.configure(state=tk.NORMAL)
+        self._helper_reset_document()
+        self._attach_scrollbar_to_text()
+        self.status_activity.set("")
+
+    def _helper_show_large_file_window(self, offset: int):
+        large_file = self._large_file
+        last_page = large_file.previous_line(large_file.size, constants.LARGE_FILE_PAGE_LINES)
+        view = large_file.read_window(
+            min(offset, last_page), max_lines=constants.LARGE_FILE_WINDOW_LINES
+        )
+        self._large_file_view = view
+        self._large_file_lines = view.text.split("\n")
+        if self._large_file_index is not None:
+            self._large_file_view_line = self._large_file_index.line_of(view.start)
+
+        self._text_area.configure(state=tk.NORMAL)
         self._text_area.delete(1.0, tk.END)
-        with open(self._file, "r") as f:
-            self._text_area.insert(1.0, f.read())
+        self._text_area.insert(1.0, view.text)
+        self._text_area.configure(state=tk.DISABLED)
+        if self._highlighter is not None:
+            self._highlighter.reset()
+            self._updates.request("syntax")
+        self._scroll_bar.set(
+            large_file.fraction_at_offset(view.start), large_file.fraction_at_offset(view.end)
+        )
 
-        self._set_window_title(self._file.name)
+    def _helper_index_large_file(self, large_file: largefile.MappedFile):
+        """Runs on a worker thread: one newline scan over the mapped file"""
+        try:
+            index = line_index.LineIndex.from_buffer(large_file.buffer)
+        except ValueError:  # file was closed while indexing
+            return
+
+        logger.LOG.info("Indexed %s lines in %s", len(index), large_file.path)
+        if self._large_file is large_file:
+            self._large_file_index = index
+
+    def _helper_scroll_large_file(self, action: str, amount: str, unit: str = "units"):
+        """Scrollbar command in large file mode: positions map to file offsets"""
+        large_file = self._large_file
+        if action == "moveto":
+            self._helper_show_large_file_window(large_file.offset_at_fraction(float(amount)))
+            return
+
+        lines = int(amount)
+        if unit == "pages":
+            lines *= constants.LARGE_FILE_PAGE_LINES
+
+        start = self._large_file_view.start
+        if lines > 0:
+            offset = large_file.next_line(start, lines)
+        else:
+            offset = large_file.previous_line(start, -lines)
+        self._helper_show_large_file_window(offset)
+
+    def _helper_wheel_large_file(self, event):
+        if self._large_file is None:
+            return None
+
+        notches = -1 if event.num == 4 or event.delta > 0 else 1
+        self._helper_scroll_large_file("scroll", str(notches * 3))
+        return "break"
+
+    def _cancel_load(self, *args, **kwargs):
+        if self._load is None:
+            return
+
+        self._load.cancel()
+        self._load = None
+        self._helper_recount()
+        self.status_activity.set("Loading cancelled")
 
     @logger.log_debug
     def _helper_save_text(self, file: str):
         if not file:
             return
 
+        if self._load is not None:
+            tkm.showwarning(constants.APP_NAME, "Please wait for the file to finish loading")
+            return
+
+        if self._large_file is not None:
+            tkm.showwarning(constants.APP_NAME, "Large files are opened read only")
+            return
+
+        if self._undecodable:
+            tkm.showwarning(constants.APP_NAME, "Files with invalid characters are opened read only")
+            return
+
+        if self._save is not None:
+            self.status_activity.set("Still saving, please try again shortly")
+            return
+
         self._file = Path(file)
-        with open(self._file, "w") as f:
-            f.write(self._text_area.get(1.0, tk.END))
+        self._save = saver.BackgroundSave(
+            self._document.text.snapshot().iter_chunks(),
+            self._file,
+            encoding=self._document.encoding,
+            newline=self._document.newline,
+            compression=self._document.compression,
+            fsync=constants.SAVE_FSYNC,
+        ).start()
+        self._saved_edits = self._edits
+        self.status_activity.set(f"Saving {self._file.name}")
+        self._set_window_title()
+        self._helper_poll_save()
 
-        self._set_window_title(self._file.name)
+    def _helper_poll_save(self):
+        save = self._save
+        if not save.done:
+            self._root.after(constants.SAVE_POLL_MS, self._helper_poll_save)
+            return
+
+        self._save = None
+        if save.error:
+            self.status_activity.set("")
+            tkm.showerror(constants.APP_NAME, f"Could not save {save.path}: {save.error}")
+            return
+        self.status_activity.set(save.result.summary)
+        if self._document.compression is None:  # compressed files are not appended to
+            self._helper_watch(save.path, save.path.stat().st_size)
+        else:
+            self._helper_unwatch()
+        self._manager.session_changed()
+
+        if self._edits != self._saved_edits:
+            # edited while saving: the journal can no longer build on the file, so it is rebased
+            if self._journal is not None:
+                self._journal.compact(self._document.text.snapshot())
+            return
+        self._helper_discard_journal()
+        self._journal_base = self._helper_journal_base(save.path)
+        self._dirty = False
+        self._set_window_title()
 
     @logger.log_debug
     def _helper_ask_save_filename(self) -> str:
@@ -238,24 +781,56 @@ class Notepad:
     def action_file_save(self, *args, **kwargs):
         if not self._file:
             self._file = self._helper_ask_save_filename()
+            self._document.compression = compression.for_suffix(self._file)
 
         self._helper_save_text(self._file)
 
     @logger.log_action
     def action_file_save_as(self, *args, **kwargs):
         self._file = self._helper_ask_save_filename()
+        self._document.compression = compression.for_suffix(self._file)
         self._helper_save_text(self._file)
 
     @logger.log_action
     def action_file_exit(self, *args, **kwargs):
         def exit():
-            self._root.destroy()
+            if self._zoom_job is not None:
+                self._root.after_cancel(self._zoom_job)
+            self._cancel_load()
+            self._helper_unwatch()
+            self._helper_close_large_file()
+            self._helper_discard_journal()
+            self._history.clear()  # closes its spill file
+            self._manager.close_window(self)
 
         self._helper_would_you_like_to_save_before_performing_action(exit)
 
     @logger.log_action
     def action_edit_undo(self, *args, **kwargs):
-        self._text_area.event_generate("<<Undo>>")
+        if not self._helper_is_tracking_edits():
+            return
+
+        record = self._history.undo()
+        if record is not None:
+            self._helper_apply_record(record.offset, len(record.inserted), str(record.removed))
+
+    @logger.log_action
+    def action_edit_redo(self, *args, **kwargs):
+        if not self._helper_is_tracking_edits():
+            return
+
+        record = self._history.redo()
+        if record is not None:
+            self._helper_apply_record(record.offset, len(record.removed), str(record.inserted))
+
+    def _helper_apply_record(self, offset: int, length: int, text: str):
+        """Undo and redo edit through the view like typing does, without being recorded again"""
+        start, end = self._helper_index(offset), self._helper_index(offset + length)
+        with self._history.suspended():
+            self._text_area.replace(start, end, text)
+        self._text_area.mark_set(tk.INSERT, self._helper_index(offset + len(text)))
+        self._text_area.see(tk.INSERT)
+        self._updates.request("location")
 
     @logger.log_action
     def action_edit_cut(self, *args, **kwargs):
@@ -277,6 +852,578 @@ class Notepad:
     def action_edit_select_all(self, *args, **kwargs):
         self._text_area.event_generate("<<SelectAll>>")
 
+    def _helper_on_document_edit(self, edit: document.Edit):
+        self._edits += 1
+        self._helper_journal(edit)
+        if not self._dirty:
+            self._dirty = True
+            self._set_window_title()
+
+        self._updates.request("stats")
+        if self._highlighter is not None:
+            line = self._document.lines.line_of(edit.offset)
+            self._highlighter.edited(line, edit.removed.count("\n"), edit.inserted.count("\n"))
+            self._updates.request("syntax")
+
+        if self._search_job is None:
+            return
+
+        if self._search_restart is not None:
+            self._root.after_cancel(self._search_restart)
+        self._search_restart = self._root.after(
+            constants.SEARCH_RESTART_MS, lambda: self._helper_start_search(self._search_query)
+        )
+
+    def _helper_journal_base(self, file: Path) -> typing.Optional[journal.Base]:
+        try:
+            return journal.Base.of(Path(file))
+        except OSError:
+            return None
+
+    def _helper_journal(self, edit: document.Edit):
+        """Edits are journaled in the background, so unsaved work survives a crash"""
+        if self._journal is None:
+            try:
+                self._journal = journal.Journal(
+                    constants.RECOVERY_DIR,
+                    file=self._file,
+                    base=self._journal_base,
+                    encoding=self._document.encoding,
+                    newline=self._document.newline,
+                )
+            except OSError as e:
+                logger.LOG.warning("Not journaling edits: %s", e)
+                return
+
+        self._journal.append(edit.offset, len(edit.removed), edit.inserted)
+        if self._journal_job is None:
+            self._journal_job = self._root.after(constants.JOURNAL_FLUSH_MS, self._helper_flush_journal)
+
+    def _helper_flush_journal(self):
+        self._journal_job = None
+        if self._journal is None:
+            return
+
+        if self._journal.should_compact(len(self._document)):
+            self._journal.compact(self._document.text.snapshot())
+        else:
+            self._journal.flush()
+
+    def _helper_discard_journal(self):
+        if self._journal_job is not None:
+            self._root.after_cancel(self._journal_job)
+            self._journal_job = None
+        if self._journal is not None:
+            self._journal.discard()
+            self._journal = None
+
+    @logger.log_debug
+    def _helper_restore(self, recovered: journal.Recovered):
+        """Show a document recovered from a journal: unsaved, and journaled again"""
+        self._file = recovered.file
+        self._helper_reset_document()
+        self._document.encoding = recovered.encoding
+        self._document.newline = recovered.newline or self._document.newline
+        self._document.compression = compression.for_file(self._file) if self._file else None
+        self._helper_show_encoding(self._document.encoding, self._document.newline)
+
+        self._text_area.insert("1.0", recovered.text)
+        self._history.clear()
+        self._helper_flush_journal()
+        self.status_activity.set("Recovered unsaved changes")
+
+    def _helper_session_state(self) -> typing.Optional[session.DocumentState]:
+        if self._restore is not None:  # not loaded yet
+            return self._restore
+        if self._file is None:
+            return None
+
+        wrap = self._wrap_before_long_lines or str(self._text_area.cget("wrap"))
+        if self._large_file is not None:
+            return session.DocumentState(
+                str(self._file), large_file_offset=self._large_file_view.start, wrap=wrap, zoom=self._zoom
+            )
+        top = self._document.lines.line_of(self._helper_text_offset("@0,0"))
+        cursor = self._helper_text_offset(tk.INSERT)
+        return session.DocumentState(str(self._file), cursor, top, wrap=wrap, zoom=self._zoom)
+
+    def _helper_show_session_state(self, state: session.DocumentState):
+        """Everything but the text, which `_helper_load_session_state` loads later"""
+        self._file = Path(state.file)
+        self._set_window_title()
+        self._text_area.configure(wrap=state.wrap)
+        if state.zoom != self._zoom:
+            self._helper_zoom(state.zoom)
+        self._restore = state
+
+    @logger.log_debug
+    def _helper_load_session_state(self, state: session.DocumentState):
+        if self._restore is not state:  # another file was opened meanwhile
+            return
+
+        self._helper_open_file(self._file)
+        if self._large_file is not None:
+            self._helper_show_large_file_window(state.large_file_offset or 0)
+        else:
+            self._restore = state
+
+    def _helper_apply_session_state(self, final: bool):
+        """Scroll to where the session left off, as soon as that much of the file is loaded"""
+        state = self._restore
+        loaded = len(self._document) >= state.cursor and len(self._document.lines) > state.top_line
+        if not (loaded or final):
+            return
+
+        self._restore = None
+        top = self._document.lines.line_start(min(state.top_line, len(self._document.lines) - 1))
+        self._helper_view("yview", self._helper_index(top))
+        self._helper_view("mark", "set", tk.INSERT, self._helper_index(min(state.cursor, len(self._document))))
+        self._updates.request("location")
+
+    def _helper_watch(self, file: Path, offset: int):
+        """Notice when the file changes on disk. `offset`: bytes of it already shown"""
+        self._helper_unwatch()
+        try:
+            self._tail = watcher.Tail(file, offset, self._document.encoding)
+            self._manager.watcher.watch(file, self._helper_on_file_changed)
+        except OSError as e:
+            logger.LOG.warning("Not watching %s: %s", file, e)
+            self._tail = None
+
+    def _helper_unwatch(self):
+        if self._follow_job is not None:
+            self._root.after_cancel(self._follow_job)
+            self._follow_job = None
+        if self._tail is not None:
+            self._manager.watcher.unwatch(self._tail.path, self._helper_on_file_changed)
+            self._tail = None
+
+    def _helper_on_file_changed(self, path: Path):
+        if self._tail is None or self._save is not None:  # our own save
+            return
+
+        if self._following.get() and not self._dirty and self._large_file is None:
+            self._helper_follow()
+        elif self._tail.changed():
+            self.status_activity.set(f"{path.name} changed on disk")
+
+    @logger.log_debug
+    def _helper_follow(self):
+        """Show what was written to the file since it was read, scrolled to the end"""
+        if self._follow_job is not None:  # a change event came before the scheduled read
+            self._root.after_cancel(self._follow_job)
+            self._follow_job = None
+        if self._tail is None or self._dirty or self._large_file is not None:
+            return
+
+        change = self._tail.read()
+        if change.kind == "missing":
+            self.status_activity.set(f"{self._tail.path.name} was removed")
+            return
+        if change.kind in ("truncated", "rotated"):
+            logger.LOG.info("%s was %s, showing it from the start", self._tail.path, change.kind)
+            newline = self._document.newline
+            self._helper_reset_document()
+            self._document.encoding, self._document.newline = self._tail.encoding, newline
+            self._helper_show_encoding(self._document.encoding, self._document.newline)
+            self._long_lines = long_lines.LineSegmenter(constants.LONG_LINE_WIDTH)
+
+        if change.text:
+            self._helper_append_text(change.text)
+            if self._long_lines and self._wrap_before_long_lines is None:
+                self._helper_enter_long_lines()
+            self._helper_view("see", tk.END)
+            self._updates.request("syntax")
+            self._updates.request("location")
+
+        if change.more:
+            self._follow_job = self._root.after(constants.LOAD_POLL_MS, self._helper_follow)
+            return
+        if not self._long_lines:
+            self._long_lines = None
+        self._journal_base = self._helper_journal_base(self._tail.path)
+        self.status_activity.set(f"Following {self._tail.path.name}")
+
+    def _helper_recount(self):
+        self._stats.recount()
+        self._helper_poll_stats()
+
+    def _helper_poll_stats(self):
+        if self._stats.poll():
+            self._updates.request("stats")
+            return
+        self._root.after(constants.STATS_POLL_MS, self._helper_poll_stats)
+
+    def _helper_update_stats(self):
+        """Counts of the selection when there is one, else of the whole document"""
+        if self._large_file is not None:
+            self.status_stats.set("")
+            return
+
+        selection = self._helper_view("tag", "ranges", "sel")
+        if not selection:
+            self.status_stats.set(self._stats.counts.summary)
+            return
+
+        start, end = (self._helper_text_offset(str(index)) for index in selection[:2])
+        self.status_stats.set(f"{self._stats.selection(start, end).summary} selected")
+
+    def _helper_start_search(self, query: search.Query):
+        self._helper_stop_search()
+        if not search.is_valid(query):
+            self.status_activity.set("")
+            return
+
+        self._search_query = query
+        self._search_job = search.SearchJob(self._document.text.snapshot(), query).start()
+        self._helper_poll_search()
+
+    def _helper_stop_search(self, forget_query: bool = True):
+        if self._search_restart is not None:
+            self._root.after_cancel(self._search_restart)
+            self._search_restart = None
+        if self._search_job is not None:
+            self._search_job.cancel()
+            self._search_job = None
+        if self._find_job is not None:
+            self._find_job.cancel()
+            self._find_job = None
+        if forget_query:
+            self._search_query = None
+        self._helper_view("tag", "remove", "found", "1.0", tk.END)
+
+    def _helper_poll_search(self):
+        job = self._search_job
+        if job is None or job.cancelled:
+            return
+
+        self._updates.request("search_highlight")
+        found = f"{len(job.starts)}{'+' if job.truncated else ''} matches"
+        if job.done:
+            self.status_activity.set(found)
+            return
+
+        self.status_activity.set(f"Searching... {found}")
+        self._root.after(constants.SEARCH_POLL_MS, self._helper_poll_search)
+
+    def _helper_highlight_matches(self):
+        """Only matches in (and near) the visible region are ever tagged"""
+        job = self._search_job
+        if job is None:
+            return
+
+        self._helper_view("tag", "remove", "found", "1.0", tk.END)
+        for match in job.matches_between(*self._helper_visible_range()):
+            start, end = self._helper_index(match.start), self._helper_index(match.end)
+            self._helper_view("tag", "add", "found", start, end)
+
+    def _helper_line_text(self, line: int) -> str:
+        if self._large_file is not None:
+            return self._large_file_lines[line]
+        return self._document.line(line)
+
+    def _helper_highlight_syntax(self):
+        """Only out of date lines in (and near) the visible region are ever lexed and tagged"""
+        highlighter = self._highlighter
+        if highlighter is None:
+            return
+
+        first, last = self._helper_visible_lines()
+        line_count = len(self._large_file_lines) if self._large_file else len(self._document.lines)
+        for line, tokens in highlighter.highlight(first - 1, min(last, line_count), self._helper_line_text):
+            start, end = f"{line + 1}.0", f"{line + 1}.end"
+            for tag in highlight.TAGS:
+                self._helper_view("tag", "remove", f"syntax_{tag}", start, end)
+            for token in tokens:
+                start, end = f"{line + 1}.{token.start}", f"{line + 1}.{token.end}"
+                self._helper_view("tag", "add", f"syntax_{token.tag}", start, end)
+
+    def _helper_selection(self) -> typing.Optional[typing.Tuple[int, int]]:
+        selection = self._helper_view("tag", "nextrange", "sel", "1.0")
+        if not selection:
+            return None
+        start, end = (str(index) for index in selection)
+        return self._helper_text_offset(start), self._helper_text_offset(end)
+
+    def _helper_select_match(self, match: typing.Optional[search.Match]):
+        if match is None:
+            self.status_activity.set(f'Cannot find "{self._search_query.pattern}"')
+            return
+
+        start, end = self._helper_index(match.start), self._helper_index(match.end)
+        self._text_area.tag_remove(tk.SEL, "1.0", tk.END)
+        self._text_area.tag_add(tk.SEL, start, end)
+        self._text_area.mark_set(tk.INSERT, end)
+        self._text_area.see(tk.INSERT)
+        self._update_location()
+
+    def _helper_replace_one(self, replacement: str):
+        query = self._search_query
+        selection = self._helper_selection()
+        if query is not None and selection is not None:
+            match = search.compile_query(query).fullmatch(self._document.get(*selection))
+            if match is not None:
+                new = match.expand(replacement) if query.regex else replacement
+                start, end = (self._helper_index(offset) for offset in selection)
+                self._text_area.replace(start, end, new)
+        self.action_edit_find_next()
+
+    def _helper_replace_all(self, replacement: str):
+        query = self._search_query
+        if query is None:
+            return
+
+        def replace_all(snapshot: document.Document) -> typing.Optional[search.Replacement]:
+            return search.replace_all(snapshot.text.iter_chunks(), query, replacement)
+
+        def apply(result: typing.Optional[search.Replacement]):
+            if result is None:
+                self.status_activity.set(f'Cannot find "{query.pattern}"')
+                return
+
+            start, end = self._helper_index(result.start), self._helper_index(result.end)
+            self._text_area.replace(start, end, result.text)
+            self.status_activity.set(f"Replaced {result.count} matches")
+
+        self._helper_find(replace_all, apply, partial(self._helper_replace_all, replacement))
+
+    def _helper_find(self, find: typing.Callable, then: typing.Callable, retry: typing.Callable):
+        """
+        Run `find` over a snapshot of the document on a worker thread, then hand its result to
+        `then`. When the document was edited meanwhile the result is stale: `retry` runs instead
+        """
+        if self._find_job is not None:
+            self._find_job.cancel()
+        self._find_job = search.FindJob(find, self._document.snapshot()).start()
+        self._root.after(constants.SEARCH_POLL_MS, self._helper_poll_find, self._find_job, self._edits, then, retry)
+
+    def _helper_poll_find(self, job: search.FindJob, edits: int, then: typing.Callable, retry: typing.Callable):
+        if job is not self._find_job or job.cancelled:
+            return
+        if not job.done:
+            self._root.after(constants.SEARCH_POLL_MS, self._helper_poll_find, job, edits, then, retry)
+            return
+
+        self._find_job = None
+        if job.error is not None:
+            self.status_activity.set(f"Search failed: {job.error}")
+        elif self._edits != edits:
+            retry()
+        else:
+            then(job.result)
+
+    def _helper_search_dialog(self, replace: bool):
+        popup = tk.Toplevel(self._root)
+        popup.title("Replace" if replace else "Find")
+        popup.transient(self._root)
+
+        current = self._search_query or search.Query("")
+        pattern = tk.StringVar(popup, value=current.pattern)
+        replacement = tk.StringVar(popup)
+        match_case = tk.BooleanVar(popup, value=current.match_case)
+        regex = tk.BooleanVar(popup, value=current.regex)
+
+        def on_change(*args):
+            self._helper_start_search(search.Query(pattern.get(), match_case.get(), regex.get()))
+
+        for var in (pattern, match_case, regex):
+            var.trace_add("write", on_change)
+
+        tk.Label(popup, text="Find what:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        entry = tk.Entry(popup, textvariable=pattern)
+        entry.grid(row=0, column=1, padx=5, pady=2)
+        if replace:
+            tk.Label(popup, text="Replace with:").grid(row=1, column=0, sticky=tk.W, padx=5)
+            tk.Entry(popup, textvariable=replacement).grid(row=1, column=1, padx=5, pady=2)
+        tk.Checkbutton(popup, text="Match case", variable=match_case).grid(row=4, column=0, sticky=tk.W)
+        tk.Checkbutton(popup, text="Regular expression", variable=regex).grid(row=4, column=1, sticky=tk.W)
+
+        def close():
+            self._helper_stop_search(forget_query=False)
+            popup.destroy()
+
+        buttons = [("Find Next", self.action_edit_find_next), ("Find Previous", self.action_edit_find_previous)]
+        if replace:
+            buttons.append(("Replace", lambda: self._helper_replace_one(replacement.get())))
+            buttons.append(("Replace All", lambda: self._helper_replace_all(replacement.get())))
+        buttons.append(("Cancel", close))
+
+        for row, (label, command) in enumerate(buttons):
+            tk.Button(popup, text=label, command=command).grid(row=row, column=2, sticky=tk.EW, padx=5)
+
+        popup.protocol("WM_DELETE_WINDOW", close)
+        entry.focus_set()
+        if current.pattern:
+            on_change()
+
+    @logger.log_action
+    def action_edit_find(self, *args, **kwargs):
+        self._helper_search_dialog(replace=False)
+
+    @logger.log_action
+    def action_edit_find_next(self, *args, **kwargs):
+        if self._search_query is None:
+            self.action_edit_find()
+            return
+
+        offset = self._helper_text_offset(tk.INSERT)
+        find = partial(search.find_next, query=self._search_query, offset=offset)
+        self._helper_find(find, self._helper_select_match, self.action_edit_find_next)
+
+    @logger.log_action
+    def action_edit_find_previous(self, *args, **kwargs):
+        if self._search_query is None:
+            self.action_edit_find()
+            return
+
+        selection = self._helper_selection()
+        offset = selection[0] if selection else self._helper_text_offset(tk.INSERT)
+        find = partial(search.find_previous, query=self._search_query, offset=offset)
+        self._helper_find(find, self._helper_select_match, self.action_edit_find_previous)
+
+    @logger.log_action
+    def action_edit_replace(self, *args, **kwargs):
+        self._helper_search_dialog(replace=True)
+
+    @logger.log_action
+    def action_edit_find_in_files(self, *args, **kwargs):
+        popup = tk.Toplevel(self._root)
+        popup.title("Find in Files")
+        popup.transient(self._root)
+        popup.grid_columnconfigure(1, weight=1)
+        popup.grid_rowconfigure(4, weight=1)
+
+        current = self._search_query or search.Query("")
+        pattern = tk.StringVar(popup, value=current.pattern)
+        folder = tk.StringVar(popup, value=str(Path(self._file).parent if self._file else Path.cwd()))
+        include = tk.StringVar(popup, value="*")
+        match_case = tk.BooleanVar(popup, value=current.match_case)
+        regex = tk.BooleanVar(popup, value=current.regex)
+        status = tk.StringVar(popup)
+        job: typing.List[find_in_files.FindInFiles] = []  # the running search, if any
+        shown: typing.List[find_in_files.Hit] = []
+
+        entries = []
+        for row, (label, var) in enumerate((("Find what:", pattern), ("In folder:", folder), ("Files:", include))):
+            tk.Label(popup, text=label).grid(row=row, column=0, sticky=tk.W, padx=5)
+            entries.append(tk.Entry(popup, textvariable=var, width=50))
+            entries[-1].grid(row=row, column=1, sticky=tk.EW, padx=5, pady=2)
+        options = tk.Frame(popup)
+        options.grid(row=3, column=1, sticky=tk.W)
+        tk.Checkbutton(options, text="Match case", variable=match_case).pack(side=tk.LEFT)
+        tk.Checkbutton(options, text="Regular expression", variable=regex).pack(side=tk.LEFT)
+
+        results = tk.Listbox(popup, height=15, activestyle=tk.NONE)
+        results.grid(row=4, column=0, columnspan=3, sticky=tk.NSEW, padx=5, pady=5)
+        tk.Label(popup, textvariable=status, anchor=tk.W).grid(row=5, column=0, columnspan=3, sticky=tk.EW, padx=5)
+
+        def poll(search_job: find_in_files.FindInFiles):
+            if not job or job[0] is not search_job:  # stopped, or searching again
+                return
+
+            for hit in search_job.hits[len(shown) :]:
+                results.insert(tk.END, f"{os.path.relpath(hit.path, search_job.root)}:{hit.line}: {hit.text}")
+                shown.append(hit)
+            found = f"{len(shown)}{'+' if search_job.truncated else ''} matches in {search_job.files_searched} files"
+            if search_job.done:
+                status.set(found)
+                job.clear()
+                return
+            status.set(f"Searching... {found}")
+            popup.after(constants.FIND_IN_FILES_POLL_MS, poll, search_job)
+
+        def stop():
+            if job:
+                job.pop().cancel()
+                status.set(f"Stopped: {status.get()}")
+
+        def start(*args):
+            stop()
+            query = search.Query(pattern.get(), match_case.get(), regex.get())
+            if not search.is_valid(query) or not Path(folder.get()).is_dir():
+                status.set("Enter a valid pattern and folder")
+                return
+
+            results.delete(0, tk.END)
+            shown.clear()
+            job.append(
+                find_in_files.FindInFiles(
+                    folder.get(), query, include=include.get(), max_results=constants.FIND_IN_FILES_MAX_RESULTS
+                ).start()
+            )
+            poll(job[0])
+
+        def browse():
+            directory = tkfd.askdirectory(parent=popup, initialdir=folder.get())
+            if directory:
+                folder.set(directory)
+
+        def open_hit(*args):
+            selection = results.curselection()
+            if selection:
+                hit = shown[selection[0]]
+                self._helper_would_you_like_to_save_before_performing_action(
+                    partial(self._helper_open_file_at, Path(hit.path), hit.line, hit.line_offset)
+                )
+
+        def close():
+            stop()
+            popup.destroy()
+
+        buttons = (("Find", start), ("Browse...", browse), ("Stop", stop), ("Close", close))
+        for row, (label, command) in enumerate(buttons):
+            tk.Button(popup, text=label, command=command).grid(row=row, column=2, sticky=tk.EW, padx=5)
+
+        for entry in entries:
+            entry.bind("<Return>", start)
+        results.bind("<Double-Button-1>", open_hit)
+        results.bind("<Return>", open_hit)
+        popup.bind("<Escape>", lambda event: close())
+        popup.protocol("WM_DELETE_WINDOW", close)
+        entries[0].focus_set()
+
+    @logger.log_action
+    def action_edit_go_to(self, *args, **kwargs):
+        if self._large_file is not None and self._large_file_index is None:
+            tkm.showinfo(constants.APP_NAME, "Still indexing lines, please try again shortly")
+            return
+
+        line = tksd.askinteger("Go To Line", "Line number:", parent=self._root, minvalue=1)
+        if line is None:
+            return
+
+        if self._large_file is not None:
+            self._helper_show_large_file_line(self._large_file_index.line_start(line - 1))
+        else:
+            self._helper_show_line(line)
+
+    def _helper_show_large_file_line(self, offset: int):
+        """Show the line starting at `offset` in the large file viewer, with the cursor on it"""
+        self._helper_show_large_file_window(offset)
+        view_line, start = 1, self._large_file_view.start
+        while start < offset:  # near the end, the window starts a few lines before the line
+            start = self._large_file.next_line(start)
+            view_line += 1
+        self._text_area.mark_set(tk.INSERT, f"{view_line}.0")
+        self._text_area.see(tk.INSERT)
+        self._update_location()
+
+    def _helper_show_line(self, line: int):
+        self._text_area.mark_set(tk.INSERT, self._helper_index(self._document.offset(line, 0)))
+        self._text_area.see(tk.INSERT)
+        self._update_location()
+
+    @logger.log_debug
+    def _helper_open_file_at(self, file: Path, line: int, line_offset: int = 0):
+        """Open `file` with the cursor on `line`, as soon as that much of it is loaded"""
+        self._helper_open_file(file)
+        if self._large_file is not None:
+            self._helper_show_large_file_line(line_offset)
+        elif self._load is not None:
+            self._go_to_line = line
+        else:
+            self._helper_show_line(line)
+
     @logger.log_action
     def action_format_theme(self, *args, **kwargs):
         popup = tk.Toplevel(self._root)
@@ -288,7 +1435,7 @@ class Notepad:
                 text=theme,
                 padx=20,
                 variable=self.theme,
-                command=self._set_theme,
+                command=self._manager.apply_theme,
                 value=theme,
             ).pack(anchor=tk.W)
 
@@ -299,11 +1446,85 @@ class Notepad:
 
     @logger.log_action
     def action_format_wrap_words(self, *args, **kwargs):
+        if self._long_lines:
+            self.status_activity.set("Wrapping is off while long lines are shown in segments")
+            return
+
         if self._wrap_words:
             self._text_area.configure(wrap=tk.WORD)
         else:
             self._text_area.configure(wrap=tk.CHAR)
         self._wrap_words = not self._wrap_words
+        self._manager.session_changed()
+
+    @logger.log_action
+    def action_view_zoom_in(self, *args, **kwargs):
+        self._helper_zoom(fonts.step_zoom(self._zoom, 1))
+
+    @logger.log_action
+    def action_view_zoom_out(self, *args, **kwargs):
+        self._helper_zoom(fonts.step_zoom(self._zoom, -1))
+
+    @logger.log_action
+    def action_view_restore_default_zoom(self, *args, **kwargs):
+        self._helper_zoom(fonts.DEFAULT_ZOOM)
+
+    @logger.log_action
+    def action_view_follow(self, *args, **kwargs):
+        if self._following.get():
+            self._helper_follow()
+
+    @logger.log_action
+    def action_view_command_palette(self, *args, **kwargs):
+        popup = tk.Toplevel(self._root)
+        popup.title("Command Palette")
+        popup.transient(self._root)
+
+        query = tk.StringVar(popup)
+        entry = tk.Entry(popup, textvariable=query, width=60)
+        entry.pack(fill=tk.X, padx=5, pady=5)
+        results = tk.Listbox(popup, height=constants.PALETTE_RESULTS, activestyle=tk.NONE)
+        results.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+        found: typing.List[actions.Action] = []
+
+        def on_change(*args):
+            matches = self.actions.search(query.get(), constants.PALETTE_RESULTS + 1)
+            matches = [action for action in matches if action.lookup_key != "view_command_palette"]
+            found[:] = matches[: constants.PALETTE_RESULTS]
+            results.delete(0, tk.END)
+            for action in found:
+                shortcut = self._manager.keymap.bindings.get(action.lookup_key)
+                label = f"{action.label}    {shortcut.accelerator}" if shortcut else action.label
+                results.insert(tk.END, label)
+            if found:
+                results.selection_set(0)
+
+        def move(step: int):
+            def _move(event):
+                selection = results.curselection()
+                if found:
+                    selected = min(max((selection[0] if selection else 0) + step, 0), len(found) - 1)
+                    results.selection_clear(0, tk.END)
+                    results.selection_set(selected)
+                    results.see(selected)
+                return "break"
+
+            return _move
+
+        def run(*args):
+            selection = results.curselection()
+            if selection:
+                popup.destroy()
+                found[selection[0]].function(self)
+
+        query.trace_add("write", on_change)
+        entry.bind("<Return>", run)
+        entry.bind("<Down>", move(1))
+        entry.bind("<Up>", move(-1))
+        entry.bind("<Escape>", lambda event: popup.destroy())
+        results.bind("<Double-Button-1>", run)
+        on_change()
+        entry.focus_set()
 
     @logger.log_action
     def action_view_status_bar(self, *args, **kwargs):
@@ -322,6 +1543,21 @@ https://github.com/aspfohl/notepad
 """
         tkm.showinfo(constants.APP_NAME, help_text)
 
+    @logger.log_action
+    def action_help_performance(self, *args, **kwargs):
+        popup = tk.Toplevel(self._root)
+        popup.title("Performance")
+
+        text = tk.Text(popup, width=75, height=25)
+        text.pack(fill=tk.BOTH, expand=True)
+        if logger.is_profiling():
+            text.insert("1.0", logger.format_timings())
+        else:
+            text.insert("1.0", "Instrumentation is off: start with `python -m notepad --profile-out FILE`")
+        text.configure(state=tk.DISABLED)
+
+        tk.Button(popup, text="OK", command=popup.destroy).pack()
+
     @logger.log_action
     def action_help_about(self, *args, **kwargs):
         system_info = f"""App name: {constants.APP_NAME}
@@ -0,0 +1,274 @@
+"""
+Headless batch editing for notepad: python -m notepad batch [options] PATH...
+
+Never imports tkinter, so it runs where no display is available. Files are streamed, edited
+line block by line block and saved atomically, one file per worker process.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import codecs
+import fnmatch
+import io
+import itertools
+import os
+import re
+import sys
+import time
+import typing
+
+from notepad.features import compression as file_compression, encoding as text_encoding, saver, search
+
+CHUNK_SIZE = 1 << 20
+NEWLINES = {"lf": "\n", "crlf": "\r\n", "cr": "\r"}
+MB = 1024 * 1024
+
+_TRAILING_WHITESPACE = re.compile(r"[ \t]+(?=[\r\n]|\Z)")
+
+
+class Options(typing.NamedTuple):
+    find: typing.Optional[str] = None
+    replace: typing.Optional[str] = None  # None: only count the matches
+    regex: bool = False
+    match_case: bool = False
+    encoding: typing.Optional[str] = None  # None: keep each file's own encoding
+    newline: typing.Optional[str] = None  # a NEWLINES key. None: keep each file's line endings
+    strip_trailing_whitespace: bool = False
+    check: bool = False  # report what would change, write nothing
+    chunk_size: int = CHUNK_SIZE
+
+    @property
+    def query(self) -> typing.Optional[search.Query]:
+        return search.Query(self.find, self.match_case, self.regex) if self.find else None
+
+    @property
+    def edits(self) -> bool:
+        """False when the files are only searched: they are then never written"""
+        return (
+            self.replace is not None
+            or self.strip_trailing_whitespace
+            or self.newline is not None
+            or self.encoding is not None
+        )
+
+
+class Result(typing.NamedTuple):
+    path: str
+    bytes_read: int = 0  # decompressed
+    seconds: float = 0.0
+    matches: int = 0
+    stripped: int = 0  # lines that had trailing whitespace
+    changed: bool = False
+    skipped: typing.Optional[str] = None
+    error: typing.Optional[str] = None
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second"""
+        return self.bytes_read / self.seconds if self.seconds else 0.0
+
+
+class _FileEdit:
+    """The edits of one file, applied as its text streams through"""
+
+    def __init__(self, options: Options, detected: str):
+        self.options = options
+        self.encoding = options.encoding or detected
+        self.newline = NEWLINES.get(options.newline)
+        self.pattern = search.compile_query(options.query) if options.query else None
+        if options.regex or options.replace is None:
+            self.repl = options.replace
+        else:
+            self.repl = lambda _: options.replace
+
+        self.bytes_read = 0
+        self.matches = 0
+        self.stripped = 0
+        self.changed = codecs.lookup(self.encoding).name != codecs.lookup(detected).name
+        self._decoder = codecs.getincrementaldecoder(detected)()
+        if self.newline is not None:
+            self._decoder = io.IncrementalNewlineDecoder(self._decoder, translate=True)
+
+    def decode(self, prefix: bytes, f: typing.BinaryIO) -> typing.Iterator[str]:
+        data = prefix
+        while data:
+            self.bytes_read += len(data)
+            yield self._decoder.decode(data)
+            data = f.read(self.options.chunk_size)
+        yield self._decoder.decode(b"", final=True)
+
+        if self.newline is not None and self._decoder.newlines not in (None, self.newline):
+            self.changed = True
+
+    def _edit(self, block: str) -> str:
+        if self.pattern is not None:
+            if self.repl is None:
+                self.matches += sum(1 for _ in self.pattern.finditer(block))
+            else:
+                block, count = self.pattern.subn(self.repl, block)
+                self.matches += count
+                self.changed |= bool(count)
+
+        if self.options.strip_trailing_whitespace:
+            block, count = _TRAILING_WHITESPACE.subn("", block)
+            self.stripped += count
+            self.changed |= bool(count)
+        return block
+
+    def edit(self, chunks: typing.Iterable[str]) -> typing.Iterator[str]:
+        for _, block in search.iter_line_blocks(chunks):
+            yield self._edit(block)
+
+
+def _is_binary(prefix: bytes, encoding: str) -> bool:
+    return b"\0" in prefix and not text_encoding.is_wide(encoding)
+
+
+def process(path: str, options: Options) -> Result:
+    """Edit one file. Errors are reported in the result: one bad file never stops a batch"""
+    start = time.perf_counter()
+    try:
+        compression = file_compression.detect(path)
+        with open(path, "rb") as raw, file_compression.wrap(raw, compression) as f:
+            prefix = f.read(text_encoding.SNIFF_SIZE)
+            detected = text_encoding.detect_encoding(prefix, final=len(prefix) < text_encoding.SNIFF_SIZE)
+            if _is_binary(prefix, detected):
+                return Result(path, skipped="binary")
+
+            edit = _FileEdit(options, detected)
+            chunks = edit.edit(edit.decode(prefix, f))
+            if options.check or not options.edits:
+                for _ in chunks:
+                    pass
+            else:
+                saver.save(
+                    chunks,
+                    Path(path),
+                    encoding=edit.encoding,
+                    newline=edit.newline or "\n",
+                    compression=compression,
+                    replace_if=lambda: edit.changed,
+                )
+    except (OSError, ValueError, *file_compression.ERRORS) as e:  # UnicodeError is a ValueError
+        return Result(path, seconds=time.perf_counter() - start, error=str(e))
+
+    seconds = time.perf_counter() - start
+    return Result(path, edit.bytes_read, seconds, edit.matches, edit.stripped, edit.changed)
+
+
+def iter_files(paths: typing.Iterable[str], include: str = "*") -> typing.Iterator[str]:
+    """The files given, and those under the directories given. Hidden directories are skipped"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories[:] = sorted(d for d in subdirectories if not d.startswith("."))
+            for name in sorted(files):
+                if fnmatch.fnmatch(name, include):
+                    yield os.path.join(directory, name)
+
+
+def run(paths: typing.Sequence[str], options: Options, jobs: int) -> typing.Iterator[Result]:
+    """Results in the order of `paths`, as they complete"""
+    if jobs <= 1 or len(paths) <= 1:
+        yield from map(process, paths, itertools.repeat(options))
+        return
+
+    # small files are handed out in batches, so the workers are not starved by the round trips
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(process, paths, itertools.repeat(options), chunksize=chunksize)
+
+
+def describe(result: Result, check: bool = False) -> str:
+    if result.error is not None:
+        return f"error        {result.path}: {result.error}"
+    if result.skipped is not None:
+        return f"skipped      {result.path} ({result.skipped})"
+
+    status = ("would change" if check else "changed") if result.changed else "unchanged"
+    details = []
+    if result.matches:
+        details.append(f"{result.matches} matches")
+    if result.stripped:
+        details.append(f"{result.stripped} lines stripped")
+    line = (
+        f"{status:<12} {result.path}  {result.seconds * 1000:.1f} ms "
+        f"({result.throughput / MB:.1f} MB/s)"
+    )
+    return f"{line}  {', '.join(details)}" if details else line
+
+
+def summarize(results: typing.Sequence[Result], seconds: float, jobs: int) -> str:
+    total = sum(result.bytes_read for result in results)
+    changed = sum(result.changed for result in results)
+    skipped = sum(result.skipped is not None for result in results)
+    errors = sum(result.error is not None for result in results)
+    throughput = total / seconds / MB if seconds else 0.0
+    return (
+        f"{len(results)} files, {changed} changed, {skipped} skipped, {errors} errors: "
+        f"{total / MB:.1f} MB in {seconds:.2f}s ({throughput:.1f} MB/s, {jobs} jobs)"
+    )
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m notepad batch", description=__doc__)
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="Files, or directories to walk")
+    parser.add_argument("--include", default="*", metavar="GLOB", help="File names to edit in directories")
+    parser.add_argument("--find", help="Count the matches, or replace them with --replace")
+    parser.add_argument("--replace", help="Replacement; with --regex it may use groups, e.g. \\1")
+    parser.add_argument("--regex", action="store_true")
+    parser.add_argument("--match-case", action="store_true")
+    parser.add_argument("--encoding", help="Convert to this encoding. Default: keep each file's")
+    parser.add_argument("--newline", choices=list(NEWLINES), help="Normalize line endings")
+    parser.add_argument("--strip-trailing-whitespace", action="store_true")
+    parser.add_argument("--check", action="store_true", help="Write nothing; exit 1 if any file would change")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary and errors")
+    return parser
+
+
+def main(argv: typing.Sequence[str]) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.replace is not None and not args.find:
+        parser.error("--replace needs --find")
+    if args.find and not search.is_valid(search.Query(args.find, args.match_case, args.regex)):
+        parser.error(f"invalid pattern: {args.find}")
+    if args.encoding:
+        try:
+            codecs.lookup(args.encoding)
+        except LookupError:
+            parser.error(f"unknown encoding: {args.encoding}")
+
+    options = Options(
+        args.find,
+        args.replace,
+        args.regex,
+        args.match_case,
+        args.encoding,
+        args.newline,
+        args.strip_trailing_whitespace,
+        args.check,
+    )
+    paths = list(iter_files(args.paths, args.include))
+    jobs = max(1, min(args.jobs, len(paths)))
+
+    start = time.perf_counter()
+    results = []
+    for result in run(paths, options, jobs):
+        results.append(result)
+        if result.error is not None:
+            print(describe(result, args.check), file=sys.stderr)
+        elif not args.quiet:
+            print(describe(result, args.check))
+    print(summarize(results, time.perf_counter() - start, jobs))
+
+    if any(result.error is not None for result in results):
+        return 2
+    if args.check and any(result.changed for result in results):
+        return 1
+    return 0
@@ -2,6 +2,8 @@
 Notepad Constants
 """
 
+from pathlib import Path
+
 APP_NAME = "PyNotepad"
 
 DEFAULT_WINDOW_WIDTH = 600
@@ -12,6 +14,57 @@ DEFAULT_FILE_EXTENSION = ".txt"
 
 SUPPORTED_FILE_TYPES = [("All Files", "*.*"), ("Text Documents", f"*.{DEFAULT_FILE_EXTENSION}")]
 
+LOAD_BATCH_CHUNKS = 4  # chunks inserted per event loop tick
+LOAD_POLL_MS = 5
+
+SEARCH_POLL_MS = 30
+STATS_POLL_MS = 50  # how often a word recount is checked for its result
+FIND_IN_FILES_POLL_MS = 50
+FIND_IN_FILES_MAX_RESULTS = 10_000  # the search stops once this many lines matched
+SEARCH_RESTART_MS = 150  # after an edit, wait for typing to pause before searching again
+SEARCH_HIGHLIGHT_COLOR = "yellow"
+VISIBLE_MARGIN_LINES = 20  # lazily styled lines above and below the view
+
+SYNTAX_COLORS = {
+    "comment": "#808080",
+    "definition": "#795e26",
+    "keyword": "#0000ff",
+    "string": "#a31515",
+    "number": "#098658",
+    "key": "#001080",
+    "timestamp": "#808080",
+    "error": "#cd3131",
+    "warning": "#bf8803",
+    "info": "#098658",
+    "debug": "#808080",
+}
+
+ZOOM_SETTLE_MS = 80  # a burst of zoom steps relays out the text once, when it pauses
+
+UNDO_MAX_BYTES = 16 * 1024 * 1024  # older history is spilled to a temporary file
+UNDO_SPILL_BYTES = 256 * 1024 * 1024  # older history still is forgotten
+
+RECOVERY_DIR = Path.home() / ".notepad" / "recovery"
+JOURNAL_FLUSH_MS = 3000  # unsaved edits are journaled this often
+
+SESSION_FILE = Path.home() / ".notepad" / "session.json"
+KEYMAP_FILE = Path.home() / ".notepad" / "keymap.json"  # e.g. {"edit_find": "ctrl+k ctrl+f"}
+SESSION_SAVE_MS = 1000  # a burst of cursor, scroll or zoom changes is written once
+SESSION_RESTORE_POLL_MS = 20  # restored files load one after another
+
+PALETTE_RESULTS = 12  # commands listed by the command palette
+
+WATCH_POLL_MS = 1000  # how often files are checked for outside changes, without inotify
+
+SAVE_FSYNC = True
+SAVE_POLL_MS = 20
+
+LARGE_FILE_THRESHOLD = 64 * 1024 * 1024  # bytes; larger files open in the read only viewer
+LARGE_FILE_WINDOW_LINES = 200
+LARGE_FILE_PAGE_LINES = 20
+
+LONG_LINE_WIDTH = 10_000  # characters; longer lines are shown split, and read only
+
 FILE_DIALOG_DEFAULT_ARGS = {
     "defaultextension": DEFAULT_FILE_EXTENSION,
     "filetypes": SUPPORTED_FILE_TYPES,
@@ -19,8 +72,22 @@ FILE_DIALOG_DEFAULT_ARGS = {
 
 MENU_LAYOUT = {
     "File": ("New", "New Window", "Open", "Save", "Save As", "Exit"),
-    "Edit": ("Undo", "Cut", "Copy", "Paste", "Delete", "Select All"),
-    "View": ("Status Bar",),
+    "Edit": (
+        "Undo",
+        "Redo",
+        "Cut",
+        "Copy",
+        "Paste",
+        "Delete",
+        "Select All",
+        "Find",
+        "Find Next",
+        "Find Previous",
+        "Replace",
+        "Find in Files",
+        "Go To",
+    ),
+    "View": ("Command Palette", "Zoom In", "Zoom Out", "Restore Default Zoom", "Follow", "Status Bar"),
     "Format": ("Theme", "Wrap Words"),
-    "Help": ("View Help", "About"),
+    "Help": ("View Help", "Performance", "About"),
 }
@@ -0,0 +1,134 @@
+"""
+Notepad document model: owns the text, the text widget is only a view of it
+"""
+
+import os
+import typing
+
+from notepad.features import line_index, piece_table
+
+DEFAULT_BLOCK_SIZE = 1 << 16
+DEFAULT_ENCODING = "utf-8"
+LARGE_EDIT_SIZE = 1 << 20  # removals this long are referenced, not copied, by their edit
+
+
+class Edit(typing.NamedTuple):
+    offset: int
+    removed: typing.Union[str, piece_table.PieceTable]
+    inserted: str
+
+
+class Document:
+    def __init__(self, text: str = ""):
+        self._listeners: typing.List[typing.Callable[[Edit], None]] = []
+        self.reset(text)
+
+    def reset(self, text: str = ""):
+        self.text = piece_table.PieceTable(text)
+        self.lines = line_index.LineIndex.from_buffer(text)
+        self.encoding = DEFAULT_ENCODING
+        self.newline = os.linesep
+        self.compression: typing.Optional[str] = None  # of the file, kept when saving it
+
+    def snapshot(self) -> "Document":
+        """A copy to read from another thread while this document keeps changing"""
+        document = Document.__new__(Document)
+        document._listeners = []
+        document.text = self.text.snapshot()
+        document.lines = self.lines.copy()
+        document.encoding = self.encoding
+        document.newline = self.newline
+        document.compression = self.compression
+        return document
+
+    def subscribe(self, listener: typing.Callable[[Edit], None]):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: typing.Callable[[Edit], None]):
+        self._listeners.remove(listener)
+
+    def _notify(self, edit: Edit):
+        for listener in self._listeners:
+            listener(edit)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def offset(self, line: int, column: int) -> int:
+        """Offset of a 1-based line and 0-based column, as used by tkinter indexes"""
+        if line > len(self.lines):
+            return len(self)
+
+        start = self.lines.line_start(line - 1)
+        if line < len(self.lines):
+            end = self.lines.line_start(line) - 1
+        else:
+            end = len(self)
+        return min(start + column, end)
+
+    def index(self, offset: int) -> str:
+        """Tkinter index of an offset"""
+        line, column = self.lines.position(offset)
+        return f"{line + 1}.{column}"
+
+    def line(self, line: int) -> str:
+        """Text of a 0-based line, without its line ending"""
+        start = self.lines.line_start(line)
+        if line + 1 < len(self.lines):
+            return self.text.get(start, self.lines.line_start(line + 1) - 1)
+        return self.text.get(start)
+
+    def get(self, start: int = 0, end: typing.Optional[int] = None) -> str:
+        return self.text.get(start, end)
+
+    def insert(self, offset: int, text: str, *, notify: bool = True):
+        if not text:
+            return
+
+        offset = max(0, min(offset, len(self)))
+        self.text.insert(offset, text)
+        self.lines.insert(offset, text)
+        if notify:
+            self._notify(Edit(offset, "", text))
+
+    def _removed(self, offset: int, length: int) -> typing.Union[str, piece_table.PieceTable]:
+        """Buffers are append only, so a large removal can be kept as a slice of the table"""
+        if length >= LARGE_EDIT_SIZE:
+            return self.text.slice(offset, offset + length)
+        return self.text.get(offset, offset + length)
+
+    def delete(self, offset: int, length: int, *, notify: bool = True):
+        offset = max(0, min(offset, len(self)))
+        length = min(length, len(self) - offset)
+        if length <= 0:
+            return
+
+        removed = self._removed(offset, length) if notify else ""
+        self.text.delete(offset, length)
+        self.lines.delete(offset, length)
+        if notify:
+            self._notify(Edit(offset, removed, ""))
+
+    def replace(self, offset: int, length: int, text: str, *, notify: bool = True):
+        """Delete and insert as a single edit"""
+        offset = max(0, min(offset, len(self)))
+        length = max(0, min(length, len(self) - offset))
+
+        removed = self._removed(offset, length) if notify else ""
+        self.delete(offset, length, notify=False)
+        self.insert(offset, text, notify=False)
+        if notify and (removed or text):
+            self._notify(Edit(offset, removed, text))
+
+    def iter_blocks(
+        self, start: int = 0, end: typing.Optional[int] = None, *, block_size: int = DEFAULT_BLOCK_SIZE
+    ) -> typing.Iterator[typing.Tuple[int, str]]:
+        """(offset, text) blocks that end on a line boundary, for line oriented scans"""
+        end = len(self) if end is None else min(end, len(self))
+        while start < end:
+            line = self.lines.line_of(min(start + block_size, end))
+            block_end = max(self.lines.line_start(line + 1), start + 1)
+            if line + 1 >= len(self.lines) or block_end > end:
+                block_end = end
+            yield start, self.text.get(start, block_end)
+            start = block_end
@@ -0,0 +1,65 @@
+"""
+Action registry for notepad
+"""
+
+import functools
+import typing
+
+from notepad.features import fuzzy, logger
+
+PREFIX = "action_"
+
+
+class Action(typing.NamedTuple):
+    lookup_key: str  # {menu}_{option}, e.g. "edit_find_next"
+    label: str  # e.g. "Edit: Find Next"
+    function: typing.Callable  # unbound: called with the window as its first argument
+
+
+def label_of(lookup_key: str) -> str:
+    menu, _, option = lookup_key.partition("_")
+    return f"{menu.capitalize()}: {option.replace('_', ' ').title()}"
+
+
+class Registry:
+    """
+    The actions of a class, found once when the class is defined. Only functions are kept,
+    never windows: they are bound to a window when it runs one.
+    """
+
+    def __init__(self, actions: typing.Iterable[Action] = ()):
+        self._actions = {action.lookup_key: action for action in actions}
+        self._keys = list(self._actions)
+        self.index = fuzzy.FuzzyIndex([self._actions[key].label for key in self._keys])
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def __iter__(self) -> typing.Iterator[Action]:
+        return iter(self._actions.values())
+
+    def __contains__(self, lookup_key: str) -> bool:
+        return lookup_key in self._actions
+
+    def get(self, lookup_key: str) -> typing.Optional[Action]:
+        return self._actions.get(lookup_key)
+
+    def bind(self, lookup_key: str, window) -> typing.Optional[typing.Callable]:
+        """The action as a command for `window`, e.g. for a menu entry"""
+        action = self._actions.get(lookup_key)
+        return functools.partial(action.function, window) if action else None
+
+    def search(self, query: str, limit: int = 50) -> typing.List[Action]:
+        return [self._actions[self._keys[i]] for i in self.index.search(query, limit)]
+
+
+def registered(cls):
+    """Class decorator: `cls.actions` holds the methods named `action_{menu}_{option}`"""
+    actions = [
+        Action(name[len(PREFIX) :], label_of(name[len(PREFIX) :]), function)
+        for name, function in vars(cls).items()
+        if name.startswith(PREFIX) and callable(function)
+    ]
+    cls.actions = Registry(actions)
+    logger.LOG.debug("Registered %s actions of %s", len(actions), cls.__name__)
+    return cls
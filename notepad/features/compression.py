@@ -0,0 +1,71 @@
+"""
+Compressed file formats for notepad
+"""
+
+from contextlib import nullcontext
+from pathlib import Path
+import bz2
+import gzip
+import lzma
+import re
+import typing
+import zlib
+
+# recognized by their magic bytes, whatever the file is called. "BZh" alone could start a
+# text file, so bzip2 also needs its block size and the magic of its first block
+MAGIC = (
+    (re.compile(rb"\x1f\x8b\x08"), "gzip"),
+    (re.compile(rb"BZh[1-9](1AY&SY|\x17rE8P\x90)"), "bz2"),
+    (re.compile(rb"\xfd7zXZ\x00"), "xz"),
+)
+MAGIC_SIZE = 10
+SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}  # for files that do not exist yet
+OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+# raised while reading a corrupt or truncated stream, besides OSError (e.g. gzip.BadGzipFile)
+ERRORS = (EOFError, lzma.LZMAError, zlib.error)
+
+
+def detect(path: Path) -> typing.Optional[str]:
+    """Compression format of an existing file, or None for an uncompressed one"""
+    with open(path, "rb") as f:
+        head = f.read(MAGIC_SIZE)
+    for magic, compression in MAGIC:
+        if magic.match(head):
+            return compression
+    return None
+
+
+def for_suffix(path: Path) -> typing.Optional[str]:
+    """Compression format a new file should be saved in"""
+    return SUFFIXES.get(Path(path).suffix.lower())
+
+
+def for_file(path: Path) -> typing.Optional[str]:
+    """Compression format of the file if it exists, else the one its name asks for"""
+    try:
+        return detect(path)
+    except OSError:
+        return for_suffix(path)
+
+
+def wrap(
+    f: typing.BinaryIO, compression: typing.Optional[str], mode: str = "rb"
+) -> typing.ContextManager[typing.BinaryIO]:
+    """
+    Stream `f` through the compressor: memory is bounded by the reads and writes, not the
+    uncompressed size. Leaving the context finishes the stream but leaves `f` open
+    """
+    if compression is None:
+        return nullcontext(f)
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=f, mode=mode)
+    if compression == "bz2":
+        return bz2.BZ2File(f, mode=mode)
+    if compression == "xz":
+        return lzma.LZMAFile(f, mode=mode)
+    raise ValueError(f"Unknown compression {compression}")
+
+
+def open_text(path: Path, encoding: str, errors: str = "strict") -> typing.TextIO:
+    """Open a file as text, decompressing it if needed"""
+    return OPENERS.get(detect(path), open)(path, "rt", encoding=encoding, errors=errors)
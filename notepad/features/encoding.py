@@ -0,0 +1,86 @@
+"""
+Encoding and line ending detection from a bounded file prefix
+"""
+
+import codecs
+import typing
+
+SNIFF_SIZE = 1 << 16
+DEFAULT_ENCODING = "utf-8"
+
+# longest first: the utf-32 little endian BOM starts with the utf-16 one
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+FALLBACK_ENCODINGS = ("cp1252", "latin-1")
+WIDE_ENCODINGS = {"utf-16", "utf-32"}
+
+ENCODING_NAMES = {
+    "utf-8": "UTF-8",
+    "utf-8-sig": "UTF-8 with BOM",
+    "utf-16": "UTF-16",
+    "utf-32": "UTF-32",
+    "cp1252": "Windows 1252",
+    "latin-1": "ISO 8859-1",
+}
+NEWLINE_NAMES = {"\r\n": "Windows (CRLF)", "\n": "Unix (LF)", "\r": "Macintosh (CR)"}
+
+
+class Detection(typing.NamedTuple):
+    encoding: str
+    newline: typing.Optional[str]
+
+
+def detect_encoding(prefix: bytes, *, final: bool = False) -> str:
+    """
+    final: `prefix` is the whole file. Otherwise a multibyte character cut off at the end of
+    the prefix is not treated as invalid
+    """
+    for bom, encoding in BOMS:
+        if prefix.startswith(bom):
+            return encoding
+
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=final)
+        return DEFAULT_ENCODING
+    except UnicodeDecodeError:
+        pass
+
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            prefix.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return FALLBACK_ENCODINGS[-1]
+
+
+def detect_newline(text: str) -> typing.Optional[str]:
+    """Most common line ending in `text`"""
+    crlf = text.count("\r\n")
+    counts = {"\r\n": crlf, "\n": text.count("\n") - crlf, "\r": text.count("\r") - crlf}
+    newline, count = max(counts.items(), key=lambda item: item[1])
+    return newline if count else None
+
+
+def detect(prefix: bytes, *, final: bool = False) -> Detection:
+    encoding = detect_encoding(prefix, final=final)
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(prefix, final=final)
+    return Detection(encoding, detect_newline(text))
+
+
+def is_wide(encoding: str) -> bool:
+    """Newlines are not single bytes in these encodings, so byte oriented scans do not apply"""
+    return encoding in WIDE_ENCODINGS
+
+
+def display_name(encoding: str) -> str:
+    return ENCODING_NAMES.get(encoding, encoding.upper())
+
+
+def newline_name(newline: typing.Optional[str]) -> str:
+    return NEWLINE_NAMES.get(newline, NEWLINE_NAMES["\n"])
@@ -0,0 +1,319 @@
+"""
+Find in Files for notepad: search a directory tree in worker processes
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+import fnmatch
+import itertools
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+import typing
+
+from notepad.features import encoding as text_encoding, logger, search
+
+DEFAULT_MAX_RESULTS = 10_000
+SNIFF_SIZE = 8 * 1024  # enough to tell a binary file from a text file
+BATCH_FILES = 64  # small files are searched in batches: one round trip to a worker each
+BATCH_BYTES = 8 * 1024 * 1024
+PREVIEW_LENGTH = 200  # characters of a matching line kept for the results panel
+COUNT_BLOCK = 16 * 1024 * 1024
+DECODE_BLOCK = 1024 * 1024  # lines decoded at a time, for the queries not searched as bytes
+
+
+class Hit(typing.NamedTuple):
+    path: str
+    line: int  # 1-based
+    column: int  # 0-based, in characters
+    text: str  # the line, cut to PREVIEW_LENGTH
+    line_offset: int  # byte offset of the line start, for the large file viewer
+
+
+class FileResult(typing.NamedTuple):
+    path: str
+    size: int
+    hits: typing.List[Hit]
+    skipped: bool = False  # binary
+    error: typing.Optional[str] = None
+
+
+def iter_files(root: str, include: str = "*") -> typing.Iterator[typing.Tuple[str, int]]:
+    """
+    (path, size) of the files under `root` whose name matches `include`: a directory's files
+    first, then its subdirectories, in name order. Hidden directories are skipped
+    """
+    pattern = re.compile(_translate(include))
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.LOG.warning("Not searching %s: %s", directory, e)
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        subdirectories.append(entry.path)
+                elif entry.is_file() and pattern.match(entry.name):
+                    yield entry.path, entry.stat().st_size
+            except OSError:
+                continue
+        pending.extend(reversed(subdirectories))
+
+
+def _translate(include: str) -> str:
+    """Several globs may be given, separated by ";", e.g. "*.log;*.txt" """
+    return "|".join(fnmatch.translate(glob.strip()) for glob in include.split(";") if glob.strip())
+
+
+def is_binary(prefix: bytes) -> bool:
+    """A NUL byte, unless the file starts with a UTF-16 or UTF-32 byte order mark"""
+    return b"\0" in prefix and not text_encoding.is_wide(text_encoding.detect_encoding(prefix))
+
+
+def searches_bytes(query: search.Query) -> bool:
+    """
+    Plain ASCII text is searched for in the file's bytes. A regex (where "." is one character
+    and "$" comes before a CRLF) or non ASCII text (ignoring its case) is searched for in the
+    decoded lines instead, so it finds what the editor's own Find does
+    """
+    return not query.regex and query.pattern.isascii()
+
+
+def compile_bytes(query: search.Query, file_encoding: str) -> typing.Pattern:
+    """The query as a pattern over the file's bytes: only right for `searches_bytes` queries"""
+    source = query.pattern if query.regex else re.escape(query.pattern)
+    flags = re.MULTILINE | (0 if query.match_case else re.IGNORECASE)
+    return re.compile(_encode(source, file_encoding), flags)
+
+
+def _encode(text: str, file_encoding: str) -> bytes:
+    """Without the byte order mark that e.g. "utf-8-sig" starts its output with"""
+    encoded = text.encode(file_encoding)
+    for bom, _ in text_encoding.BOMS:
+        if encoded.startswith(bom) and not text.startswith("\ufeff"):
+            return encoded[len(bom) :]
+    return encoded
+
+
+def _count_newlines(buffer, start: int, end: int) -> int:
+    """Without copying more than a block of the mapped file at a time"""
+    return sum(buffer[i : min(i + COUNT_BLOCK, end)].count(b"\n") for i in range(start, end, COUNT_BLOCK))
+
+
+def _hit(path: str, buffer, match, line: int, file_encoding: str) -> Hit:
+    line_start = buffer.rfind(b"\n", 0, match.start()) + 1
+    line_end = buffer.find(b"\n", match.start())
+    line_end = len(buffer) if line_end < 0 else line_end
+    preview_end = min(line_end, line_start + PREVIEW_LENGTH * 4)  # at most 4 bytes a character
+    text = buffer[line_start:preview_end].decode(file_encoding, errors="replace").rstrip("\r")
+    column = len(buffer[line_start : match.start()].decode(file_encoding, errors="replace"))
+    return Hit(path, line, column, text[:PREVIEW_LENGTH], line_start)
+
+
+def _search_mapped(path: str, f, query: search.Query, file_encoding: str, max_hits: int) -> typing.List[Hit]:
+    try:
+        pattern = compile_bytes(query, file_encoding)
+    except UnicodeEncodeError:  # the file's encoding cannot hold the pattern
+        return []
+
+    hits = []
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        line, counted = 1, 0
+        for match in pattern.finditer(buffer):
+            if match.end() == match.start():
+                continue
+            line += _count_newlines(buffer, counted, match.start())
+            counted = match.start()
+            hits.append(_hit(path, buffer, match, line, file_encoding))
+            if len(hits) >= max_hits:
+                break
+    return hits
+
+
+def _search_text(
+    path: str,
+    pattern: typing.Pattern,
+    text: str,
+    first_line: int,
+    line_offsets: typing.Optional[typing.Sequence[int]],
+    hits: typing.List[Hit],
+    max_hits: int,
+):
+    """Matches in a block of whole decoded lines, their endings translated to "\n" as the editor does"""
+    line, counted = first_line, 0
+    for match in pattern.finditer(text):
+        if match.end() == match.start():
+            continue
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        line += text.count("\n", counted, line_start)
+        counted = line_start
+        line_end = text.find("\n", match.start())
+        preview = text[line_start : min(line_start + PREVIEW_LENGTH, len(text) if line_end < 0 else line_end)]
+        offset = line_offsets[line - first_line] if line_offsets else 0
+        hits.append(Hit(path, line, match.start() - line_start, preview, offset))
+        if len(hits) >= max_hits:
+            return
+
+
+def _search_lines(path: str, f, query: search.Query, file_encoding: str, max_hits: int) -> typing.List[Hit]:
+    """The file decoded a block of lines at a time, keeping the byte offset of each line"""
+    pattern = search.compile_query(query)
+    hits = []
+    line, offset = 1, 0
+    f.seek(0)
+    for lines in iter(partial(f.readlines, DECODE_BLOCK), []):
+        text = b"".join(lines).decode(file_encoding, errors="replace").replace("\r\n", "\n")
+        offsets = list(itertools.accumulate(map(len, lines), initial=offset))
+        _search_text(path, pattern, text, line, offsets, hits, max_hits)
+        if len(hits) >= max_hits:
+            break
+        line, offset = line + len(lines), offsets[-1]
+    return hits
+
+
+def _search_decoded(path: str, query: search.Query, file_encoding: str, max_hits: int) -> typing.List[Hit]:
+    """UTF-16 and UTF-32 files: their bytes cannot be searched for the pattern's bytes"""
+    pattern = search.compile_query(query)
+    hits = []
+    line = 1
+    with open(path, encoding=file_encoding, errors="replace") as f:
+        for lines in iter(partial(f.readlines, DECODE_BLOCK), []):
+            _search_text(path, pattern, "".join(lines), line, None, hits, max_hits)
+            if len(hits) >= max_hits:
+                break
+            line += len(lines)
+    return hits
+
+
+def search_file(path: str, size: int, query: search.Query, max_hits: int) -> FileResult:
+    try:
+        with open(path, "rb") as f:
+            prefix = f.read(SNIFF_SIZE)
+            if is_binary(prefix):
+                return FileResult(path, size, [], skipped=True)
+            if not prefix:
+                return FileResult(path, size, [])
+
+            file_encoding = text_encoding.detect_encoding(prefix, final=len(prefix) < SNIFF_SIZE)
+            if text_encoding.is_wide(file_encoding):
+                return FileResult(path, size, _search_decoded(path, query, file_encoding, max_hits))
+            if not searches_bytes(query):
+                return FileResult(path, size, _search_lines(path, f, query, file_encoding, max_hits))
+            return FileResult(path, size, _search_mapped(path, f, query, file_encoding, max_hits))
+    except (OSError, ValueError) as e:
+        return FileResult(path, size, [], error=str(e))
+
+
+def search_files(
+    files: typing.Sequence[typing.Tuple[str, int]], query: search.Query, max_hits: int
+) -> typing.List[FileResult]:
+    """A batch of files, searched in one worker"""
+    return [search_file(path, size, query, max_hits) for path, size in files]
+
+
+def iter_batches(
+    files: typing.Iterable[typing.Tuple[str, int]]
+) -> typing.Iterator[typing.List[typing.Tuple[str, int]]]:
+    batch, batch_bytes = [], 0
+    for path, size in files:
+        batch.append((path, size))
+        batch_bytes += size
+        if len(batch) >= BATCH_FILES or batch_bytes >= BATCH_BYTES:
+            yield batch
+            batch, batch_bytes = [], 0
+    if batch:
+        yield batch
+
+
+class FindInFiles:
+    """
+    Walks `root` and searches its files in worker processes, from a coordinating thread.
+    Results are appended to `hits` as each batch of files completes, so the UI can show them
+    while the search runs. Only a few batches are handed out ahead of the workers, so
+    cancelling or reaching `max_results` stops the search early.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        query: search.Query,
+        *,
+        include: str = "*",
+        max_results: int = DEFAULT_MAX_RESULTS,
+        jobs: typing.Optional[int] = None,
+    ):
+        self.root = root
+        self.query = query
+        self.include = include
+        self.max_results = max_results
+        self.jobs = jobs or os.cpu_count() or 1
+        self.hits: typing.List[Hit] = []
+        self.files_searched = 0
+        self.files_skipped = 0
+        self.bytes_searched = 0
+        self.errors: typing.List[str] = []
+        self.done = False
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="find-in-files", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def join(self, timeout: typing.Optional[float] = None):
+        self._thread.join(timeout)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def truncated(self) -> bool:
+        return len(self.hits) >= self.max_results
+
+    def _collect(self, results: typing.List[FileResult]):
+        for result in results:
+            self.files_searched += 1
+            self.files_skipped += result.skipped
+            self.bytes_searched += result.size
+            if result.error is not None:
+                self.errors.append(f"{result.path}: {result.error}")
+            self.hits.extend(result.hits[: self.max_results - len(self.hits)])
+
+    def _run(self):
+        # spawned, not forked: the UI process runs tk and other threads
+        context = multiprocessing.get_context("spawn")
+        batches = iter_batches(iter_files(self.root, self.include))
+        try:
+            with ProcessPoolExecutor(max_workers=self.jobs, mp_context=context) as executor:
+                running = set()
+                while not (self.cancelled or self.truncated):
+                    for batch in batches:
+                        running.add(executor.submit(search_files, batch, self.query, self.max_results))
+                        if len(running) >= 2 * self.jobs:
+                            break
+                    if not running:
+                        break
+
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        self._collect(future.result())
+                executor.shutdown(wait=True, cancel_futures=True)
+        finally:
+            self.done = True
+            logger.LOG.info(
+                "Found %s matches for %s in %s files under %s",
+                len(self.hits), self.query, self.files_searched, self.root,
+            )
@@ -0,0 +1,50 @@
+"""
+Shared fonts and zoom levels for notepad
+"""
+
+import tkinter.font as tkfont
+import typing
+
+DEFAULT_ZOOM = 100
+ZOOM_STEP = 10
+MIN_ZOOM = 10
+MAX_ZOOM = 500
+
+
+def step_zoom(zoom: int, steps: int) -> int:
+    """Zoom percentage `steps` steps in (or out, if negative) from `zoom`"""
+    return max(MIN_ZOOM, min(MAX_ZOOM, zoom + steps * ZOOM_STEP))
+
+
+def zoomed_size(size: int, zoom: int) -> int:
+    return max(1, round(size * zoom / DEFAULT_ZOOM))
+
+
+class FontCache:
+    """
+    Named tk fonts by family and size, shared by every window. Switching a widget to a font
+    that is already cached reuses it instead of making tk resolve a new font description.
+    """
+
+    def __init__(self, root):
+        self._root = root
+        self._fonts: typing.Dict[typing.Tuple[str, int], tkfont.Font] = {}
+        self._default_family: typing.Optional[str] = None
+
+    @property
+    def default_family(self) -> str:
+        """Family of the text widget's default font"""
+        if self._default_family is None:
+            font = tkfont.Font(root=self._root, name="TkFixedFont", exists=True)
+            self._default_family = font.actual("family")
+        return self._default_family
+
+    def get(self, family: typing.Optional[str], size: int) -> tkfont.Font:
+        key = (family or self.default_family, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = tkfont.Font(root=self._root, family=key[0], size=size)
+        return font
+
+    def __len__(self) -> int:
+        return len(self._fonts)
@@ -0,0 +1,82 @@
+"""
+Fuzzy matching index for the notepad command palette
+"""
+
+import collections
+import re
+import typing
+
+PREFIX_LENGTH = 2  # queries this short are matched against word prefixes; longer ones by trigrams
+ABBREVIATION_SCORE = 0.5  # e.g. "fnd nxt": every query word is a subsequence of a label word
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> typing.List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _is_subsequence(short: str, long: str) -> bool:
+    characters = iter(long)
+    return all(character in characters for character in short)
+
+
+def _trigrams(words: typing.Iterable[str]) -> typing.Set[str]:
+    """Trigrams of each word, padded so that word starts and ends count"""
+    grams = set()
+    for word in words:
+        padded = f" {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class FuzzyIndex:
+    """
+    Everything that does not depend on the query is computed once, when the index is built:
+    each label's trigrams and word prefixes, inverted into posting lists. A query then only
+    touches the labels sharing a trigram or a word prefix with it.
+    """
+
+    def __init__(self, labels: typing.Sequence[str]):
+        self.labels = list(labels)
+        self._words = [_words(label) for label in self.labels]
+        self._trigrams: typing.Dict[str, typing.List[int]] = collections.defaultdict(list)
+        self._prefixes: typing.Dict[str, typing.List[int]] = collections.defaultdict(list)
+        for i, words in enumerate(self._words):
+            for gram in _trigrams(words):
+                self._trigrams[gram].append(i)
+            for prefix in {word[:n] for word in words for n in range(1, PREFIX_LENGTH + 1)}:
+                self._prefixes[prefix].append(i)
+
+    def search(self, query: str, limit: int = 50) -> typing.List[int]:
+        """Indexes of the labels matching `query`, best first"""
+        words = _words(query)
+        if not words:
+            return list(range(min(limit, len(self.labels))))
+
+        if sum(map(len, words)) <= PREFIX_LENGTH:
+            candidates = {i: 1.0 for i in self._prefixes.get("".join(words), ())}
+        else:
+            grams = _trigrams(words)
+            counts = collections.Counter()
+            for gram in grams:
+                counts.update(self._trigrams.get(gram, ()))
+            # half the trigrams is enough to forgive a typo or a missing letter
+            candidates = {i: count / len(grams) for i, count in counts.items() if 2 * count >= len(grams)}
+            for i in self._abbreviations(words):
+                candidates[i] = max(candidates.get(i, 0.0), ABBREVIATION_SCORE)
+
+        def rank(i: int) -> tuple:
+            prefixes = sum(any(word.startswith(w) for word in self._words[i]) for w in words)
+            return -candidates[i], -prefixes, len(self.labels[i]), self.labels[i]
+
+        return sorted(candidates, key=rank)[:limit]
+
+    def _abbreviations(self, words: typing.List[str]) -> typing.Set[int]:
+        """Labels with, for each query word, a word starting with its letter that contains it in order"""
+        starting = set.intersection(*(set(self._prefixes.get(w[0], ())) for w in words))
+        return {
+            i
+            for i in starting
+            if all(any(word[0] == w[0] and _is_subsequence(w, word) for word in self._words[i]) for w in words)
+        }
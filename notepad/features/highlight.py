@@ -0,0 +1,173 @@
+"""
+Incremental syntax highlighting for notepad
+"""
+
+from pathlib import Path
+import keyword
+import re
+import typing
+
+CHECKPOINT_LINES = 256  # lexer state is kept at the start of every this many lines
+
+State = typing.Optional[str]
+
+
+class Token(typing.NamedTuple):
+    start: int
+    end: int
+    tag: str
+
+
+class RegexLexer:
+    """
+    Lexes one line at a time. Rules are (tag, pattern) pairs tried together, leftmost match
+    first. Patterns must not match an empty string.
+    """
+
+    stateless = True
+
+    def __init__(self, name: str, rules: typing.Sequence[typing.Tuple[str, str]], flags: int = 0):
+        self.name = name
+        self.tags = tuple(dict.fromkeys(tag for tag, _ in rules))
+        self.pattern = re.compile("|".join(f"(?P<{tag}>{rule})" for tag, rule in rules), flags)
+
+    def lex(self, line: str, state: State = None) -> typing.Tuple[typing.List[Token], State]:
+        tokens = [Token(m.start(), m.end(), m.lastgroup) for m in self.pattern.finditer(line)]
+        return tokens, None
+
+
+class PythonLexer(RegexLexer):
+    """Triple quoted strings span lines, so the open quote is carried as the lexer state"""
+
+    stateless = False
+
+    def __init__(self):
+        super().__init__(
+            "python",
+            [
+                ("comment", r"#.*"),
+                ("triple_quote", r"""(?:\b[rRbBuUfF]{1,2})?(?:'''|\"\"\")"""),
+                ("string", r"""(?:\b[rRbBuUfF]{1,2})?(?:"(?:[^"\\]|\\.)*"?|'(?:[^'\\]|\\.)*'?)"""),
+                ("definition", r"(?<=\bdef )\w+|(?<=\bclass )\w+"),
+                ("keyword", r"\b(?:" + "|".join(keyword.kwlist) + r")\b"),
+                ("number", r"\b\d[\d_]*(?:\.\d*)?(?:[eE][+-]?\d+)?[jJ]?\b"),
+            ],
+        )
+        self.tags = tuple(tag for tag in self.tags if tag != "triple_quote")
+
+    def lex(self, line: str, state: State = None) -> typing.Tuple[typing.List[Token], State]:
+        tokens: typing.List[Token] = []
+        start = pos = 0
+        while True:
+            if state is not None:
+                end = line.find(state, pos)
+                if end < 0:
+                    if start < len(line):
+                        tokens.append(Token(start, len(line), "string"))
+                    return tokens, state
+                pos = end + len(state)
+                tokens.append(Token(start, pos, "string"))
+                state = None
+
+            match = self.pattern.search(line, pos)
+            if match is None:
+                return tokens, None
+
+            if match.lastgroup == "triple_quote":
+                state, start, pos = match.group()[-3:], match.start(), match.end()
+                continue
+            tokens.append(Token(match.start(), match.end(), match.lastgroup))
+            pos = match.end()
+
+
+LOG_LEXER = RegexLexer(
+    "log",
+    [
+        ("timestamp", r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?"),
+        ("error", r"\b(?:ERROR|FATAL|CRITICAL)\b"),
+        ("warning", r"\bWARN(?:ING)?\b"),
+        ("info", r"\bINFO\b"),
+        ("debug", r"\b(?:DEBUG|TRACE)\b"),
+    ],
+)
+JSON_LEXER = RegexLexer(
+    "json",
+    [
+        ("key", r'"(?:[^"\\]|\\.)*"(?=\s*:)'),
+        ("string", r'"(?:[^"\\]|\\.)*"?'),
+        ("number", r"-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b"),
+        ("keyword", r"\b(?:true|false|null)\b"),
+    ],
+)
+PYTHON_LEXER = PythonLexer()
+
+LEXERS_BY_SUFFIX = {
+    ".log": LOG_LEXER,
+    ".json": JSON_LEXER,
+    ".py": PYTHON_LEXER,
+    ".pyw": PYTHON_LEXER,
+}
+TAGS = tuple(dict.fromkeys(tag for lexer in (LOG_LEXER, JSON_LEXER, PYTHON_LEXER) for tag in lexer.tags))
+
+
+class Highlighter:
+    """
+    Lexes lines on demand. Lexer state is checkpointed every `CHECKPOINT_LINES` lines, and
+    the lines last handed out are remembered with the state they started and ended in, so
+    after an edit only the touched lines, and any following lines whose starting state
+    changed, are lexed again.
+    """
+
+    def __init__(self, lexer: RegexLexer):
+        self.lexer = lexer
+        self.reset()
+
+    def reset(self):
+        self._checkpoints: typing.List[State] = [None]
+        self._lexed: typing.Dict[int, typing.Tuple[State, State]] = {}
+
+    def state_at(self, line: int, line_text: typing.Callable[[int], str]) -> State:
+        """Lexer state at the start of a 0-based line"""
+        if self.lexer.stateless:
+            return None
+
+        checkpoint = min(line // CHECKPOINT_LINES, len(self._checkpoints) - 1)
+        state = self._checkpoints[checkpoint]
+        for current in range(checkpoint * CHECKPOINT_LINES, line):
+            _, state = self.lexer.lex(line_text(current), state)
+            if (current + 1) % CHECKPOINT_LINES == 0:
+                self._checkpoints.append(state)
+        return state
+
+    def edited(self, line: int, removed_lines: int = 0, inserted_lines: int = 0):
+        """Lines `line` to `line + removed_lines` were replaced by `inserted_lines + 1` lines"""
+        del self._checkpoints[line // CHECKPOINT_LINES + 1 :]
+        shift = inserted_lines - removed_lines
+        self._lexed = {
+            current if current < line else current + shift: states
+            for current, states in self._lexed.items()
+            if not line <= current <= line + removed_lines
+        }
+
+    def highlight(
+        self, first: int, last: int, line_text: typing.Callable[[int], str]
+    ) -> typing.List[typing.Tuple[int, typing.List[Token]]]:
+        """(line, tokens) of the 0-based lines in [first, last) whose tokens may have changed"""
+        state = self.state_at(first, line_text)
+        lexed = {}
+        changed = []
+        for line in range(first, last):
+            states = self._lexed.get(line)
+            if states is None or states[0] != state:
+                tokens, end_state = self.lexer.lex(line_text(line), state)
+                states = (state, end_state)
+                changed.append((line, tokens))
+            lexed[line] = states
+            state = states[1]
+        self._lexed = lexed
+        return changed
+
+
+def highlighter_for(path: typing.Optional[Path]) -> typing.Optional[Highlighter]:
+    lexer = LEXERS_BY_SUFFIX.get(path.suffix.lower()) if path else None
+    return Highlighter(lexer) if lexer else None
@@ -0,0 +1,196 @@
+"""
+Append-only edit journal for notepad autosave and crash recovery
+"""
+
+from pathlib import Path
+import itertools
+import json
+import os
+import queue
+import threading
+import typing
+
+from notepad.features import compression, logger, piece_table
+
+SUFFIX = ".journal"
+VERSION = 1
+COMPACT_MIN_BYTES = 1 << 20  # never compact smaller journals
+
+_counter = itertools.count()
+
+
+class Base(typing.NamedTuple):
+    """The file on disk that journaled edits apply to"""
+
+    path: str
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def of(cls, path: Path) -> "Base":
+        stat = path.stat()
+        return cls(str(path), stat.st_size, stat.st_mtime_ns)
+
+    def matches(self) -> bool:
+        try:
+            return Base.of(Path(self.path)) == self
+        except OSError:
+            return False
+
+
+class Recovered(typing.NamedTuple):
+    file: typing.Optional[Path]
+    encoding: str
+    newline: typing.Optional[str]
+    text: str
+
+
+class Journal:
+    """
+    Edits are queued by the UI thread and written by a worker thread when flushed, one JSON
+    line each: [offset, removed length, inserted text]. Writes scale with the edits, not the
+    document. Once the journal outgrows the document, `compact` rewrites it as a single
+    insert of a snapshot of the text.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        file: typing.Optional[Path],
+        base: typing.Optional[Base],
+        encoding: str,
+        newline: typing.Optional[str],
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f"{os.getpid()}-{next(_counter)}{SUFFIX}"
+        self._header = {
+            "version": VERSION,
+            "file": str(file) if file else None,
+            "base": base._asdict() if base else None,
+            "encoding": encoding,
+            "newline": newline,
+        }
+        self._pending: typing.List[tuple] = []
+        self._tasks: "queue.Queue" = queue.Queue()
+        self.bytes_written = 0
+        self.error: typing.Optional[Exception] = None
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+        self._tasks.put((self._write_header, ()))
+
+    def append(self, offset: int, removed_length: int, inserted: str):
+        self._pending.append((offset, removed_length, inserted))
+
+    def flush(self):
+        """Hand the queued edits to the worker thread"""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self._tasks.put((self._write_edits, (pending,)))
+
+    def should_compact(self, document_length: int) -> bool:
+        return self.bytes_written > max(COMPACT_MIN_BYTES, 2 * document_length)
+
+    def compact(self, snapshot: piece_table.PieceTable):
+        """Replace everything journaled so far with `snapshot`, the text as of now"""
+        self.flush()
+        self._header["base"] = None
+        self._tasks.put((self._write_snapshot, (snapshot,)))
+
+    def discard(self):
+        """Stop journaling and delete the journal, e.g. once the document was saved"""
+        self._pending.clear()
+        self._tasks.put(None)
+
+    def join(self):
+        """Wait for every write queued so far"""
+        self._tasks.join()
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            try:
+                if task is None:
+                    self.path.unlink(missing_ok=True)
+                    return
+                if self.error is None:
+                    write, args = task
+                    write(*args)
+            except OSError as e:
+                logger.LOG.warning("Could not write journal %s: %s", self.path, e)
+                self.error = e
+            finally:
+                self._tasks.task_done()
+
+    def _write_header(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            self.bytes_written = f.write(json.dumps(self._header) + "\n")
+
+    def _write_edits(self, edits: typing.List[tuple]):
+        lines = "".join(json.dumps(edit) + "\n" for edit in edits)
+        with open(self.path, "a", encoding="utf-8") as f:
+            self.bytes_written += f.write(lines)
+
+    @logger.log_debug
+    def _write_snapshot(self, snapshot: piece_table.PieceTable):
+        temp = self.path.with_suffix(".compact")
+        with open(temp, "w", encoding="utf-8") as f:
+            written = f.write(json.dumps(self._header) + "\n")
+            written += f.write(json.dumps([0, 0, str(snapshot)]) + "\n")
+        os.replace(temp, self.path)
+        self.bytes_written = written
+
+
+def _is_running(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:  # e.g. no permission to signal it: someone is running it
+        return True
+    return True
+
+
+def orphans(directory: Path) -> typing.List[Path]:
+    """Journals left behind by notepad processes that are no longer running, oldest first"""
+    if not directory.is_dir():
+        return []
+
+    found = []
+    for path in directory.glob(f"*{SUFFIX}"):
+        pid = path.stem.split("-")[0]
+        if pid.isdigit() and not _is_running(int(pid)):
+            found.append(path)
+    return sorted(found, key=lambda path: path.stat().st_mtime)
+
+
+def recover(path: Path) -> typing.Optional[Recovered]:
+    """
+    Replay a journal onto its base file. None if the base file changed since, so the edits
+    no longer apply. A torn last line, from a crash mid write, ends the replay.
+    """
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        base = Base(**header["base"]) if header["base"] else None
+        if base is not None and not base.matches():
+            logger.LOG.warning("%s changed since %s was written", base.path, path)
+            return None
+
+        text = ""
+        if base is not None:
+            with compression.open_text(base.path, header["encoding"], errors="replace") as base_file:
+                text = base_file.read()
+
+        table = piece_table.PieceTable(text)
+        for line in f:
+            try:
+                offset, removed_length, inserted = json.loads(line)
+            except ValueError:
+                break
+            table.delete(offset, removed_length)
+            table.insert(offset, inserted)
+
+    file = Path(header["file"]) if header["file"] else None
+    return Recovered(file, header["encoding"], header["newline"], str(table))
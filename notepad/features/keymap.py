@@ -0,0 +1,107 @@
+"""
+Keymap dispatch for notepad
+"""
+
+from functools import lru_cache
+from pathlib import Path
+import json
+import typing
+
+from notepad.features import logger, shortcuts
+
+BINDTAG = "Keymap"  # comes before "Text", so shortcuts win over the text widget's own bindings
+
+# event.state bits: shift, control, and alt as X11 (mod1) and Windows report it
+_MODIFIER_MASKS = (("ctrl", 0x4), ("alt", 0x8 | 0x20000), ("shift", 0x1))
+_MODIFIER_KEYSYMS = {
+    "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R", "Meta_L", "Meta_R",
+    "Super_L", "Super_R", "Caps_Lock", "Num_Lock", "ISO_Level3_Shift",
+}
+
+Stroke = typing.Tuple[str, ...]
+Binding = typing.Union[shortcuts.Shortcut, shortcuts.Chord]
+
+
+class Node:
+    __slots__ = ("children", "action")
+
+    def __init__(self):
+        self.children: typing.Dict[Stroke, "Node"] = {}
+        self.action: typing.Optional[str] = None
+
+
+def stroke_of(keysym: str, state: int) -> typing.Optional[Stroke]:
+    """The stroke of a key press, None for a modifier pressed alone"""
+    if keysym in _MODIFIER_KEYSYMS:
+        return None
+
+    key = keysym.lower()
+    modifiers = tuple(name for name, mask in _MODIFIER_MASKS if state & mask)
+    shifted_symbol = len(key) > 1 and key not in shortcuts.FUNCTION_KEYS  # e.g. "plus" is shift+equal
+    if shifted_symbol or key.isdigit():
+        modifiers = tuple(m for m in modifiers if m != "shift")
+    return modifiers + (key,)
+
+
+class Keymap:
+    """
+    A prefix trie of strokes, compiled once from lookup keys and their shortcuts. Following
+    a key press down the trie costs one dict lookup, whatever the number of bindings.
+    """
+
+    def __init__(self, bindings: typing.Mapping[str, Binding]):
+        self.bindings = dict(bindings)
+        self.root = Node()
+        for lookup_key, binding in self.bindings.items():
+            self._add(lookup_key, binding.strokes)
+
+    def _add(self, lookup_key: str, strokes: typing.Tuple[Stroke, ...]):
+        node = self.root
+        for stroke in strokes:
+            if node.action is not None:
+                raise ValueError(f"{lookup_key} starts with the shortcut of {node.action}")
+            node = node.children.setdefault(stroke, Node())
+        if node.action is not None or node.children:
+            raise ValueError(f"{lookup_key} conflicts with another shortcut")
+        node.action = lookup_key
+
+    def step(self, node: Node, stroke: Stroke) -> typing.Optional[Node]:
+        """The node after `stroke`: its action is None while a chord is incomplete"""
+        return node.children.get(stroke)
+
+
+def compile_bindings(overrides: typing.Mapping[str, typing.Optional[str]]) -> Keymap:
+    """The default shortcuts with `overrides` applied: a null shortcut unbinds its action"""
+    bindings: typing.Dict[str, Binding] = dict(shortcuts.SHORTCUTS)
+    for lookup_key, text in overrides.items():
+        if text is None:
+            bindings.pop(lookup_key, None)
+        else:
+            bindings[lookup_key] = shortcuts.parse(text)
+    return Keymap(bindings)
+
+
+@lru_cache(maxsize=None)
+def _load(path: typing.Optional[Path], mtime_ns: int) -> Keymap:
+    if path is None:
+        return compile_bindings({})
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            return compile_bindings(json.load(f))
+    except (OSError, ValueError, AttributeError) as e:
+        logger.LOG.warning("Ignoring keymap %s: %s", path, e)
+        return _load(None, 0)
+
+
+def load(path: typing.Optional[Path] = None) -> Keymap:
+    """
+    The default keymap, with the user's keymap file applied when it exists: a JSON object of
+    lookup keys and shortcuts, e.g. {"edit_find": "ctrl+k ctrl+f"}. Compiled once per version
+    of the file
+    """
+    try:
+        mtime_ns = path.stat().st_mtime_ns if path is not None else 0
+    except FileNotFoundError:
+        path, mtime_ns = None, 0
+    return _load(path, mtime_ns)
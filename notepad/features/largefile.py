@@ -0,0 +1,91 @@
+"""
+Memory mapped, read only view over files too large for a text widget
+"""
+
+from pathlib import Path
+import mmap
+import os
+import typing
+
+from notepad import constants
+
+DEFAULT_WINDOW_BYTES = 1 << 20  # cap for files with very long lines
+DEFAULT_ENCODING = "utf-8"
+
+
+class Window(typing.NamedTuple):
+    text: str
+    start: int
+    end: int
+
+
+class MappedFile:
+    """
+    Byte offsets into a memory mapped file. Only the slice that is being displayed is ever
+    decoded, so resident memory stays bounded no matter how big the file is.
+    """
+
+    def __init__(self, path: Path, *, encoding: str = DEFAULT_ENCODING):
+        self.path = Path(path)
+        self.encoding = encoding
+        self._file = open(self.path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._map = b""
+        if self.size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def buffer(self) -> typing.Union[mmap.mmap, bytes]:
+        return self._map
+
+    def line_start(self, offset: int) -> int:
+        offset = max(0, min(offset, self.size))
+        return self._map.rfind(b"\n", 0, offset) + 1
+
+    def next_line(self, offset: int, count: int = 1) -> int:
+        for _ in range(count):
+            newline = self._map.find(b"\n", offset)
+            if newline == -1:
+                return self.size
+            offset = newline + 1
+        return offset
+
+    def previous_line(self, offset: int, count: int = 1) -> int:
+        offset = self.line_start(offset)
+        for _ in range(count):
+            if offset == 0:
+                break
+            offset = self.line_start(offset - 1)
+        return offset
+
+    def offset_at_fraction(self, fraction: float) -> int:
+        fraction = max(0.0, min(fraction, 1.0))
+        return self.line_start(int(self.size * fraction))
+
+    def fraction_at_offset(self, offset: int) -> float:
+        if not self.size:
+            return 0.0
+        return offset / self.size
+
+    def read_window(
+        self,
+        offset: int,
+        *,
+        max_lines: int = constants.LARGE_FILE_WINDOW_LINES,
+        max_bytes: int = DEFAULT_WINDOW_BYTES,
+    ) -> Window:
+        start = self.line_start(offset)
+        end = min(self.next_line(start, max_lines), start + max_bytes)
+        text = self._map[start:end].decode(self.encoding, errors="replace")
+        return Window(text, start, end)
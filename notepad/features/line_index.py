@@ -0,0 +1,112 @@
+"""
+Line start offset index
+"""
+
+from array import array
+import itertools
+import operator
+import typing
+
+SCAN_CHUNK_SIZE = 1 << 20
+
+
+def _newline_for(buffer) -> typing.Union[str, bytes]:
+    return "\n" if isinstance(buffer, str) else b"\n"
+
+
+def scan_line_starts(text: typing.Union[str, bytes], base: int = 0) -> typing.Iterator[int]:
+    """Offsets just past every newline in `text`, shifted by `base`"""
+    parts = text.split(_newline_for(text))
+    lengths = itertools.accumulate(map(len, parts[:-1]))
+    return map(operator.add, lengths, range(base + 1, base + len(parts)))
+
+
+class LineIndex:
+    """
+    Start offset of every line, stored in a compact array. Offsets are characters for text
+    and bytes for binary buffers.
+
+    Edits shift the lines after them through a lazily applied step, so consecutive edits
+    close to each other (typing) only touch the lines between them.
+    """
+
+    def __init__(self, starts: typing.Iterable[int] = (0,)):
+        self._starts = array("q", starts)
+        self._step_line = len(self._starts)
+        self._step = 0
+
+    @classmethod
+    def from_buffer(cls, buffer, *, chunk_size: int = SCAN_CHUNK_SIZE) -> "LineIndex":
+        index = cls()
+        for base in range(0, len(buffer), chunk_size):
+            index._starts.extend(scan_line_starts(buffer[base : base + chunk_size], base))
+        index._step_line = len(index._starts)
+        return index
+
+    def copy(self) -> "LineIndex":
+        index = LineIndex.__new__(LineIndex)
+        index._starts = array("q", self._starts)
+        index._step_line = self._step_line
+        index._step = self._step
+        return index
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def line_start(self, line: int) -> int:
+        """Offset of a 0-based line, clamped to the last line"""
+        line = max(0, min(line, len(self._starts) - 1))
+        if line >= self._step_line:
+            return self._starts[line] + self._step
+        return self._starts[line]
+
+    def line_of(self, offset: int) -> int:
+        """0-based line containing `offset`"""
+        low, high = 0, len(self._starts) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.line_start(middle) <= offset:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def position(self, offset: int) -> typing.Tuple[int, int]:
+        """0-based (line, column) of `offset`"""
+        line = self.line_of(offset)
+        return line, offset - self.line_start(line)
+
+    def _shift(self, start: int, end: int, delta: int):
+        starts = self._starts
+        for line in range(start, end):
+            starts[line] += delta
+
+    def _move_step(self, line: int, delta: int):
+        """Shift every line after `line` by `delta`"""
+        if self._step:
+            if self._step_line <= line:
+                self._shift(self._step_line, line + 1, self._step)
+            else:
+                self._shift(line + 1, self._step_line, -self._step)
+
+        self._step_line = line + 1
+        self._step += delta
+        if self._step_line >= len(self._starts):
+            self._step = 0
+
+    def insert(self, offset: int, text: typing.Union[str, bytes]):
+        line = self.line_of(offset)
+        self._move_step(line, len(text))
+
+        step = self._step if self._step_line < len(self._starts) else 0
+        new_starts = array("q", (start - step for start in scan_line_starts(text, offset)))
+        self._starts[line + 1 : line + 1] = new_starts
+
+    def delete(self, offset: int, length: int):
+        if length <= 0:
+            return
+
+        line = self.line_of(offset)
+        last_removed = self.line_of(offset + length)
+        self._move_step(line, -length)
+        del self._starts[line + 1 : last_removed + 1]
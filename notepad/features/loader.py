@@ -0,0 +1,172 @@
+"""
+Streaming file loader for notepad
+"""
+
+from pathlib import Path
+import codecs
+import io
+import queue
+import threading
+import time
+import typing
+
+from notepad.features import compression as file_compression, encoding as text_encoding, logger
+
+DEFAULT_CHUNK_SIZE = 1 << 16  # 64 KiB: roughly a first screen of text
+DEFAULT_MAX_PENDING_CHUNKS = 64
+
+_DONE = object()
+_UNDECODABLE = threading.local()  # per worker thread: each load reads on its own thread
+
+
+def _count_undecodable(error: UnicodeDecodeError) -> typing.Tuple[str, int]:
+    """errors="replace", counting the byte sequences replaced"""
+    _UNDECODABLE.count += 1
+    return "\ufffd", error.end
+
+
+codecs.register_error("notepad.count_undecodable", _count_undecodable)
+
+
+class Chunk(typing.NamedTuple):
+    text: str
+    bytes_read: int  # of the file, so compressed bytes for a compressed file
+    bytes_decoded: int = 0  # uncompressed bytes
+
+
+class StreamingLoad:
+    """
+    Reads a file on a worker thread in fixed-size chunks. The UI thread polls `drain` to
+    collect decoded text, so a large file never blocks the event loop.
+
+    Without an explicit encoding, it is detected from a bounded prefix of the file before
+    the first chunk is queued. Compressed files are decompressed as they stream through.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        encoding: typing.Optional[str] = None,
+        max_pending_chunks: int = DEFAULT_MAX_PENDING_CHUNKS,
+    ):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.total_size = self.path.stat().st_size
+        self.compression = file_compression.detect(self.path)
+        self.bytes_read = 0
+        self.bytes_decoded = 0
+        self.started: typing.Optional[float] = None
+        self.newlines: typing.Optional[typing.Union[str, tuple]] = None
+        self.detection: typing.Optional[text_encoding.Detection] = None
+        self.undecodable = 0  # byte sequences invalid in the encoding, loaded as U+FFFD
+        self.error: typing.Optional[Exception] = None
+        self.done = False
+
+        self._queue = queue.Queue(maxsize=max_pending_chunks)
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._read, name=f"load-{self.path.name}", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        logger.LOG.info("Cancelling load of %s", self.path)
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def newline(self) -> typing.Optional[str]:
+        """
+        Line ending to save with, if the file had any: detected from the prefix until the
+        whole file was read. Mixed files prefer CRLF
+        """
+        if isinstance(self.newlines, tuple):
+            return "\r\n" if "\r\n" in self.newlines else "\n"
+        if self.newlines is None and self.detection is not None:
+            return self.detection.newline
+        return self.newlines
+
+    @property
+    def progress(self) -> float:
+        if not self.total_size:
+            return 1.0
+        return min(self.bytes_read / self.total_size, 1.0)
+
+    @property
+    def rate(self) -> float:
+        """Uncompressed bytes loaded per second"""
+        seconds = time.perf_counter() - self.started if self.started else 0
+        return self.bytes_decoded / seconds if seconds else 0.0
+
+    def _decoder(self) -> io.IncrementalNewlineDecoder:
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="notepad.count_undecodable")
+        return io.IncrementalNewlineDecoder(decoder, translate=True)
+
+    def _put(self, item) -> bool:
+        while not self.cancelled:
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _detect(self, f) -> typing.List[bytes]:
+        """Sniff the file prefix, returning it split into chunks still to decode"""
+        prefix = f.read(text_encoding.SNIFF_SIZE)
+        self.detection = text_encoding.detect(prefix, final=len(prefix) < text_encoding.SNIFF_SIZE)
+        if self.encoding is None:
+            self.encoding = self.detection.encoding
+        logger.LOG.info("Detected %s in %s", self.detection, self.path)
+        return [prefix[i : i + self.chunk_size] for i in range(0, len(prefix), self.chunk_size)]
+
+    def _read(self):
+        decoder = None
+        _UNDECODABLE.count = 0
+        try:
+            with open(self.path, "rb") as raw, file_compression.wrap(raw, self.compression) as f:
+                pending = self._detect(f)
+                decoder = self._decoder()
+                decoded = 0
+                while not self.cancelled:
+                    data = pending.pop(0) if pending else f.read(self.chunk_size)
+                    decoded += len(data)
+                    text = decoder.decode(data, final=not data)
+                    self.undecodable = _UNDECODABLE.count
+                    if text and not self._put(Chunk(text, raw.tell(), decoded)):
+                        break
+                    if not data:
+                        break
+        except (OSError, ValueError, *file_compression.ERRORS) as e:
+            logger.LOG.error("Failed loading %s: %s", self.path, e)
+            self.error = e
+        finally:
+            if decoder is not None:
+                self.newlines = decoder.newlines
+            self._put(_DONE)
+
+    def drain(self, max_chunks: int) -> typing.List[Chunk]:
+        """Collect up to `max_chunks` decoded chunks without blocking"""
+        chunks = []
+        while len(chunks) < max_chunks and not self.done:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is _DONE:
+                self.done = True
+                break
+
+            self.bytes_read = item.bytes_read
+            self.bytes_decoded = item.bytes_decoded
+            chunks.append(item)
+        return chunks
@@ -3,13 +3,57 @@ Custom notepad logging helpers
 """
 
 from functools import wraps, partial
+import json
 import logging
+import math
+import time
+import typing
 
 LOG = logging.getLogger(__name__)
 
+_profiling = False
 
 
-def configure_logging(verbose: int):
+class Histogram:
+    """Wall time histogram, bucketed by powers of two microseconds"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets: typing.Dict[int, int] = {}
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        bucket = int(seconds * 1e6).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1e3,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "min_us": self.min * 1e6 if self.count else 0.0,
+            "max_us": self.max * 1e6,
+            "buckets_us": {f"<{2 ** bucket}": n for bucket, n in sorted(self.buckets.items())},
+        }
+
+
+TIMINGS: typing.Dict[str, Histogram] = {}
+
+
+def configure_logging(verbose: int, profile: bool = False):
+    """
+    Must run before the app is imported: decorators only instrument methods when logging
+    at their level, or profiling, was already on at import time.
+    """
+    global _profiling
+    _profiling = profile
+
     level = logging.WARN
     if verbose == 1:
         level = logging.INFO
@@ -20,20 +64,52 @@ def configure_logging(verbose: int):
     return level
 
 
-def _logger(func, level):
+def is_profiling() -> bool:
+    return _profiling
+
+
+def format_timings() -> str:
+    rows = sorted(TIMINGS.items(), key=lambda item: item[1].total, reverse=True)
+    lines = [f"{'method':<45}{'count':>8}{'mean ms':>10}{'max ms':>10}"]
+    for name, histogram in rows:
+        if not histogram.count:  # instrumented, never called
+            continue
+        mean = histogram.total / histogram.count
+        lines.append(f"{name:<45}{histogram.count:>8}{mean * 1e3:>10.2f}{histogram.max * 1e3:>10.2f}")
+    return "\n".join(lines)
+
+
+def dump_timings(path: str):
+    with open(path, "w") as f:
+        json.dump({name: h.as_dict() for name, h in TIMINGS.items()}, f, indent=2)
+
+
+def _logger(func, level: int):
+    log = LOG.isEnabledFor(level)
+    if not (log or _profiling):
+        return func
+
+    histogram = TIMINGS.setdefault(func.__qualname__, Histogram())
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        level("Entering method %s", func.__name__)
-        has_other_params_beside_self = len(args) > 1
-        if has_other_params_beside_self or kwargs:
-            level("Args %s kwargs %s", args, kwargs)
+        if log:
+            LOG.log(level, "Entering method %s", func.__name__)
+            has_other_params_beside_self = len(args) > 1
+            if has_other_params_beside_self or kwargs:
+                LOG.log(level, "Args %s kwargs %s", args, kwargs)
+
+        start = time.perf_counter()
         res = func(*args, **kwargs)
-        level("Exiting method %s", func.__name__)
+        histogram.record(time.perf_counter() - start)
+
+        if log:
+            LOG.log(level, "Exiting method %s", func.__name__)
         return res
 
     return wrapper
 
 
-log_info = partial(_logger, level=LOG.info)
-log_debug = partial(_logger, level=LOG.debug)
+log_info = partial(_logger, level=logging.INFO)
+log_debug = partial(_logger, level=logging.DEBUG)
 log_action = log_info  # could have something more specific for actions
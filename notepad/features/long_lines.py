@@ -0,0 +1,84 @@
+"""
+Display segments for overlong lines in notepad
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+import typing
+
+from notepad.features import line_index
+
+
+class LineSegmenter:
+    """
+    Splits lines longer than `width` characters into display segments as text streams
+    through, by adding soft line breaks to what the text widget shows. The document keeps
+    the real text: breaks are recorded as the document offsets they come before, so
+    positions map between the view and the document in both directions.
+    """
+
+    def __init__(self, width: int):
+        self.width = width
+        self.breaks = array("q")
+        self._offset = 0  # document offset of the next character
+        self._column = 0  # its column in its line
+
+    def __bool__(self) -> bool:
+        """Whether any line was long enough to be split"""
+        return bool(self.breaks)
+
+    def segment(self, text: str) -> str:
+        """Display text of the next piece of the document"""
+        lines = text.split("\n")
+        if self._column + len(lines[0]) <= self.width and max(map(len, lines)) <= self.width:
+            self._offset += len(text)
+            self._column = self._column + len(text) if len(lines) == 1 else len(lines[-1])
+            return text
+
+        pieces = []
+        for i, line in enumerate(lines):
+            if i:
+                pieces.append("\n")
+                self._offset += 1
+                self._column = 0
+
+            position = 0
+            while len(line) - position > self.width - self._column:
+                end = position + self.width - self._column
+                pieces.append(line[position:end])
+                pieces.append("\n")
+                self._offset += end - position
+                self.breaks.append(self._offset)
+                position, self._column = end, 0
+
+            pieces.append(line[position:])
+            self._offset += len(line) - position
+            self._column += len(line) - position
+        return "".join(pieces)
+
+    def view_position(self, lines: line_index.LineIndex, offset: int) -> typing.Tuple[int, int]:
+        """0-based view line and column of a document offset"""
+        line, column = lines.position(offset)
+        segments = bisect_right(self.breaks, offset)
+        line_start = offset - column
+        if segments and self.breaks[segments - 1] > line_start:
+            column = offset - self.breaks[segments - 1]
+        return line + segments, column
+
+    def document_offset(self, lines: line_index.LineIndex, view_line: int, column: int) -> int:
+        """Document offset of a 0-based view line and column, clamped to that display line"""
+        low, high = 0, min(view_line, len(lines) - 1)
+        while low < high:  # last document line that starts at or before the view line
+            middle = (low + high + 1) // 2
+            if middle + bisect_left(self.breaks, lines.line_start(middle)) <= view_line:
+                low = middle
+            else:
+                high = middle - 1
+
+        line_start = lines.line_start(low)
+        line_end = lines.line_start(low + 1) - 1 if low + 1 < len(lines) else self._offset
+        first, last = bisect_left(self.breaks, line_start), bisect_left(self.breaks, line_end)
+        segment = min(view_line - low, last)  # breaks before the display line
+        start = self.breaks[segment - 1] if segment > first else line_start
+        end = self.breaks[segment] if segment < last else line_end
+        return min(start + column, end)
@@ -0,0 +1,175 @@
+"""
+Piece table text storage
+"""
+
+import bisect
+import itertools
+import operator
+import typing
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+ADD_BUFFER_SIZE = 1 << 12  # typed text is appended to one buffer until it is this long
+
+_length = operator.itemgetter(2)
+
+
+class Piece(typing.NamedTuple):
+    buffer: int
+    start: int
+    length: int
+
+
+class PieceTable:
+    """
+    Text stored as a sequence of pieces pointing into buffers: the original text, then add
+    buffers. Small inserts are appended to the last add buffer, and an insert right after the
+    piece that ends the add buffer extends that piece, so typing grows one piece instead of
+    adding one per keystroke. Pieces are found by bisecting their cumulative end offsets.
+
+    Buffers are append only (an add buffer is only ever replaced by a longer string with the
+    same prefix), so a snapshot (a copy of the piece list) stays valid while the table keeps
+    changing, and can be read from another thread.
+    """
+
+    def __init__(self, text: str = ""):
+        self._buffers: typing.List[str] = [text]
+        self._pieces: typing.List[Piece] = [Piece(0, 0, len(text))] if text else []
+        self._ends: typing.List[int] = [len(text)] if text else []  # cumulative, one per piece
+        self._length = len(text)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __str__(self) -> str:
+        return self.get()
+
+    @property
+    def piece_count(self) -> int:
+        return len(self._pieces)
+
+    def snapshot(self) -> "PieceTable":
+        table = PieceTable.__new__(PieceTable)
+        table._buffers = self._buffers
+        table._pieces = list(self._pieces)
+        table._ends = list(self._ends)
+        table._length = self._length
+        return table
+
+    def slice(self, start: int, end: typing.Optional[int] = None) -> "PieceTable":
+        """A table of the text between `start` and `end`, sharing this table's buffers"""
+        start = self._clamp(start)
+        end = self._length if end is None else max(start, self._clamp(end))
+
+        table = PieceTable.__new__(PieceTable)
+        table._buffers = self._buffers
+        table._pieces = []
+        table._length = end - start
+
+        for piece, position in self._iter_pieces(start, end):
+            low, high = max(start, position), min(end, position + piece.length)
+            table._pieces.append(Piece(piece.buffer, piece.start + low - position, high - low))
+        table._ends = list(itertools.accumulate(map(_length, table._pieces)))
+        return table
+
+    def count(self, character: str) -> int:
+        return sum(chunk.count(character) for chunk in self.iter_chunks())
+
+    def _clamp(self, offset: int) -> int:
+        return max(0, min(offset, self._length))
+
+    def _start(self, i: int) -> int:
+        return self._ends[i - 1] if i else 0
+
+    def _locate(self, offset: int) -> typing.Tuple[int, int]:
+        """(piece index, offset inside that piece) of a document offset"""
+        i = bisect.bisect_right(self._ends, offset)
+        if i == len(self._pieces):
+            return i, 0
+        return i, offset - self._start(i)
+
+    def _reindex(self, i: int):
+        """Recompute the cumulative end offsets from piece `i` on"""
+        ends = itertools.accumulate(map(_length, self._pieces[i:]), initial=self._start(i))
+        self._ends[i:] = itertools.islice(ends, 1, None)
+
+    def _iter_pieces(self, start: int, end: int) -> typing.Iterator[typing.Tuple[Piece, int]]:
+        """(piece, its document offset) of the pieces overlapping [start, end)"""
+        i = bisect.bisect_right(self._ends, start)
+        position = self._start(i)
+        while i < len(self._pieces) and position < end:
+            piece = self._pieces[i]
+            yield piece, position
+            position += piece.length
+            i += 1
+
+    def _append_text(self, text: str) -> Piece:
+        """Store `text`, in the last add buffer while it is small"""
+        last = len(self._buffers) - 1
+        if last and len(self._buffers[last]) + len(text) <= ADD_BUFFER_SIZE:
+            start = len(self._buffers[last])
+            self._buffers[last] += text
+            return Piece(last, start, len(text))
+
+        self._buffers.append(text)
+        return Piece(len(self._buffers) - 1, 0, len(text))
+
+    def insert(self, offset: int, text: str):
+        if not text:
+            return
+
+        i, inner = self._locate(self._clamp(offset))
+        new = self._append_text(text)
+        previous = self._pieces[i - 1] if i and not inner else None
+        if inner:
+            piece = self._pieces[i]
+            head = Piece(piece.buffer, piece.start, inner)
+            tail = Piece(piece.buffer, piece.start + inner, piece.length - inner)
+            self._pieces[i : i + 1] = [head, new, tail]
+            self._ends[i : i + 1] = [0, 0, 0]
+        elif previous and previous.buffer == new.buffer and previous.start + previous.length == new.start:
+            i -= 1  # typing on right after the previous insert
+            self._pieces[i] = Piece(previous.buffer, previous.start, previous.length + new.length)
+        else:
+            self._pieces.insert(i, new)
+            self._ends.insert(i, 0)
+        self._reindex(i)
+        self._length += len(text)
+
+    def delete(self, offset: int, length: int):
+        start, end = self._clamp(offset), self._clamp(offset + length)
+        if end <= start:
+            return
+
+        first, inner_start = self._locate(start)
+        last, inner_end = self._locate(end)
+
+        replacement = []
+        if inner_start:
+            piece = self._pieces[first]
+            replacement.append(Piece(piece.buffer, piece.start, inner_start))
+        if inner_end:
+            piece = self._pieces[last]
+            replacement.append(Piece(piece.buffer, piece.start + inner_end, piece.length - inner_end))
+            last += 1
+
+        self._pieces[first:last] = replacement
+        self._ends[first:last] = [0] * len(replacement)
+        self._reindex(first)
+        self._length -= end - start
+
+    def iter_chunks(
+        self, start: int = 0, end: typing.Optional[int] = None, *, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> typing.Iterator[str]:
+        """Text between `start` and `end`, at most `chunk_size` characters at a time"""
+        start = self._clamp(start)
+        end = self._length if end is None else self._clamp(end)
+
+        for piece, position in self._iter_pieces(start, end):
+            buffer = self._buffers[piece.buffer]
+            low = piece.start + max(start - position, 0)
+            high = piece.start + min(end, position + piece.length) - position
+            for chunk_start in range(low, high, chunk_size):
+                yield buffer[chunk_start : min(chunk_start + chunk_size, high)]
+
+    def get(self, start: int = 0, end: typing.Optional[int] = None) -> str:
+        return "".join(self.iter_chunks(start, end))
@@ -0,0 +1,145 @@
+"""
+Streaming, atomic file saver
+"""
+
+from pathlib import Path
+import codecs
+import os
+import tempfile
+import threading
+import time
+import typing
+
+from notepad.features import compression as file_compression, logger
+
+DEFAULT_ENCODING = "utf-8"
+MB = 1024 * 1024
+
+
+class SaveResult(typing.NamedTuple):
+    path: Path
+    bytes_written: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second"""
+        return self.bytes_written / self.seconds if self.seconds else float("inf")
+
+    @property
+    def summary(self) -> str:
+        return (
+            f"Saved {self.bytes_written / MB:.1f} MB in {self.seconds:.2f}s "
+            f"({self.throughput / MB:.1f} MB/s)"
+        )
+
+
+def _current_umask() -> int:
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+# read once, at import: reading it means briefly changing it, which is not thread safe
+UMASK = _current_umask()
+
+
+def _copy_mode(source: Path, destination: str):
+    """The mode of the file being replaced, or the one a new file would get from open()"""
+    try:
+        mode = source.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~UMASK
+    os.chmod(destination, mode)
+
+
+def _fsync_directory(directory: Path):
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def save(
+    chunks: typing.Iterable[str],
+    path: Path,
+    *,
+    encoding: str = DEFAULT_ENCODING,
+    newline: str = "\n",
+    compression: typing.Optional[str] = None,
+    fsync: bool = False,
+    replace_if: typing.Optional[typing.Callable[[], bool]] = None,
+) -> SaveResult:
+    """
+    Stream `chunks` to a temporary file next to `path` and rename it over `path`, so the
+    target is either the old or the new file, never a truncated one. `bytes_written` counts
+    the encoded text, before any compression. A symlink is followed: its target is replaced.
+
+    replace_if: asked once every chunk is written; when it returns False `path` is left as it
+    was, e.g. when the chunks turned out to be the same text
+    """
+    path = Path(path)
+    target = Path(os.path.realpath(path))
+    start = time.perf_counter()
+    written = 0
+    encoder = codecs.getincrementalencoder(encoding)()
+
+    fd, temp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            with file_compression.wrap(raw, compression, "wb") as f:
+                for chunk in chunks:
+                    if newline != "\n":
+                        chunk = chunk.replace("\n", newline)
+                    written += f.write(encoder.encode(chunk))
+                written += f.write(encoder.encode("", final=True))
+
+            if fsync:
+                raw.flush()
+                os.fsync(raw.fileno())
+
+        if replace_if is not None and not replace_if():
+            os.unlink(temp)
+            return SaveResult(path, 0, time.perf_counter() - start)
+
+        _copy_mode(target, temp)
+        os.replace(temp, target)
+        if fsync:
+            _fsync_directory(target.parent)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+    return SaveResult(path, written, time.perf_counter() - start)
+
+
+class BackgroundSave:
+    """Runs `save` on a worker thread; the UI thread polls `done`"""
+
+    def __init__(self, chunks: typing.Iterable[str], path: Path, **kwargs):
+        self.path = Path(path)
+        self.result: typing.Optional[SaveResult] = None
+        self.error: typing.Optional[Exception] = None
+        # not a daemon: exiting the app waits for an in flight save
+        self._thread = threading.Thread(
+            target=self._run, args=(chunks, self.path), kwargs=kwargs, name=f"save-{self.path.name}"
+        )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def _run(self, chunks, path, **kwargs):
+        try:
+            self.result = save(chunks, path, **kwargs)
+            logger.LOG.info("%s: %s", path, self.result.summary)
+        except (OSError, UnicodeError) as e:
+            logger.LOG.error("Failed saving %s: %s", path, e)
+            self.error = e
@@ -0,0 +1,53 @@
+"""
+Coalesced UI updates: at most one run of each update per frame
+"""
+
+import typing
+
+from notepad.features import logger
+
+FRAME_MS = 16
+
+
+class UpdateScheduler:
+    """
+    Per-keystroke work (status bar, counters, highlighters) registers a callback under a key.
+    Requesting an update only marks the key as pending; every pending callback runs once
+    on the next frame, however many times it was requested.
+    """
+
+    def __init__(self, root, *, frame_ms: int = FRAME_MS):
+        self._root = root
+        self._frame_ms = frame_ms
+        self._callbacks: typing.Dict[str, typing.Callable[[], None]] = {}
+        self._pending: typing.Dict[str, None] = {}  # ordered set
+        self._after_id: typing.Optional[str] = None
+
+    def register(self, key: str, callback: typing.Callable[[], None]):
+        self._callbacks[key] = callback
+
+    def unregister(self, key: str):
+        self._callbacks.pop(key, None)
+        self._pending.pop(key, None)
+
+    def request(self, key: str, *args, **kwargs):
+        """Mark `key` as pending. Extra arguments are ignored so this can be bound to events"""
+        self._pending[key] = None
+        if self._after_id is None:
+            self._after_id = self._root.after(self._frame_ms, self.flush)
+
+    def cancel(self):
+        if self._after_id is not None:
+            self._root.after_cancel(self._after_id)
+            self._after_id = None
+        self._pending.clear()
+
+    def flush(self):
+        self._after_id = None
+        pending, self._pending = self._pending, {}
+        for key in pending:
+            callback = self._callbacks.get(key)
+            if callback is None:
+                logger.LOG.debug("No update registered for %s", key)
+                continue
+            callback()
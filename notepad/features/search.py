@@ -0,0 +1,246 @@
+"""
+Find and replace over a document
+"""
+
+from array import array
+from functools import lru_cache, partial
+import bisect
+import re
+import threading
+import typing
+
+from notepad.features import logger
+
+DEFAULT_MAX_MATCHES = 1_000_000
+BACKWARD_WINDOW = 1 << 16
+
+
+class Query(typing.NamedTuple):
+    pattern: str
+    match_case: bool = False
+    regex: bool = False
+
+
+class Match(typing.NamedTuple):
+    start: int
+    end: int
+
+
+@lru_cache(maxsize=64)
+def compile_query(query: Query) -> typing.Pattern:
+    """Compiled patterns are cached, so retyping a query never recompiles it"""
+    source = query.pattern if query.regex else re.escape(query.pattern)
+    flags = re.MULTILINE | (0 if query.match_case else re.IGNORECASE)
+    return re.compile(source, flags)
+
+
+def is_valid(query: Query) -> bool:
+    if not query.pattern:
+        return False
+    try:
+        compile_query(query)
+    except re.error:
+        return False
+    return True
+
+
+def iter_line_blocks(chunks: typing.Iterable[str], offset: int = 0) -> typing.Iterator[typing.Tuple[int, str]]:
+    """Regroup text chunks into (offset, text) blocks that end on a line boundary"""
+    carry = []  # joined once a newline ends the line: a long line is not copied per chunk
+    for chunk in chunks:
+        cut = chunk.rfind("\n") + 1
+        if not cut:
+            carry.append(chunk)
+            continue
+
+        carry.append(chunk[:cut])
+        block = "".join(carry)
+        yield offset, block
+        offset += len(block)
+        carry = [chunk[cut:]]
+    block = "".join(carry)
+    if block:
+        yield offset, block
+
+
+def iter_matches(
+    chunks: typing.Iterable[str], query: Query, offset: int = 0
+) -> typing.Iterator[Match]:
+    """
+    Non empty matches, block by block. A block ends on a line boundary but may hold several
+    lines, so a regex matching a newline only finds the matches that fit in one block.
+    """
+    pattern = compile_query(query)
+    for block_offset, block in iter_line_blocks(chunks, offset):
+        for match in pattern.finditer(block):
+            if match.end() > match.start():
+                yield Match(block_offset + match.start(), block_offset + match.end())
+
+
+def _matches_between(document, query: Query, start: int, end: int) -> typing.Iterator[Match]:
+    line_start = document.lines.line_start(document.lines.line_of(start))
+    for match in iter_matches(document.text.iter_chunks(line_start, end), query, line_start):
+        if match.start >= start:
+            yield match
+
+
+def find_next(document, query: Query, offset: int, *, wrap: bool = True) -> typing.Optional[Match]:
+    match = next(_matches_between(document, query, offset, len(document.text)), None)
+    if match is None and wrap:
+        # up to the end of the cursor's line, so a match that starts before the cursor and
+        # ends after it is still found
+        line_end = document.lines.line_start(document.lines.line_of(offset) + 1)
+        end = line_end if line_end > offset else len(document.text)
+        match = next((m for m in _matches_between(document, query, 0, end) if m.start < offset), None)
+    return match
+
+
+def _last_match_before(document, query: Query, start: int, end: int) -> typing.Optional[Match]:
+    window_end = end
+    while window_end > start:
+        window_start = max(start, window_end - BACKWARD_WINDOW)
+        window_start = max(start, document.lines.line_start(document.lines.line_of(window_start)))
+        last = None
+        for last in _matches_between(document, query, window_start, window_end):
+            pass
+        if last is not None:
+            return last
+        window_end = window_start
+    return None
+
+
+def find_previous(document, query: Query, offset: int, *, wrap: bool = True) -> typing.Optional[Match]:
+    match = _last_match_before(document, query, 0, offset)
+    if match is None and wrap:
+        match = _last_match_before(document, query, offset, len(document.text))
+    return match
+
+
+class Replacement(typing.NamedTuple):
+    start: int
+    end: int
+    text: str
+    count: int
+
+
+def replace_all(
+    chunks: typing.Iterable[str], query: Query, replacement: str
+) -> typing.Optional[Replacement]:
+    """
+    Substitute every match, returning the single span (first to last changed line) to write
+    back, so the caller applies one edit instead of one per match.
+    """
+    pattern = compile_query(query)
+    repl = replacement if query.regex else (lambda _: replacement)
+
+    start = end = None
+    pending = []  # unchanged blocks after the last change
+    parts = []
+    total = 0
+    for offset, block in iter_line_blocks(chunks):
+        new_block, count = pattern.subn(repl, block)
+        if not count:
+            if start is not None:
+                pending.append(block)
+            continue
+
+        if start is None:
+            start = offset
+        parts.extend(pending)
+        pending.clear()
+        parts.append(new_block)
+        end = offset + len(block)
+        total += count
+
+    if start is None:
+        return None
+    return Replacement(start, end, "".join(parts), total)
+
+
+class SearchJob:
+    """
+    Collects every match on a worker thread. The job reads a piece table snapshot, so the
+    document can keep changing while it runs.
+    """
+
+    def __init__(self, text, query: Query, *, max_matches: int = DEFAULT_MAX_MATCHES):
+        self.query = query
+        self.max_matches = max_matches
+        self.starts = array("q")
+        self.ends = array("q")
+        self.done = False
+        self._text = text
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="search", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def truncated(self) -> bool:
+        return len(self.starts) >= self.max_matches
+
+    def _run(self):
+        try:
+            for match in iter_matches(self._text.iter_chunks(), self.query):
+                if self.cancelled or self.truncated:
+                    break
+                # ends first: a reader on the UI thread bounds itself by len(starts)
+                self.ends.append(match.end)
+                self.starts.append(match.start)
+        finally:
+            self.done = True
+            logger.LOG.debug("Search for %s found %s matches", self.query, len(self.starts))
+
+    def matches_between(self, start: int, end: int) -> typing.Iterator[Match]:
+        """Matches found so far that overlap [start, end)"""
+        count = min(len(self.starts), len(self.ends))
+        first = max(bisect.bisect_left(self.starts, start, 0, count) - 1, 0)
+        for i in range(first, count):
+            if self.starts[i] >= end:
+                break
+            if self.ends[i] > start:
+                yield Match(self.starts[i], self.ends[i])
+
+
+class FindJob:
+    """
+    Runs one search (find_next, find_previous, replace_all...) on a worker thread, so a long
+    line or a large document never blocks the event loop. It should be handed a snapshot.
+    """
+
+    def __init__(self, find: typing.Callable, *args, **kwargs):
+        self.result = None
+        self.error: typing.Optional[Exception] = None
+        self.done = False
+        self._find = partial(find, *args, **kwargs)
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="find", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """The search still runs to its end, its result is only ignored"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _run(self):
+        try:
+            self.result = self._find()
+        except re.error as e:
+            self.error = e
+        finally:
+            self.done = True
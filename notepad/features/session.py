@@ -0,0 +1,98 @@
+"""
+Session snapshot and restore for notepad
+"""
+
+from pathlib import Path
+import json
+import os
+import queue
+import threading
+import typing
+
+from notepad.features import fonts, logger
+
+VERSION = 1
+
+
+class DocumentState(typing.NamedTuple):
+    """What a window showed of its file. Only state is kept: the text is read from the file"""
+
+    file: str
+    cursor: int = 0  # document offset of the insertion cursor
+    top_line: int = 0  # first visible line, 0-based
+    large_file_offset: typing.Optional[int] = None  # byte offset shown by the large file viewer
+    wrap: str = "char"
+    zoom: int = fonts.DEFAULT_ZOOM
+
+
+class Snapshot(typing.NamedTuple):
+    theme: str
+    documents: typing.Tuple[DocumentState, ...]  # the focused document first
+
+    def to_json(self) -> str:
+        documents = [document._asdict() for document in self.documents]
+        return json.dumps({"version": VERSION, "theme": self.theme, "documents": documents})
+
+
+def load(path: Path) -> typing.Optional[Snapshot]:
+    """The snapshot at `path`, or None when there is none to restore"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data["version"] != VERSION:
+            return None
+        documents = tuple(DocumentState(**document) for document in data["documents"])
+        return Snapshot(data["theme"], documents)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.LOG.warning("Could not read session %s: %s", path, e)
+        return None
+
+
+class SessionWriter:
+    """
+    Snapshots are small, but are written on a worker thread so a slow disk never stalls the
+    UI. A burst of snapshots only writes the newest, and one equal to what is already on disk
+    is not written at all. Each write replaces the file atomically.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.writes = 0
+        self._written: typing.Optional[str] = None
+        self._tasks: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._work, name="session", daemon=True)
+        self._thread.start()
+
+    def write(self, snapshot: Snapshot):
+        self._tasks.put(snapshot)
+
+    def join(self):
+        """Wait for every snapshot queued so far"""
+        self._tasks.join()
+
+    def _work(self):
+        while True:
+            snapshot = self._tasks.get()
+            try:
+                while not self._tasks.empty():  # only the newest matters
+                    self._tasks.task_done()
+                    snapshot = self._tasks.get_nowait()
+                self._write(snapshot.to_json())
+            except OSError as e:
+                logger.LOG.warning("Could not write session %s: %s", self.path, e)
+            finally:
+                self._tasks.task_done()
+
+    def _write(self, text: str):
+        if text == self._written:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(".tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp, self.path)
+        self._written = text
+        self.writes += 1
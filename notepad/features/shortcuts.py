@@ -3,9 +3,13 @@ Shortcut mapping for notepad
 """
 
 import string
+import typing
 
 from notepad import constants
 
+MODIFIERS = ("ctrl", "alt", "shift")  # in the order strokes list them
+FUNCTION_KEYS = {f"f{n}" for n in range(1, 13)}
+
 
 class Shortcut:
     """
@@ -13,8 +17,10 @@ class Shortcut:
     """
 
     # this is not complete: can add more
-    accepted_keys = set(string.ascii_lowercase) | {"shift", "ctrl"}
-    abbreviation_mapping = {"ctrl": "Control"}
+    accepted_keys = (
+        set(string.ascii_lowercase) | set(string.digits) | FUNCTION_KEYS | {"plus", "minus"} | set(MODIFIERS)
+    )
+    abbreviation_mapping = {"ctrl": "Control", "alt": "Alt"}
 
     def __init__(self, *keys):
         self.validate_keys(keys)
@@ -33,6 +39,15 @@ class Shortcut:
         """How keybinding is displayed to a user"""
         return "+".join(k.capitalize() for k in self.keys)
 
+    @property
+    def stroke(self) -> typing.Tuple[str, ...]:
+        """Modifiers in a fixed order, then the key: how the keymap matches key presses"""
+        return tuple(m for m in MODIFIERS if m in self.keys) + tuple(k for k in self.keys if k not in MODIFIERS)
+
+    @property
+    def strokes(self) -> typing.Tuple[typing.Tuple[str, ...], ...]:
+        return (self.stroke,)
+
     @property
     def key_binding(self) -> str:
         """Tkinter key binding"""
@@ -44,14 +59,47 @@ class Shortcut:
                 continue
 
             binding = self.abbreviation_mapping.get(key, key)
-            if capitalize_next:
+            if key in FUNCTION_KEYS:
+                binding = key.upper()
+            if binding.isdigit():  # a bare digit would be read as a mouse button
+                binding = f"Key-{binding}"
+            if capitalize_next and len(binding) == 1 and binding.isalpha():
                 binding = binding.capitalize()
                 capitalize_next = False
+            elif capitalize_next and key not in MODIFIERS:
+                bindings.append("Shift")  # e.g. Shift-F3: only letters have a shifted keysym
+                capitalize_next = False
 
             bindings.append(binding)
 
         return f"<{'-'.join(bindings)}>"
 
+
+class Chord:
+    """Shortcuts pressed one after the other, e.g. Ctrl+K Ctrl+C"""
+
+    def __init__(self, *shortcuts: Shortcut):
+        if len(shortcuts) < 2:
+            raise ValueError("Chord must have at least two shortcuts")
+        self.shortcuts = shortcuts
+
+    @property
+    def accelerator(self) -> str:
+        return " ".join(shortcut.accelerator for shortcut in self.shortcuts)
+
+    @property
+    def strokes(self) -> typing.Tuple[typing.Tuple[str, ...], ...]:
+        return tuple(shortcut.stroke for shortcut in self.shortcuts)
+
+
+def parse(text: str) -> typing.Union[Shortcut, Chord]:
+    """ "ctrl+k ctrl+c": keys joined by "+", shortcuts of a chord separated by spaces"""
+    shortcuts = [Shortcut(*part.lower().split("+")) for part in text.split()]
+    if len(shortcuts) == 1:
+        return shortcuts[0]
+    return Chord(*shortcuts)
+
+
 # menu_bar_name: shortcut
 SHORTCUTS = {
     "file_new": Shortcut("ctrl", "n"),
@@ -61,8 +109,19 @@ SHORTCUTS = {
     "file_save_as": Shortcut("ctrl", "shift", "s"),
     "file_exit": Shortcut("ctrl", "q"),
     "edit_undo": Shortcut("ctrl", "z"),
+    "edit_redo": Shortcut("ctrl", "y"),
     "edit_copy": Shortcut("ctrl", "c"),
     "edit_cut": Shortcut("ctrl", "x"),
     "edit_paste": Shortcut("ctrl", "v"),
     "edit_select_all": Shortcut("ctrl", "shift", "a"),
+    "edit_find": Shortcut("ctrl", "f"),
+    "edit_find_next": Shortcut("f3"),
+    "edit_find_previous": Shortcut("shift", "f3"),
+    "edit_replace": Shortcut("ctrl", "h"),
+    "edit_find_in_files": Shortcut("ctrl", "shift", "f"),
+    "edit_go_to": Shortcut("ctrl", "g"),
+    "view_command_palette": Shortcut("ctrl", "shift", "p"),
+    "view_zoom_in": Shortcut("ctrl", "plus"),
+    "view_zoom_out": Shortcut("ctrl", "minus"),
+    "view_restore_default_zoom": Shortcut("ctrl", "0"),
 }
@@ -0,0 +1,49 @@
+"""
+Startup profiler: time spent in each phase until the first paint
+"""
+
+import time
+import typing
+
+_profile: typing.Optional["StartupProfile"] = None
+
+
+class StartupProfile:
+    def __init__(self, start: typing.Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases: typing.List[typing.Tuple[str, float]] = []
+        self._last = self.start
+
+    def mark(self, phase: str):
+        """Record the time since the previous mark as `phase`"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self.start
+
+    def report(self) -> str:
+        lines = [f"{phase:<20}{seconds * 1e3:>10.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"{'total':<20}{self.total * 1e3:>10.1f} ms")
+        return "\n".join(lines)
+
+
+def enable(start: typing.Optional[float] = None) -> StartupProfile:
+    global _profile
+    _profile = StartupProfile(start)
+    return _profile
+
+
+def is_enabled() -> bool:
+    return _profile is not None
+
+
+def mark(phase: str):
+    if _profile is not None:
+        _profile.mark(phase)
+
+
+def report() -> str:
+    return _profile.report() if _profile is not None else ""
@@ -0,0 +1,213 @@
+"""
+Line, word and character counts for notepad
+"""
+
+import re
+import threading
+import typing
+
+from notepad.features import logger
+
+_WORD = re.compile(r"\S+")
+
+
+class Counts(typing.NamedTuple):
+    lines: int
+    words: typing.Optional[int]  # None while the words are being recounted
+    characters: int
+
+    @property
+    def summary(self) -> str:
+        words = "counting words" if self.words is None else _plural(self.words, "word")
+        return f"{_plural(self.lines, 'line')}, {words}, {_plural(self.characters, 'character')}"
+
+
+def _plural(count: int, noun: str) -> str:
+    return f"{count:,} {noun}" if count == 1 else f"{count:,} {noun}s"
+
+
+def _is_word(character: str) -> bool:
+    return bool(character) and not character.isspace()
+
+
+def count_words(chunks: typing.Iterable[str], before: str = "") -> int:
+    """
+    Word starts in the text of `chunks`. A word running on from the character `before` them,
+    or from one chunk into the next, is not counted again
+    """
+    words = 0
+    previous = before
+    for chunk in chunks:
+        if not chunk:
+            continue
+        words += len(_WORD.findall(chunk))
+        if _is_word(previous) and _is_word(chunk[0]):
+            words -= 1
+        previous = chunk[-1]
+    return words
+
+
+def _chunks(text) -> typing.Iterable[str]:
+    """A removed text is a string, or a piece table when it was large"""
+    return (text,) if isinstance(text, str) else text.iter_chunks()
+
+
+def _last(text) -> str:
+    return text[-1] if isinstance(text, str) else text.get(len(text) - 1)
+
+
+def word_delta(before: str, removed, inserted: str, after: str) -> int:
+    """
+    Change in the word count when `removed` is replaced by `inserted` between the characters
+    `before` and `after`. Only the edit is scanned; the word boundaries at its edges decide
+    whether words were split or joined
+    """
+    delta = count_words((inserted,), before) - count_words(_chunks(removed), before)
+    if _is_word(after):
+        delta += (not _is_word(inserted[-1] if inserted else before)) - (
+            not _is_word(_last(removed) if len(removed) else before)
+        )
+    return delta
+
+
+class Recount:
+    """Counts the words of a piece table snapshot on a worker thread"""
+
+    def __init__(self, text):
+        self.words: typing.Optional[int] = None
+        self._text = text
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="recount", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def done(self) -> bool:
+        return self.words is not None
+
+    def _chunks(self) -> typing.Iterator[str]:
+        for chunk in self._text.iter_chunks():
+            if self._cancelled.is_set():
+                return
+            yield chunk
+
+    def _run(self):
+        words = count_words(self._chunks())
+        if not self._cancelled.is_set():
+            logger.LOG.debug("Recounted %s words", words)
+            self.words = words
+
+
+class DocumentStats:
+    """
+    Counts kept current from the document's edits. Lines and characters are known by the
+    document; words are adjusted by each edit's delta. Text appended without an edit, e.g. by
+    a load, is counted by a recount instead: edits made while it runs are added to its result
+    """
+
+    def __init__(self, document):
+        self._document = document
+        self._words: typing.Optional[int] = 0
+        self._recount: typing.Optional[Recount] = None
+        self._pending = 0  # word delta of the edits made since the recount started
+        self._selection: typing.Optional[typing.Tuple[int, int, int]] = None  # start, end, words
+
+    @property
+    def counts(self) -> Counts:
+        return Counts(len(self._document.lines), self._words, len(self._document))
+
+    @property
+    def recounting(self) -> bool:
+        return self._recount is not None
+
+    def reset(self):
+        """The document was emptied"""
+        self._cancel()
+        self._words = 0
+
+    def invalidate(self):
+        """Text is being added without edits: the words are unknown until `recount`"""
+        self._cancel()
+        self._words = None
+
+    def recount(self):
+        self._cancel()
+        self._words = None
+        self._recount = Recount(self._document.text.snapshot()).start()
+
+    def poll(self) -> bool:
+        """Take the recount's result if it finished. True once the counts are current"""
+        if self._recount is None:
+            return True
+        if not self._recount.done:
+            return False
+
+        self._words = self._recount.words + self._pending
+        self._recount = None
+        self._pending = 0
+        return True
+
+    def _cancel(self):
+        self._selection = None
+        if self._recount is not None:
+            self._recount.cancel()
+            self._recount = None
+        self._pending = 0
+
+    def edited(self, edit):
+        """Document listener. The document already holds the edited text"""
+        self._selection = None
+        if self._words is None and self._recount is None:
+            return
+
+        end = edit.offset + len(edit.inserted)
+        before = self._document.get(max(edit.offset - 1, 0), edit.offset)
+        delta = word_delta(before, edit.removed, edit.inserted, self._document.get(end, end + 1))
+        if self._recount is not None:
+            self._pending += delta
+        else:
+            self._words += delta
+
+    def _words_between(self, start: int, end: int) -> int:
+        return count_words(self._document.text.iter_chunks(start, end))
+
+    def _joined(self, offset: int, start: int, end: int) -> bool:
+        """Whether a word between `start` and `end` runs across `offset`"""
+        if not start < offset < end:
+            return False
+        around = self._document.get(offset - 1, offset + 1)
+        return _is_word(around[0]) and _is_word(around[1])
+
+    def _selected_words(self, start: int, end: int) -> int:
+        """
+        Dragging a selection moves one of its ends: only the text between the old and the new
+        end is scanned. words(a, c) == words(a, b) + words(b, c) - joined(b)
+        """
+        if self._selection is None:
+            return self._words_between(start, end)
+
+        old_start, old_end, words = self._selection
+        if start == old_start and end >= old_end:
+            return words + self._words_between(old_end, end) - self._joined(old_end, start, end)
+        if start == old_start:
+            return words - self._words_between(end, old_end) + self._joined(end, start, old_end)
+        if end == old_end and start <= old_start:
+            return words + self._words_between(start, old_start) - self._joined(old_start, start, end)
+        if end == old_end:
+            return words - self._words_between(old_start, start) + self._joined(start, old_start, end)
+        return self._words_between(start, end)
+
+    def selection(self, start: int, end: int) -> Counts:
+        """Counts of the text between two offsets"""
+        if start == 0 and end == len(self._document):
+            return self.counts
+
+        words = self._selected_words(start, end)
+        self._selection = (start, end, words)
+        lines = self._document.lines.line_of(end) - self._document.lines.line_of(start) + 1
+        return Counts(lines, words, end - start)
@@ -3,6 +3,7 @@ import random
 
 
 DEFAULT_FONT = "Courier New"
+DEFAULT_FONT_SIZE = 20
 
 
 class Theme(typing.NamedTuple):
@@ -19,7 +20,7 @@ class Theme(typing.NamedTuple):
 
     # optional params use system default
     font_style: typing.Optional[int] = None
-    font_size: typing.Optional[int] = 20
+    font_size: typing.Optional[int] = DEFAULT_FONT_SIZE
 
     def as_dict(self):
         res = {"bg": self.background, "fg": self.foreground}
@@ -0,0 +1,246 @@
+"""
+Undo and redo history for notepad
+"""
+
+from contextlib import contextmanager
+import collections
+import struct
+import sys
+import tempfile
+import time
+import typing
+
+from notepad import document
+from notepad.features import logger, piece_table
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_SPILL_BYTES = 256 * 1024 * 1024
+MERGE_PAUSE_S = 1.0  # typing resumed after a pause starts a new record
+SLICE_BYTES = 64  # rough cost of one referenced piece
+
+_HEADER = struct.Struct("<qqq")
+_SPILL_ENCODING = "utf-8"
+_SPILL_ERRORS = "surrogatepass"
+
+Text = typing.Union[str, piece_table.PieceTable]
+
+
+class Record:
+    """One undo step: `removed` was replaced by `inserted` at `offset`"""
+
+    __slots__ = ("offset", "removed", "inserted", "time")
+
+    def __init__(self, offset: int, removed: Text, inserted: Text, at: float = 0.0):
+        self.offset = offset
+        self.removed = removed
+        self.inserted = inserted
+        self.time = at
+
+    def __repr__(self) -> str:
+        return f"Record({self.offset}, {str(self.removed)!r}, {str(self.inserted)!r})"
+
+    @property
+    def size(self) -> int:
+        """Bytes held in memory. Slices share the document's buffers, so only pieces count"""
+        return sum(
+            SLICE_BYTES * text.piece_count if isinstance(text, piece_table.PieceTable) else sys.getsizeof(text)
+            for text in (self.removed, self.inserted)
+        )
+
+
+class Spilled(typing.NamedTuple):
+    position: int
+    size: int
+
+
+def _is_word_break(previous: str, character: str) -> bool:
+    return character == "\n" or (previous.isspace() and not character.isspace())
+
+
+class UndoHistory:
+    """
+    Records document edits. Consecutive keystrokes merge into word sized records, large
+    edits are kept as slices of the piece table rather than copies, and once the records in
+    memory pass `max_bytes`, the oldest are spilled to a temporary file (up to
+    `max_spill_bytes`, beyond which the oldest history is forgotten).
+    """
+
+    def __init__(
+        self,
+        doc: document.Document,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_spill_bytes: int = DEFAULT_MAX_SPILL_BYTES,
+    ):
+        self._document = doc
+        self.max_bytes = max_bytes
+        self.max_spill_bytes = max_spill_bytes
+        self._undo: typing.Deque[Record] = collections.deque()
+        self._redo: typing.List[Record] = []
+        self._spilled: typing.Deque[typing.Union[Spilled, Record]] = collections.deque()
+        self._spill_file: typing.Optional[typing.BinaryIO] = None
+        self._spill_end = 0
+        self._spill_bytes = 0
+        self._bytes = 0
+        self._recording = True
+        self._merge = True
+
+    def __len__(self) -> int:
+        return len(self._undo) + len(self._spilled)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._spilled.clear()
+        self._bytes = self._spill_bytes = self._spill_end = 0
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    @contextmanager
+    def suspended(self):
+        """Edits made inside are not recorded, e.g. while undoing"""
+        self._recording = False
+        try:
+            yield
+        finally:
+            self._recording = True
+
+    def break_merge(self):
+        """The next edit starts a new record"""
+        self._merge = False
+
+    def record(self, edit: document.Edit):
+        if not self._recording:
+            return
+
+        now = time.monotonic()
+        self._redo.clear()
+        last = self._undo[-1] if self._undo and self._merge else None
+        self._merge = True
+        if last is not None and now - last.time < MERGE_PAUSE_S and self._merge_into(last, edit):
+            self._bytes -= last.size
+            last.time = now
+            self._bytes += last.size
+        else:
+            inserted = edit.inserted
+            if len(inserted) >= document.LARGE_EDIT_SIZE:
+                inserted = self._document.text.slice(edit.offset, edit.offset + len(inserted))
+            record = Record(edit.offset, edit.removed, inserted, now)
+            self._undo.append(record)
+            self._bytes += record.size
+        self._trim()
+
+    def _merge_into(self, last: Record, edit: document.Edit) -> bool:
+        removed, inserted = edit.removed, edit.inserted
+        if not isinstance(last.inserted, str) or not isinstance(last.removed, str):
+            return False
+
+        if len(inserted) == 1 and not removed:
+            typing_on = last.inserted and edit.offset == last.offset + len(last.inserted)
+            if typing_on and not _is_word_break(last.inserted[-1], inserted):
+                last.inserted += inserted
+                return True
+            if not last.inserted and edit.offset == last.offset:  # typing over a selection
+                last.inserted = inserted
+                return True
+            return False
+
+        if len(removed) == 1 and not inserted and not last.inserted and last.removed:
+            if edit.offset == last.offset - 1 and not _is_word_break(removed, last.removed[0]):
+                last.offset, last.removed = edit.offset, removed + last.removed  # backspace
+                return True
+            if edit.offset == last.offset and not _is_word_break(last.removed[-1], removed):
+                last.removed += removed  # delete
+                return True
+        return False
+
+    def _trim(self):
+        while self._bytes > self.max_bytes and len(self._undo) > 1:
+            record = self._undo.popleft()
+            self._bytes -= record.size
+            self._spill(record)
+
+        while self._spill_bytes > self.max_spill_bytes and self._spilled:
+            entry = self._spilled.popleft()
+            if isinstance(entry, Spilled):
+                self._spill_bytes -= entry.size
+        if not self._spilled:
+            self._spill_bytes = self._spill_end = 0
+        elif self._spill_end > 2 * self.max_spill_bytes:
+            self._compact()
+
+    @logger.log_debug
+    def _spill(self, record: Record):
+        if not (isinstance(record.removed, str) and isinstance(record.inserted, str)):
+            self._spilled.append(record)  # slices cost next to nothing to keep
+            return
+
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix="notepad-undo-")
+        removed = record.removed.encode(_SPILL_ENCODING, _SPILL_ERRORS)
+        inserted = record.inserted.encode(_SPILL_ENCODING, _SPILL_ERRORS)
+
+        self._spill_file.seek(self._spill_end)
+        self._spill_file.write(_HEADER.pack(record.offset, len(removed), len(inserted)))
+        self._spill_file.write(removed)
+        self._spill_file.write(inserted)
+        entry = Spilled(self._spill_end, _HEADER.size + len(removed) + len(inserted))
+        self._spill_end += entry.size
+        self._spill_bytes += entry.size
+        self._spilled.append(entry)
+
+    @logger.log_debug
+    def _compact(self):
+        """Forgotten entries leave a hole at the start of the file: copy the others to a new one"""
+        old, self._spill_file = self._spill_file, tempfile.TemporaryFile(prefix="notepad-undo-")
+        self._spill_end = 0
+        for i, entry in enumerate(self._spilled):
+            if isinstance(entry, Spilled):
+                old.seek(entry.position)
+                self._spill_file.write(old.read(entry.size))
+                self._spilled[i] = Spilled(self._spill_end, entry.size)
+                self._spill_end += entry.size
+        old.close()
+
+    def _unspill(self) -> typing.Optional[Record]:
+        if not self._spilled:
+            return None
+
+        entry = self._spilled.pop()
+        if isinstance(entry, Record):
+            return entry
+
+        self._spill_bytes -= entry.size
+        self._spill_file.seek(entry.position)
+        offset, removed_length, inserted_length = _HEADER.unpack(self._spill_file.read(_HEADER.size))
+        removed = self._spill_file.read(removed_length).decode(_SPILL_ENCODING, _SPILL_ERRORS)
+        inserted = self._spill_file.read(inserted_length).decode(_SPILL_ENCODING, _SPILL_ERRORS)
+        self._spill_end = entry.position  # the entry was the newest one in the file
+        return Record(offset, removed, inserted)
+
+    def undo(self) -> typing.Optional[Record]:
+        """The record to revert: replace its `inserted` text with its `removed` text"""
+        if self._undo:
+            record = self._undo.pop()
+            self._bytes -= record.size
+        else:
+            record = self._unspill()
+            if record is None:
+                return None
+
+        self._redo.append(record)
+        self._merge = False
+        return record
+
+    def redo(self) -> typing.Optional[Record]:
+        """The record to apply again: replace its `removed` text with its `inserted` text"""
+        if not self._redo:
+            return None
+
+        record = self._redo.pop()
+        self._undo.append(record)
+        self._bytes += record.size
+        self._merge = False
+        self._trim()
+        return record
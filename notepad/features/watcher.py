@@ -0,0 +1,281 @@
+"""
+External file change detection and tail following for notepad
+"""
+
+from pathlib import Path
+import codecs
+import ctypes
+import ctypes.util
+import io
+import os
+import struct
+import sys
+import typing
+
+from notepad.features import encoding as text_encoding, logger
+
+POLL_MS = 1000  # stat polling interval, when inotify is not available
+DEFAULT_READ_SIZE = 1 << 20  # most bytes read from a followed file at a time
+
+# inotify(7)
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+class StatBackend:
+    """Compares each file's stat between polls"""
+
+    fileno = None
+
+    def __init__(self):
+        self._signatures: typing.Dict[Path, typing.Optional[tuple]] = {}
+
+    @staticmethod
+    def _signature(path: Path) -> typing.Optional[tuple]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def add(self, path: Path):
+        self._signatures[path] = self._signature(path)
+
+    def remove(self, path: Path):
+        self._signatures.pop(path, None)
+
+    def changed(self) -> typing.Set[Path]:
+        changed = set()
+        for path, signature in self._signatures.items():
+            current = self._signature(path)
+            if current != signature:
+                self._signatures[path] = current
+                changed.add(path)
+        return changed
+
+    def close(self):
+        self._signatures.clear()
+
+
+class InotifyBackend:
+    """
+    Watches the directories of the files, not the files themselves, so a file that is
+    rotated (renamed away and created again) keeps being reported.
+    """
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on linux")
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        self._directories: typing.Dict[Path, int] = {}
+        self._files: typing.Dict[int, typing.Set[str]] = {}  # watch descriptor: watched names
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def add(self, path: Path):
+        directory = path.parent
+        wd = self._directories.get(directory)
+        if wd is None:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Could not watch {directory}")
+            self._directories[directory] = wd
+            self._files[wd] = set()
+        self._files[wd].add(path.name)
+
+    def remove(self, path: Path):
+        wd = self._directories.get(path.parent)
+        if wd is None:
+            return
+
+        self._files[wd].discard(path.name)
+        if not self._files[wd]:
+            self._libc.inotify_rm_watch(self._fd, wd)
+            del self._directories[path.parent], self._files[wd]
+
+    def changed(self) -> typing.Set[Path]:
+        data = b""
+        while True:
+            try:
+                data += os.read(self._fd, 1 << 16)
+            except BlockingIOError:
+                break
+
+        changed = set()
+        directories = {wd: directory for directory, wd in self._directories.items()}
+        position = 0
+        while position + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, position)
+            name = data[position + _EVENT.size : position + _EVENT.size + length].rstrip(b"\0")
+            position += _EVENT.size + length
+
+            if mask & IN_Q_OVERFLOW:  # events were lost: report everything
+                return {directory / name for directory, wd in self._directories.items() for name in self._files[wd]}
+            name = os.fsdecode(name)
+            if wd in directories and name in self._files[wd]:
+                changed.add(directories[wd] / name)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class Change(typing.NamedTuple):
+    kind: str  # "appended", "truncated", "rotated", "missing" or "unchanged"
+    text: str = ""
+    more: bool = False  # more new bytes are left to read
+
+
+class Tail:
+    """Reads what was written to a file since `offset`, decoding it incrementally"""
+
+    def __init__(self, path: Path, offset: int, encoding: str, *, read_size: int = DEFAULT_READ_SIZE):
+        self.path = path
+        self.offset = offset
+        self.encoding = encoding
+        self.read_size = read_size
+        stat = self._stat()
+        self._inode, self._mtime_ns = stat.st_ino, stat.st_mtime_ns
+        self._decoder = self._new_decoder()
+        if offset:
+            self._read_bom()
+
+    def _stat(self) -> os.stat_result:
+        return os.stat(self.path)
+
+    def _new_decoder(self):
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        return io.IncrementalNewlineDecoder(decoder, translate=True)
+
+    def _read_bom(self):
+        """Reading from the middle of a file, the decoder still needs its byte order mark"""
+        with open(self.path, "rb") as f:
+            head = f.read(4)
+        for bom, _ in text_encoding.BOMS:
+            if head.startswith(bom):
+                self._decoder.decode(bom)
+                return
+
+    def changed(self) -> bool:
+        """Whether the file differs from what was read, without reading it"""
+        try:
+            stat = self._stat()
+        except FileNotFoundError:
+            return True
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns) != (self._inode, self.offset, self._mtime_ns)
+
+    def read(self) -> Change:
+        try:
+            stat = self._stat()
+        except FileNotFoundError:
+            return Change("missing")
+        self._mtime_ns = stat.st_mtime_ns
+
+        kind = "appended"
+        if stat.st_ino != self._inode:
+            kind, self._inode = "rotated", stat.st_ino
+        elif stat.st_size < self.offset:
+            kind = "truncated"
+        elif stat.st_size == self.offset:
+            return Change("unchanged")
+
+        if kind != "appended":
+            self.offset = 0
+            self._decoder = self._new_decoder()
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(self.read_size)
+        self.offset += len(data)
+        return Change(kind, self._decoder.decode(data), more=self.offset < stat.st_size)
+
+
+class FileWatcher:
+    """
+    One watcher serves every window. With inotify, tk wakes it only when the watched
+    directories see events; otherwise it polls the files' stat.
+    """
+
+    def __init__(self, root, *, poll_ms: int = POLL_MS):
+        self._root = root
+        self._poll_ms = poll_ms
+        self._callbacks: typing.Dict[Path, typing.List[typing.Callable[[Path], None]]] = {}
+        self._after_id: typing.Optional[str] = None
+        try:
+            self._backend = InotifyBackend()
+        except (OSError, AttributeError) as e:  # AttributeError: libc without inotify
+            logger.LOG.info("Polling for file changes: %s", e)
+            self._backend = StatBackend()
+        self._handler = False
+
+    @property
+    def uses_inotify(self) -> bool:
+        return not isinstance(self._backend, StatBackend)
+
+    def watch(self, path: Path, callback: typing.Callable[[Path], None]):
+        path = Path(path).resolve()
+        if path not in self._callbacks:
+            self._backend.add(path)
+            self._callbacks[path] = []
+        self._callbacks[path].append(callback)
+        self._schedule()
+
+    def unwatch(self, path: Path, callback: typing.Callable[[Path], None]):
+        path = Path(path).resolve()
+        callbacks = self._callbacks.get(path, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if path in self._callbacks and not callbacks:
+            del self._callbacks[path]
+            self._backend.remove(path)
+        if not self._callbacks:
+            self._unschedule()
+
+    def _schedule(self):
+        if self.uses_inotify:
+            if not self._handler:
+                self._root.tk.createfilehandler(self._backend.fileno(), 1, self._on_readable)  # READABLE
+                self._handler = True
+        elif self._after_id is None:
+            self._after_id = self._root.after(self._poll_ms, self._poll)
+
+    def _unschedule(self):
+        if self._handler:
+            self._root.tk.deletefilehandler(self._backend.fileno())
+            self._handler = False
+        if self._after_id is not None:
+            self._root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _on_readable(self, *args):
+        self.check()
+
+    def _poll(self):
+        self._after_id = None
+        self.check()
+        if self._callbacks:
+            self._schedule()
+
+    def check(self):
+        for path in self._backend.changed():
+            for callback in list(self._callbacks.get(path, ())):
+                callback(path)
+
+    def close(self):
+        self._unschedule()
+        self._callbacks.clear()
+        self._backend.close()
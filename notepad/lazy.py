@@ -0,0 +1,20 @@
+"""
+Deferred imports, for modules that are not needed to show the first window
+"""
+
+import importlib
+import types
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
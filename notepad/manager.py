@@ -0,0 +1,228 @@
+"""
+Runs every notepad window on one tk interpreter and event loop
+"""
+
+from collections import deque
+from pathlib import Path
+import tkinter as tk
+import typing
+
+from notepad import constants, window
+from notepad.features import fonts, journal, keymap, logger, session, shortcuts, themes, watcher
+
+
+class WindowManager:
+    """
+    Owns what windows share: the tk root, the theme, fonts, the file watcher, and the keymap.
+    Key presses and text bindings are registered once for the whole interpreter and
+    dispatched to the window the event came from, so opening more windows adds no bindings.
+    """
+
+    def __init__(
+        self,
+        root: typing.Optional[tk.Tk] = None,
+        *,
+        session_file: typing.Optional[Path] = None,
+        keymap_file: typing.Optional[Path] = None,
+    ):
+        """
+        root: an existing root is used as a window itself. Without one, a hidden root is
+        created and every window is a toplevel
+        session_file: where the open documents are recorded, to restore them next time
+        keymap_file: the user's shortcuts, applied over the defaults
+        """
+        if root is None:
+            root = tk.Tk()
+            root.withdraw()
+            self._hidden_root = True
+        else:
+            self._hidden_root = False
+
+        self.root = root
+        self.windows: typing.Dict[str, "Notepad"] = {}
+        self.theme = tk.StringVar(root, value="light")  # because most developers love this
+        self.fonts = fonts.FontCache(root)
+        self.watcher = watcher.FileWatcher(root, poll_ms=constants.WATCH_POLL_MS)
+        self.keymap = keymap.load(keymap_file)
+        self._chords: typing.Dict[str, keymap.Node] = {}  # window: where its chord got to
+        self._session = session.SessionWriter(session_file) if session_file else None
+        self._session_job: typing.Optional[str] = None
+        self._restoring: typing.Deque[typing.Tuple["Notepad", session.DocumentState]] = deque()
+        self._restoring_now: typing.Optional["Notepad"] = None
+        self._bind_shared()
+
+    def _bind_shared(self):
+        self.root.bind_class(keymap.BINDTAG, "<KeyPress>", self._dispatch_key)
+        self.root.bind_class("post-class-bindings", "<KeyPress>", self._dispatch_text_event)
+        self.root.bind_class("post-class-bindings", "<Button-1>", self._dispatch_click)
+        self.root.bind_class("post-class-bindings", "<<Selection>>", self._dispatch_selection)
+
+    def register(self, notepad: "Notepad"):
+        self.windows[str(notepad._root)] = notepad
+
+    def window_for(self, widget) -> typing.Optional["Notepad"]:
+        if isinstance(widget, str):
+            try:
+                widget = self.root.nametowidget(widget)
+            except KeyError:  # e.g. tk's internal menu clones
+                widget = self.root.focus_get()
+        if widget is None:
+            return None
+        return self.windows.get(str(widget.winfo_toplevel()))
+
+    def _dispatch_key(self, event):
+        stroke = keymap.stroke_of(event.keysym, event.state)
+        notepad = self.window_for(event.widget)
+        if stroke is None or notepad is None:
+            return None
+
+        window = str(notepad._root)
+        chord = self._chords.pop(window, None)
+        node = self.keymap.step(chord or self.keymap.root, stroke)
+        if node is None:
+            if chord is None:
+                return None  # not a shortcut: typing
+            notepad.status_activity.set("")
+            return "break"  # the key that broke off a chord is not typed either
+
+        if node.action is None:
+            self._chords[window] = node
+            pressed = shortcuts.Shortcut(*stroke).accelerator
+            notepad.status_activity.set(f"{pressed} pressed, waiting for the next key")
+            return "break"
+
+        if chord is not None:
+            notepad.status_activity.set("")
+        action = notepad.actions.get(node.action)
+        if action is not None:
+            action.function(notepad, event)
+        return "break"
+
+    def _dispatch_text_event(self, event):
+        notepad = self.window_for(event.widget)
+        if notepad is not None:
+            notepad._updates.request("location")
+
+    def _dispatch_click(self, event):
+        notepad = self.window_for(event.widget)
+        if notepad is not None:
+            notepad._history.break_merge()  # typing elsewhere is a new undo step
+            notepad._updates.request("location")
+
+    def _dispatch_selection(self, event):
+        notepad = self.window_for(event.widget)
+        if notepad is not None:
+            notepad._updates.request("stats")
+
+    @logger.log_debug
+    def open_window(self, window_dimension: window.WindowDimension = window.WindowDimension()) -> "Notepad":
+        from notepad import app  # app builds its windows through the manager
+
+        toplevel = tk.Toplevel(self.root)
+        notepad = app.Notepad(root=toplevel, window_dimension=window_dimension, manager=self)
+        toplevel.protocol("WM_DELETE_WINDOW", notepad.action_file_exit)
+        return notepad
+
+    @logger.log_info
+    def recover_windows(self) -> int:
+        """Reopen, unsaved, the documents that exited notepads never saved. Returns how many"""
+        recovered = 0
+        for path in journal.orphans(constants.RECOVERY_DIR):
+            try:
+                document = journal.recover(path)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.LOG.warning("Could not recover %s: %s", path, e)
+                document = None
+
+            if document is None:
+                path.rename(path.with_suffix(".stale"))  # kept for a closer look
+                continue
+
+            notepad = self.open_window()
+            notepad._helper_restore(document)
+            if notepad._journal is not None:
+                notepad._journal.join()  # written again before the old journal goes
+            path.unlink()
+            recovered += 1
+        return recovered
+
+    def session_changed(self):
+        """Write the session once the current burst of changes is over"""
+        if self._session is not None and self._session_job is None:
+            self._session_job = self.root.after(constants.SESSION_SAVE_MS, self._write_session)
+
+    def _write_session(self):
+        self._session_job = None
+        focused = self.window_for(self.root.focus_get())
+        notepads = sorted(self.windows.values(), key=lambda notepad: notepad is not focused)
+        documents = (notepad._helper_session_state() for notepad in notepads)
+        self._session.write(session.Snapshot(self.theme.get(), tuple(filter(None, documents))))
+
+    @logger.log_info
+    def restore_session(self) -> int:
+        """
+        Reopen the documents of the last session. Every window appears at once, showing its
+        file's name, but the files load one at a time, the focused one first. Returns how many
+        """
+        if self._session is None:
+            return 0
+        snapshot = session.load(self._session.path)
+        if snapshot is None:
+            return 0
+
+        self.theme.set(snapshot.theme)
+        open_files = {notepad._file for notepad in self.windows.values()}  # e.g. recovered ones
+        for state in snapshot.documents:
+            file = Path(state.file)
+            if file in open_files or not file.is_file():
+                continue
+            notepad = self.open_window()
+            notepad._helper_show_session_state(state)
+            self._restoring.append((notepad, state))
+            open_files.add(file)
+
+        restored = len(self._restoring)
+        self._restore_next()
+        return restored
+
+    def _restore_next(self):
+        current = self._restoring_now
+        if current is not None and current._load is not None and str(current._root) in self.windows:
+            self.root.after(constants.SESSION_RESTORE_POLL_MS, self._restore_next)
+            return
+
+        self._restoring_now = None
+        while self._restoring:
+            notepad, state = self._restoring.popleft()
+            if str(notepad._root) in self.windows:
+                notepad._helper_load_session_state(state)
+                self._restoring_now = notepad
+                self.root.after(constants.SESSION_RESTORE_POLL_MS, self._restore_next)
+                return
+
+    @logger.log_debug
+    def close_window(self, notepad: "Notepad"):
+        last = notepad._root is self.root or (self._hidden_root and len(self.windows) <= 1)
+        if last and self._session is not None:  # quitting: the session keeps the last window
+            if self._session_job is not None:
+                self.root.after_cancel(self._session_job)
+            self._write_session()
+            self._session.join()
+
+        self.windows.pop(str(notepad._root), None)
+        if last:
+            self.watcher.close()
+            self.root.destroy()
+        else:
+            notepad._root.destroy()
+            self.session_changed()
+
+    def apply_theme(self):
+        theme = themes.get_theme(self.theme.get())
+        for notepad in self.windows.values():
+            notepad._set_theme(theme)
+        self.session_changed()
+
+    def run(self):
+        logger.LOG.info("Running app with %s windows", len(self.windows))
+        self.root.mainloop()
@@ -1,3 +1,5 @@
+import typing
+
 from notepad.features import shortcuts, logger
 
 
@@ -5,19 +7,18 @@ class MenuOption:
     def __init__(self, menu_label: str, option_label: str, notepad: "Notepad"):
         self.menu_label = menu_label
         self.option_label = option_label
-        self.actions = notepad._collect_actions()
+        self.lookup_key = f"{menu_label.lower()}_{option_label.lower().replace(' ', '_')}"
+        self.notepad = notepad
+        self.actions = notepad.actions
         self.variable_bindings = notepad.variable_bindings
-
-    @property
-    def lookup_key(self) -> str:
-        return f"{self.menu_label.lower()}_{self.option_label.lower().replace(' ','_')}"
+        self.bindings = notepad._manager.keymap.bindings
 
     def action_not_implemented(self, *args, **kwargs):
         logger.LOG.warning("Warning: This does nothing!")
 
     @property
     def command(self) -> str:
-        return self.actions.get(self.lookup_key, self.action_not_implemented)
+        return self.actions.bind(self.lookup_key, self.notepad) or self.action_not_implemented
 
     @property
     def _default_args(self) -> dict:
@@ -25,11 +26,11 @@ class MenuOption:
 
     @property
     def has_shortcut(self) -> bool:
-        return self.lookup_key in shortcuts.SHORTCUTS
+        return self.lookup_key in self.bindings
 
     @property
-    def shortcut(self) -> shortcuts.Shortcut:
-        return shortcuts.SHORTCUTS[self.lookup_key]
+    def shortcut(self) -> typing.Union[shortcuts.Shortcut, shortcuts.Chord]:
+        return self.bindings[self.lookup_key]
 
     @property
     def has_variable_binding(self) -> bool:
@@ -3,11 +3,11 @@ import typing
 
 from notepad import constants
 
-def get_title(current: typing.Optional[str] = None):
+def get_title(current: typing.Optional[str] = None, dirty: bool = False):
     if not current:
         current = constants.DEFAULT_UNNAMED_TITLE
 
-    return f"{current} - {constants.APP_NAME}"
+    return f"{'*' if dirty else ''}{current} - {constants.APP_NAME}"
 
 
 class WindowDimension:
@@ -5,14 +5,18 @@ import sys
 
 import pytest
 
-from notepad import app
+from benchmarks.common import FakeRoot  # re-exported for the tests
+from notepad import app, constants
 
 LOG = logging.getLogger(__name__)
 
 @pytest.fixture()
-def my_notepad():
+def my_notepad(tmp_path, monkeypatch):
+    monkeypatch.setattr(constants, "RECOVERY_DIR", tmp_path / "recovery")  # never the user's journals
     n = app.Notepad(root=tk.Tk())
     yield n
+    n._helper_discard_journal()
+    n._manager.watcher.close()
     n._root.destroy()
 
 @pytest.fixture()
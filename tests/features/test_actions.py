@@ -0,0 +1,39 @@
+import gc
+import weakref
+
+from notepad.features import actions
+
+
+@actions.registered
+class Window:
+    def action_file_save(self, *args):
+        return ("saved", self)
+
+    def action_edit_find_next(self, *args):
+        return "found"
+
+    def helper(self):
+        pass
+
+
+def test_registered_at_class_definition():
+    assert len(Window.actions) == 2
+    assert "file_save" in Window.actions
+    assert Window.actions.get("edit_find_next").label == "Edit: Find Next"
+    assert Window.actions.get("helper") is None
+
+
+def test_bind_and_search():
+    window = Window()
+    assert Window.actions.bind("file_save", window)() == ("saved", window)
+    assert Window.actions.bind("file_missing", window) is None
+    assert [a.lookup_key for a in Window.actions.search("fnd nxt")] == ["edit_find_next"]
+
+
+def test_registry_keeps_no_windows():
+    window = Window()
+    Window.actions.get("file_save").function(window)
+    ref = weakref.ref(window)
+    del window
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,53 @@
+import bz2
+import gzip
+import io
+import lzma
+
+import pytest
+
+from notepad.features import compression
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (gzip.compress(b"text"), "gzip"),
+        (bz2.compress(b"text"), "bz2"),
+        (bz2.compress(b""), "bz2"),
+        (lzma.compress(b"text"), "xz"),
+        (b"BZh is how this text starts", None),
+        (b"\x1f", None),
+        (b"", None),
+    ],
+)
+def test_detect(tmp_path, data, expected):
+    path = tmp_path / "file"
+    path.write_bytes(data)
+    assert compression.detect(path) == expected
+
+
+def test_for_file(tmp_path):
+    assert compression.for_suffix(tmp_path / "app.log.GZ") == "gzip"
+    assert compression.for_suffix(tmp_path / "app.log") is None
+
+    plain = tmp_path / "plain.xz"
+    plain.write_text("not compressed after all")
+    assert compression.for_file(plain) is None
+    assert compression.for_file(tmp_path / "new.bz2") == "bz2"
+
+
+@pytest.mark.parametrize("name", ["gzip", "bz2", "xz", None])
+def test_wrap_round_trip_leaves_file_open(name):
+    f = io.BytesIO()
+    with compression.wrap(f, name, "wb") as out:
+        out.write(b"hello " * 100)
+    assert not f.closed
+
+    f.seek(0)
+    with compression.wrap(f, name) as source:
+        assert source.read() == b"hello " * 100
+
+
+def test_wrap_unknown():
+    with pytest.raises(ValueError):
+        compression.wrap(io.BytesIO(), "zip")
@@ -0,0 +1,50 @@
+import codecs
+
+import pytest
+
+from notepad.features import encoding
+
+
+@pytest.mark.parametrize(
+    "prefix, expected",
+    [
+        (codecs.BOM_UTF8 + b"abc", "utf-8-sig"),
+        (codecs.BOM_UTF16_LE + "abc".encode("utf-16-le"), "utf-16"),
+        (codecs.BOM_UTF16_BE + "abc".encode("utf-16-be"), "utf-16"),
+        (codecs.BOM_UTF32_LE + "abc".encode("utf-32-le"), "utf-32"),
+        ("héllo".encode("utf-8"), "utf-8"),
+        ("héllo".encode("cp1252"), "cp1252"),
+        (b"\x81\x8d", "latin-1"),
+        (b"", "utf-8"),
+    ],
+)
+def test_detect_encoding(prefix, expected):
+    assert encoding.detect_encoding(prefix, final=True) == expected
+
+
+def test_detect_encoding__truncated_character():
+    prefix = "abc€".encode("utf-8")[:-1]
+    assert encoding.detect_encoding(prefix) == "utf-8"
+    assert encoding.detect_encoding(prefix, final=True) == "cp1252"
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("a\r\nb\r\nc\n", "\r\n"), ("a\nb\n", "\n"), ("a\rb\r", "\r"), ("abc", None)],
+)
+def test_detect_newline(text, expected):
+    assert encoding.detect_newline(text) == expected
+
+
+def test_detect():
+    prefix = codecs.BOM_UTF16_LE + "a\r\nb\r\n".encode("utf-16-le")
+    assert encoding.detect(prefix, final=True) == encoding.Detection("utf-16", "\r\n")
+
+
+def test_names():
+    assert encoding.display_name("utf-8") == "UTF-8"
+    assert encoding.display_name("koi8-r") == "KOI8-R"
+    assert encoding.newline_name("\r\n") == "Windows (CRLF)"
+    assert encoding.newline_name(None) == "Unix (LF)"
+    assert encoding.is_wide("utf-16")
+    assert not encoding.is_wide("utf-8-sig")
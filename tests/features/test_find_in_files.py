@@ -0,0 +1,144 @@
+import pytest
+
+from notepad.features import find_in_files, search
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "logs").mkdir()
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "a.txt").write_text("one\nerror: two\nthree\n")
+    (tmp_path / "logs" / "b.log").write_bytes(b"ok\r\nERROR disk\r\nok\r\nerror net")
+    (tmp_path / "logs" / "c.bin").write_bytes(b"error\0\1\2")
+    (tmp_path / "logs" / "d.txt").write_bytes("x\nerror é\n".encode("utf-16"))
+    (tmp_path / ".git" / "e.txt").write_text("error")
+    return tmp_path
+
+
+def test_iter_files(tree):
+    files = [path for path, size in find_in_files.iter_files(str(tree))]
+    assert files == [str(tree / "a.txt"), str(tree / "logs" / "b.log"), str(tree / "logs" / "c.bin"), str(tree / "logs" / "d.txt")]
+
+    files = [path for path, size in find_in_files.iter_files(str(tree), "*.log; *.bin")]
+    assert files == [str(tree / "logs" / "b.log"), str(tree / "logs" / "c.bin")]
+
+
+def test_is_binary():
+    assert find_in_files.is_binary(b"a\0b")
+    assert not find_in_files.is_binary(b"plain text")
+    assert not find_in_files.is_binary("utf-16 text".encode("utf-16"))
+
+
+def test_search_file(tree):
+    path = str(tree / "logs" / "b.log")
+    result = find_in_files.search_file(path, 0, search.Query("error"), 100)
+
+    assert result.hits == [
+        find_in_files.Hit(path, 2, 0, "ERROR disk", 4),
+        find_in_files.Hit(path, 4, 0, "error net", 20),
+    ]
+    assert find_in_files.search_file(path, 0, search.Query("error", match_case=True), 100).hits[0].line == 4
+    assert len(find_in_files.search_file(path, 0, search.Query("error"), 1).hits) == 1
+
+
+def test_search_file__column_and_regex(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("héllo wörld\nabc\n", encoding="utf-8")
+
+    hits = find_in_files.search_file(str(path), 0, search.Query(r"w\S+", regex=True), 100).hits
+    assert [(hit.line, hit.column, hit.text) for hit in hits] == [(1, 6, "héllo wörld")]
+
+
+def test_search_file__byte_order_mark(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("error one\nok\nerror two\n", encoding="utf-8-sig")
+
+    hits = find_in_files.search_file(str(path), 0, search.Query("error"), 100).hits
+    assert [(hit.line, hit.column) for hit in hits] == [(1, 0), (3, 0)]
+    assert find_in_files.compile_bytes(search.Query("é"), "utf-8-sig").pattern == "é".encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        search.Query("foo$", regex=True),  # $ before a CRLF
+        search.Query("CAF.$", regex=True),  # . is one character, not one byte
+        search.Query("café"),  # case is ignored beyond ASCII
+    ],
+)
+def test_search_file__matches_like_find(tmp_path, query):
+    path = tmp_path / "foo.txt"
+    path.write_bytes("foo\r\nCAFÉ\r\nfoo\r\n".encode("utf-8"))
+
+    hits = find_in_files.search_file(str(path), 0, query, 100).hits
+    assert hits
+    assert all(hit.text in ("foo", "CAFÉ") for hit in hits)
+
+
+def test_search_file__decoded_line_offsets(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes("é\r\nab\r\nCAFÉ x\n".encode("utf-8"))
+
+    hits = find_in_files.search_file(str(path), 0, search.Query("é x"), 100).hits
+    assert hits == [find_in_files.Hit(str(path), 3, 3, "CAFÉ x", 8)]
+    assert find_in_files.searches_bytes(search.Query("foo"))
+    assert not find_in_files.searches_bytes(search.Query("foo", regex=True))
+    assert not find_in_files.searches_bytes(search.Query("é"))
+
+
+def test_search_file__skipped_and_special(tree, tmp_path):
+    query = search.Query("error")
+    assert find_in_files.search_file(str(tree / "logs" / "c.bin"), 0, query, 100).skipped
+
+    wide = find_in_files.search_file(str(tree / "logs" / "d.txt"), 0, query, 100)
+    assert [(hit.line, hit.text) for hit in wide.hits] == [(2, "error é")]
+
+    (tmp_path / "empty.txt").write_text("")
+    assert find_in_files.search_file(str(tmp_path / "empty.txt"), 0, query, 100).hits == []
+    assert find_in_files.search_file(str(tmp_path / "missing.txt"), 0, query, 100).error
+
+
+def test_iter_batches(monkeypatch):
+    monkeypatch.setattr(find_in_files, "BATCH_FILES", 2)
+    monkeypatch.setattr(find_in_files, "BATCH_BYTES", 100)
+
+    batches = list(find_in_files.iter_batches([("a", 1), ("b", 1), ("c", 200), ("d", 1)]))
+    assert batches == [[("a", 1), ("b", 1)], [("c", 200)], [("d", 1)]]
+
+
+def _wait(job: find_in_files.FindInFiles):
+    job.join(timeout=30)
+    assert job.done
+
+
+def test_find_in_files(tree):
+    job = find_in_files.FindInFiles(str(tree), search.Query("error"), jobs=2).start()
+    _wait(job)
+
+    assert sorted((hit.path, hit.line) for hit in job.hits) == [
+        (str(tree / "a.txt"), 2),
+        (str(tree / "logs" / "b.log"), 2),
+        (str(tree / "logs" / "b.log"), 4),
+        (str(tree / "logs" / "d.txt"), 2),
+    ]
+    assert job.files_searched == 4
+    assert job.files_skipped == 1
+    assert not job.truncated
+
+
+def test_find_in_files__max_results(tree):
+    job = find_in_files.FindInFiles(str(tree), search.Query("error"), max_results=2, jobs=1).start()
+    _wait(job)
+
+    assert len(job.hits) == 2
+    assert job.truncated
+
+
+def test_find_in_files__cancel(tree):
+    job = find_in_files.FindInFiles(str(tree), search.Query("error"), jobs=1)
+    job.cancel()
+    job.start()
+    _wait(job)
+
+    assert job.cancelled
+    assert job.hits == []
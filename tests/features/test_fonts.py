@@ -0,0 +1,16 @@
+import pytest
+
+from notepad.features import fonts
+
+
+@pytest.mark.parametrize(
+    "zoom, steps, expected",
+    [(100, 1, 110), (100, -3, 70), (20, -5, fonts.MIN_ZOOM), (490, 4, fonts.MAX_ZOOM)],
+)
+def test_step_zoom(zoom, steps, expected):
+    assert fonts.step_zoom(zoom, steps) == expected
+
+
+@pytest.mark.parametrize("size, zoom, expected", [(20, 100, 20), (20, 150, 30), (11, 50, 6), (1, 10, 1)])
+def test_zoomed_size(size, zoom, expected):
+    assert fonts.zoomed_size(size, zoom) == expected
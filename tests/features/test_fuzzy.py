@@ -0,0 +1,42 @@
+from notepad.features import fuzzy
+
+LABELS = [
+    "Edit: Find",
+    "Edit: Find Next",
+    "Edit: Find Previous",
+    "Edit: Replace",
+    "File: Save",
+    "File: Save As",
+    "View: Zoom In",
+]
+
+
+def matches(query, **kwargs):
+    index = fuzzy.FuzzyIndex(LABELS)
+    return [LABELS[i] for i in index.search(query, **kwargs)]
+
+
+def test_empty_query_lists_everything():
+    assert matches("") == LABELS
+    assert matches("  ", limit=2) == LABELS[:2]
+
+
+def test_word_prefixes():
+    assert matches("s") == ["File: Save", "File: Save As"]
+    assert matches("zo") == ["View: Zoom In"]
+
+
+def test_trigrams_rank_best_first():
+    assert matches("find next")[0] == "Edit: Find Next"
+    assert matches("save as")[0] == "File: Save As"
+    assert matches("replace") == ["Edit: Replace"]
+
+
+def test_typos_are_forgiven():
+    assert matches("prevous")[0] == "Edit: Find Previous"
+    assert matches("qqqq") == []
+
+
+def test_abbreviations():
+    assert matches("fnd nxt") == ["Edit: Find Next"]
+    assert matches("sv as")[0] == "File: Save As"
@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import pytest
+
+from notepad.features import highlight
+
+
+def tags(lexer, line, state=None):
+    tokens, state = lexer.lex(line, state)
+    return [(line[token.start : token.end], token.tag) for token in tokens], state
+
+
+def test_log_lexer():
+    assert tags(highlight.LOG_LEXER, "2024-01-02 03:04:05,678 WARNING disk INFO") == (
+        [("2024-01-02 03:04:05,678", "timestamp"), ("WARNING", "warning"), ("INFO", "info")],
+        None,
+    )
+
+
+def test_json_lexer():
+    assert tags(highlight.JSON_LEXER, '{"a": [-1.5, null, "b"]}') == (
+        [('"a"', "key"), ("-1.5", "number"), ("null", "keyword"), ('"b"', "string")],
+        None,
+    )
+
+
+def test_python_lexer():
+    assert tags(highlight.PYTHON_LEXER, "def foo(x='#'):  # bar") == (
+        [("def", "keyword"), ("foo", "definition"), ("'#'", "string"), ("# bar", "comment")],
+        None,
+    )
+
+
+def test_python_lexer__multiline_string():
+    assert tags(highlight.PYTHON_LEXER, 'x = f"""a') == ([('f"""a', "string")], '"""')
+    assert tags(highlight.PYTHON_LEXER, "b", '"""') == ([("b", "string")], '"""')
+    assert tags(highlight.PYTHON_LEXER, 'c""" if 1', '"""') == (
+        [('c"""', "string"), ("if", "keyword"), ("1", "number")],
+        None,
+    )
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [("a.py", highlight.PYTHON_LEXER), ("a.JSON", highlight.JSON_LEXER), ("a.log", highlight.LOG_LEXER)],
+)
+def test_highlighter_for(name, expected):
+    assert highlight.highlighter_for(Path(name)).lexer is expected
+
+
+def test_highlighter_for__plain_text():
+    assert highlight.highlighter_for(Path("a.txt")) is None
+    assert highlight.highlighter_for(None) is None
+
+
+class Lines(list):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.reads = []
+
+    def __call__(self, line):
+        self.reads.append(line)
+        return self[line]
+
+
+def test_highlighter__only_lexes_changed_lines():
+    lines = Lines(["x = 1"] * 10)
+    highlighter = highlight.Highlighter(highlight.PYTHON_LEXER)
+    assert [line for line, _ in highlighter.highlight(2, 6, lines)] == [2, 3, 4, 5]
+    assert highlighter.highlight(2, 6, lines) == []
+
+    lines[3] = "if x"
+    highlighter.edited(3)
+    assert highlighter.highlight(2, 6, lines) == [(3, [highlight.Token(0, 2, "keyword")])]
+
+    lines.insert(3, "y")
+    highlighter.edited(3, 0, 1)
+    assert [line for line, _ in highlighter.highlight(2, 7, lines)] == [3, 4]
+
+
+def test_highlighter__state_change_propagates():
+    lines = Lines(["a"] * 10)
+    highlighter = highlight.Highlighter(highlight.PYTHON_LEXER)
+    highlighter.highlight(0, 5, lines)
+
+    lines[1] = '"""'
+    highlighter.edited(1)
+    changed = highlighter.highlight(0, 5, lines)
+    assert [line for line, _ in changed] == [1, 2, 3, 4]
+    assert changed[-1] == (4, [highlight.Token(0, 1, "string")])
+
+
+def test_highlighter__checkpoints(monkeypatch):
+    monkeypatch.setattr(highlight, "CHECKPOINT_LINES", 4)
+    lines = Lines(["a"] * 20)
+    lines[1] = "'''"
+    highlighter = highlight.Highlighter(highlight.PYTHON_LEXER)
+
+    assert highlighter.state_at(10, lines) == "'''"
+    lines.reads.clear()
+    assert highlighter.state_at(9, lines) == "'''"
+    assert lines.reads == [8]
+
+    highlighter.edited(5)
+    lines.reads.clear()
+    highlighter.state_at(10, lines)
+    assert lines.reads == [4, 5, 6, 7, 8, 9]
@@ -0,0 +1,111 @@
+import gzip
+import json
+
+from notepad.features import journal, piece_table
+
+
+def make_journal(tmp_path, **kwargs):
+    args = {"file": None, "base": None, "encoding": "utf-8", "newline": "\n", **kwargs}
+    return journal.Journal(tmp_path / "recovery", **args)
+
+
+def test_journal_recovers_new_document(tmp_path):
+    j = make_journal(tmp_path)
+    j.append(0, 0, "hello world")
+    j.append(5, 6, "!")
+    j.flush()
+    j.join()
+
+    assert journal.recover(j.path) == journal.Recovered(None, "utf-8", "\n", "hello!")
+
+
+def test_journal_replays_onto_base_file(tmp_path):
+    file = tmp_path / "foo.txt"
+    file.write_text("one\r\ntwo\r\n", newline="")
+    j = make_journal(tmp_path, file=file, base=journal.Base.of(file), newline="\r\n")
+    j.append(4, 3, "2")
+    j.flush()
+    j.join()
+
+    recovered = journal.recover(j.path)
+    assert recovered.file == file
+    assert recovered.newline == "\r\n"
+    assert recovered.text == "one\n2\n"
+
+
+def test_journal_replays_onto_compressed_base_file(tmp_path):
+    file = tmp_path / "app.log.gz"
+    file.write_bytes(gzip.compress(b"one\ntwo\n"))
+    j = make_journal(tmp_path, file=file, base=journal.Base.of(file))
+    j.append(4, 3, "2")
+    j.flush()
+    j.join()
+
+    assert journal.recover(j.path).text == "one\n2\n"
+
+
+def test_journal_is_not_replayed_onto_changed_file(tmp_path):
+    file = tmp_path / "foo.txt"
+    file.write_text("one")
+    j = make_journal(tmp_path, file=file, base=journal.Base.of(file))
+    j.join()
+
+    file.write_text("changed")
+    assert journal.recover(j.path) is None
+
+
+def test_torn_last_line_ends_replay(tmp_path):
+    j = make_journal(tmp_path)
+    j.append(0, 0, "abc")
+    j.flush()
+    j.join()
+    with open(j.path, "a") as f:
+        f.write('[3, 0, "de')
+
+    assert journal.recover(j.path).text == "abc"
+
+
+def test_compact(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "COMPACT_MIN_BYTES", 10)
+    file = tmp_path / "foo.txt"
+    file.write_text("x")
+    j = make_journal(tmp_path, file=file, base=journal.Base.of(file))
+    for i in range(20):
+        j.append(0, 1, str(i))
+    j.flush()
+    j.join()
+    assert j.should_compact(2)
+    before = j.bytes_written
+
+    j.compact(piece_table.PieceTable("19"))
+    j.append(2, 0, "!")
+    j.flush()
+    j.join()
+
+    lines = j.path.read_text().splitlines()
+    assert json.loads(lines[0])["base"] is None
+    assert len(lines) == 3
+    assert j.bytes_written < before
+    file.write_text("changed")
+    assert journal.recover(j.path).text == "19!"
+
+
+def test_discard(tmp_path):
+    j = make_journal(tmp_path)
+    j.append(0, 0, "abc")
+    j.flush()
+    j.discard()
+    j._thread.join(5)
+
+    assert not j.path.exists()
+
+
+def test_orphans(tmp_path):
+    directory = tmp_path / "recovery"
+    live = make_journal(tmp_path)
+    live.join()
+    dead = directory / f"{2 ** 22 + 1}-0{journal.SUFFIX}"
+    dead.write_text("")
+
+    assert journal.orphans(directory) == [dead]
+    assert journal.orphans(tmp_path / "missing") == []
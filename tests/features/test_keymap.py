@@ -0,0 +1,72 @@
+import pytest
+
+from notepad.features import keymap, shortcuts
+
+CTRL, SHIFT = 0x4, 0x1
+
+
+def press(k: keymap.Keymap, *strokes: keymap.Stroke) -> keymap.Node:
+    node = k.root
+    for stroke in strokes:
+        node = k.step(node, stroke)
+    return node
+
+
+def test_stroke_of():
+    assert keymap.stroke_of("s", CTRL) == ("ctrl", "s")
+    assert keymap.stroke_of("S", CTRL | SHIFT) == ("ctrl", "shift", "s")
+    assert keymap.stroke_of("A", 0x2) == ("a",)  # caps lock
+    assert keymap.stroke_of("plus", CTRL | SHIFT) == ("ctrl", "plus")
+    assert keymap.stroke_of("0", CTRL) == ("ctrl", "0")
+    assert keymap.stroke_of("F3", SHIFT) == ("shift", "f3")
+    assert keymap.stroke_of("Control_L", CTRL) is None
+
+
+def test_default_keymap():
+    k = keymap.load()
+    assert k is keymap.load()  # compiled once
+    assert press(k, ("ctrl", "s")).action == "file_save"
+    assert press(k, ("ctrl", "shift", "s")).action == "file_save_as"
+    assert press(k, ("shift", "f3")).action == "edit_find_previous"
+    assert k.step(k.root, ("ctrl", "k")) is None
+
+
+def test_chords():
+    k = keymap.Keymap(
+        {
+            "edit_comment": shortcuts.parse("ctrl+k ctrl+c"),
+            "edit_uncomment": shortcuts.parse("ctrl+k ctrl+u"),
+            "file_save": shortcuts.parse("ctrl+s"),
+        }
+    )
+    prefix = press(k, ("ctrl", "k"))
+    assert prefix.action is None
+    assert k.step(prefix, ("ctrl", "c")).action == "edit_comment"
+    assert k.step(prefix, ("ctrl", "u")).action == "edit_uncomment"
+    assert k.step(prefix, ("ctrl", "s")) is None
+
+
+@pytest.mark.parametrize("second", ["ctrl+k", "ctrl+k ctrl+c ctrl+d", "ctrl+k ctrl+c"])
+def test_conflicts(second):
+    with pytest.raises(ValueError):
+        keymap.Keymap({"first": shortcuts.parse("ctrl+k ctrl+c"), "second": shortcuts.parse(second)})
+
+
+def test_user_keymap(tmp_path):
+    path = tmp_path / "keymap.json"
+    path.write_text('{"edit_find": "ctrl+k ctrl+f", "file_exit": null}')
+
+    k = keymap.load(path)
+    assert k is keymap.load(path)
+    assert press(k, ("ctrl", "k"), ("ctrl", "f")).action == "edit_find"
+    assert press(k, ("ctrl", "f")) is None
+    assert "file_exit" not in k.bindings
+    assert press(k, ("ctrl", "s")).action == "file_save"
+
+    assert keymap.load(tmp_path / "missing.json") is keymap.load()
+
+
+def test_invalid_user_keymap(tmp_path):
+    path = tmp_path / "keymap.json"
+    path.write_text('{"edit_find": "ctrl+nope"}')
+    assert keymap.load(path) is keymap.load()
@@ -0,0 +1,48 @@
+import pytest
+
+from notepad.features import largefile
+
+
+@pytest.fixture()
+def mapped_file(tmp_path):
+    path = tmp_path / "big.log"
+    path.write_bytes(b"".join(f"line {i}\n".encode() for i in range(100)))
+    with largefile.MappedFile(path) as f:
+        yield f
+
+
+def test_line_navigation(mapped_file):
+    assert mapped_file.line_start(0) == 0
+    assert mapped_file.line_start(3) == 0
+    assert mapped_file.next_line(0) == len(b"line 0\n")
+    assert mapped_file.next_line(0, 2) == len(b"line 0\nline 1\n")
+    assert mapped_file.next_line(0, 1000) == mapped_file.size
+    assert mapped_file.previous_line(mapped_file.next_line(0, 2), 1) == len(b"line 0\n")
+    assert mapped_file.previous_line(5, 10) == 0
+
+
+def test_fractions(mapped_file):
+    assert mapped_file.offset_at_fraction(0) == 0
+    assert mapped_file.offset_at_fraction(1) == mapped_file.size
+    middle = mapped_file.offset_at_fraction(0.5)
+    assert mapped_file.buffer[middle - 1 : middle] == b"\n"
+    assert mapped_file.fraction_at_offset(mapped_file.size) == 1.0
+
+
+def test_read_window(mapped_file):
+    window = mapped_file.read_window(3, max_lines=2)
+    assert window.text == "line 0\nline 1\n"
+    assert window.start == 0
+    assert window.end == len(window.text)
+
+    capped = mapped_file.read_window(0, max_lines=10, max_bytes=4)
+    assert capped.text == "line"
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.log"
+    path.write_bytes(b"")
+    with largefile.MappedFile(path) as f:
+        assert f.size == 0
+        assert f.read_window(0).text == ""
+        assert f.fraction_at_offset(0) == 0.0
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from notepad.features import line_index
+
+
+def brute_force_starts(text: str) -> list:
+    return [0] + [i + 1 for i, c in enumerate(text) if c == "\n"]
+
+
+def all_starts(index: line_index.LineIndex) -> list:
+    return [index.line_start(line) for line in range(len(index))]
+
+
+@pytest.mark.parametrize("text", ["", "foo", "foo\n", "\n\n", "a\nbb\n\nccc"])
+def test_from_buffer(text):
+    assert all_starts(line_index.LineIndex.from_buffer(text)) == brute_force_starts(text)
+    assert all_starts(line_index.LineIndex.from_buffer(text.encode())) == brute_force_starts(text)
+
+
+def test_from_buffer__chunked():
+    text = "ab\ncd\n\nefg\n" * 20
+    index = line_index.LineIndex.from_buffer(text, chunk_size=7)
+    assert all_starts(index) == brute_force_starts(text)
+
+
+def test_line_of_and_position():
+    index = line_index.LineIndex.from_buffer("ab\ncd\n\nefg")
+    assert index.line_of(0) == 0
+    assert index.line_of(2) == 0
+    assert index.line_of(3) == 1
+    assert index.line_of(6) == 2
+    assert index.line_of(100) == 3
+    assert index.position(8) == (3, 1)
+    assert index.line_start(100) == 7
+
+
+def test_random_edits():
+    random.seed(42)
+    text = "hello\nworld\n" * 10
+    index = line_index.LineIndex.from_buffer(text)
+
+    for _ in range(500):
+        offset = random.randint(0, len(text))
+        if random.random() < 0.5:
+            inserted = random.choice(["x", "\n", "ab\ncd", "\n\n", "yy"])
+            text = text[:offset] + inserted + text[offset:]
+            index.insert(offset, inserted)
+        else:
+            length = random.randint(0, 5)
+            text = text[:offset] + text[offset + length :]
+            index.delete(offset, min(length, len(text) + length - offset))
+
+        assert all_starts(index) == brute_force_starts(text)
@@ -0,0 +1,165 @@
+import bz2
+import gzip
+import lzma
+import time
+
+import pytest
+
+from notepad.features import encoding, loader
+
+
+def load_all(load: loader.StreamingLoad, timeout: float = 5) -> str:
+    text = []
+    deadline = time.monotonic() + timeout
+    while not load.done:
+        assert time.monotonic() < deadline, "load did not finish"
+        text.extend(chunk.text for chunk in load.drain(10))
+    return "".join(text)
+
+
+def test_streaming_load(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("hello\nworld\n" * 1000)
+
+    load = loader.StreamingLoad(path, chunk_size=100).start()
+
+    assert load_all(load) == "hello\nworld\n" * 1000
+    assert load.progress == 1.0
+    assert load.bytes_read == load.total_size
+    assert load.error is None
+    assert load.newlines == "\n"
+
+
+def test_streaming_load__empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+
+    load = loader.StreamingLoad(path).start()
+    assert load_all(load) == ""
+    assert load.progress == 1.0
+
+
+def test_streaming_load__split_crlf_and_multibyte(tmp_path):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes("é\r\n".encode() * 50)
+
+    # odd chunk size splits both the multibyte character and the crlf pair
+    load = loader.StreamingLoad(path, chunk_size=3).start()
+
+    assert load_all(load) == "é\n" * 50
+    assert load.newlines == "\r\n"
+
+
+def test_streaming_load__cancel(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_text("x" * 10_000)
+
+    load = loader.StreamingLoad(path, chunk_size=10, max_pending_chunks=2).start()
+    load.cancel()
+
+    assert load.cancelled
+    load._thread.join(timeout=5)
+    assert not load._thread.is_alive()
+
+
+def test_streaming_load__missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        loader.StreamingLoad(tmp_path / "missing.txt")
+
+
+@pytest.mark.parametrize(
+    "content,newline", [(b"a\nb", "\n"), (b"a\r\nb\r\n", "\r\n"), (b"a\nb\r\n", "\r\n"), (b"ab", None)]
+)
+def test_streaming_load__newline(tmp_path, content, newline):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(content)
+
+    load = loader.StreamingLoad(path).start()
+    load_all(load)
+    assert load.newline == newline
+
+
+@pytest.mark.parametrize(
+    "data, expected_encoding",
+    [
+        ("a\r\nb€\r\n".encode("utf-8"), "utf-8"),
+        ("a\r\nb€\r\n".encode("cp1252"), "cp1252"),
+        ("a\r\nb€\r\n".encode("utf-16"), "utf-16"),
+    ],
+)
+def test_streaming_load__detects_encoding(tmp_path, data, expected_encoding):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(data)
+
+    load = loader.StreamingLoad(path, chunk_size=3).start()
+
+    assert load_all(load) == "a\nb€\n"
+    assert load.encoding == expected_encoding
+    assert load.detection.newline == "\r\n"
+    assert load.newline == "\r\n"
+
+
+def test_streaming_load__undecodable_past_prefix(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes("é\n".encode("utf-8") * encoding.SNIFF_SIZE + b"bad \xff\xfe\n")
+
+    load = loader.StreamingLoad(path, chunk_size=1000).start()
+
+    assert load_all(load).endswith("bad \ufffd\ufffd\n")
+    assert load.encoding == "utf-8"
+    assert load.undecodable == 2
+    assert load.error is None
+
+
+def test_streaming_load__undecodable_cp1252(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(b"caf\xe9 \x81\n")  # 0x81 is not mapped in cp1252
+
+    load = loader.StreamingLoad(path, encoding="cp1252").start()
+    assert load_all(load) == "café \ufffd\n"
+    assert load.undecodable == 1
+
+    path.write_bytes(b"caf\xe9\n")
+    load = loader.StreamingLoad(path, encoding="cp1252").start()
+    load_all(load)
+    assert load.undecodable == 0
+
+
+@pytest.mark.parametrize("module, compression", [(gzip, "gzip"), (bz2, "bz2"), (lzma, "xz")])
+def test_streaming_load__compressed(tmp_path, module, compression):
+    path = tmp_path / "app.log.1"  # recognized without a suffix
+    path.write_bytes(module.compress(("é\r\n" * 1000).encode()))
+
+    load = loader.StreamingLoad(path, chunk_size=100).start()
+
+    assert load_all(load) == "é\n" * 1000
+    assert load.compression == compression
+    assert load.bytes_decoded == 4000
+    assert load.bytes_read == load.total_size
+    assert load.newline == "\r\n"
+    assert load.rate > 0
+
+
+def test_streaming_load__truncated_compressed(tmp_path):
+    path = tmp_path / "app.log.gz"
+    path.write_bytes(gzip.compress(b"x" * 10_000)[:-10])
+
+    load = loader.StreamingLoad(path).start()
+    load_all(load)
+    assert isinstance(load.error, EOFError)
+
+
+@pytest.mark.parametrize(
+    "name, data",
+    [
+        ("app.log.xz", lzma.compress(b"x" * 10_000)[:-20] + b"\0" * 20),
+        ("app.log.gz", gzip.compress(b"x" * 10_000)[:10] + b"\xff" * 40),
+    ],
+)
+def test_streaming_load__corrupt_compressed(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+
+    load = loader.StreamingLoad(path).start()
+    load_all(load)
+    assert load.error is not None
@@ -1,3 +1,4 @@
+import json
 import logging
 
 import pytest
@@ -10,3 +11,64 @@ from notepad.features import logger
 )
 def test_configure_logger(level, expected_logging):
     assert logger.configure_logging(level) == expected_logging
+
+
+def test_decorator_is_free_when_off(monkeypatch):
+    monkeypatch.setattr(logger, "_profiling", False)
+    monkeypatch.setattr(logger.LOG, "isEnabledFor", lambda level: False)
+
+    def foo():
+        return 1
+
+    assert logger.log_info(foo) is foo
+    assert logger.log_debug(foo) is foo
+
+
+def test_decorator_records_timings(monkeypatch, tmp_path):
+    monkeypatch.setattr(logger, "_profiling", True)
+    monkeypatch.setattr(logger, "TIMINGS", {})
+
+    @logger.log_action
+    def bar(x):
+        return x + 1
+
+    assert bar(1) == 2
+    assert bar(2) == 3
+
+    histogram = logger.TIMINGS[bar.__qualname__]
+    assert histogram.count == 2
+    assert sum(histogram.buckets.values()) == 2
+    assert "bar" in logger.format_timings()
+
+    out = tmp_path / "profile.json"
+    logger.dump_timings(out)
+    assert json.loads(out.read_text())[bar.__qualname__]["count"] == 2
+
+
+def test_format_timings__uncalled(monkeypatch):
+    monkeypatch.setattr(logger, "_profiling", True)
+    monkeypatch.setattr(logger, "TIMINGS", {})
+
+    @logger.log_action
+    def called():
+        pass
+
+    @logger.log_action
+    def never_called():
+        pass
+
+    called()
+    timings = logger.format_timings()
+    assert "called" in timings
+    assert "never_called" not in timings
+
+
+def test_histogram():
+    histogram = logger.Histogram()
+    histogram.record(0.000_003)
+    histogram.record(0.001)
+
+    summary = histogram.as_dict()
+    assert summary["count"] == 2
+    assert summary["max_us"] == pytest.approx(1000)
+    assert summary["buckets_us"] == {"<4": 1, "<1024": 1}
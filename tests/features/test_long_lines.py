@@ -0,0 +1,66 @@
+import pytest
+
+from notepad.features import line_index, long_lines
+
+
+def segment_all(segmenter, text, chunk_size):
+    return "".join(segmenter.segment(text[i : i + chunk_size]) for i in range(0, len(text), chunk_size))
+
+
+def test_short_lines_are_untouched():
+    segmenter = long_lines.LineSegmenter(5)
+
+    assert segmenter.segment("abc\nde") == "abc\nde"
+    assert segmenter.segment("f\n") == "f\n"
+    assert not segmenter
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_long_lines_are_split(chunk_size):
+    segmenter = long_lines.LineSegmenter(3)
+
+    assert segment_all(segmenter, "abcdefg\nhi\nabc\nabcd", chunk_size) == "abc\ndef\ng\nhi\nabc\nabc\nd"
+    assert list(segmenter.breaks) == [3, 6, 18]
+    assert segmenter
+
+
+TEXT = "ab\nabcdefgh\n\nabcd"
+
+
+@pytest.fixture()
+def segmenter():
+    segmenter = long_lines.LineSegmenter(3)
+    segmenter.segment(TEXT)  # view: ab / abc / def / gh / (empty) / abc / d
+    return segmenter
+
+
+@pytest.mark.parametrize(
+    "offset, position",
+    [
+        (0, (0, 0)),
+        (2, (0, 2)),
+        (3, (1, 0)),
+        (6, (2, 0)),
+        (8, (2, 2)),
+        (9, (3, 0)),
+        (11, (3, 2)),
+        (12, (4, 0)),
+        (15, (5, 2)),
+        (16, (6, 0)),
+        (17, (6, 1)),
+    ],
+)
+def test_positions_map_both_ways(segmenter, offset, position):
+    lines = line_index.LineIndex.from_buffer(TEXT)
+
+    assert segmenter.view_position(lines, offset) == position
+    assert segmenter.document_offset(lines, *position) == offset
+
+
+def test_document_offset_is_clamped_to_display_line(segmenter):
+    lines = line_index.LineIndex.from_buffer(TEXT)
+
+    assert segmenter.document_offset(lines, 0, 10) == 2
+    assert segmenter.document_offset(lines, 3, 10) == 11
+    assert segmenter.document_offset(lines, 6, 10) == 17
+    assert segmenter.document_offset(lines, 60, 0) == 16
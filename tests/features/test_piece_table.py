@@ -0,0 +1,102 @@
+import random
+
+from notepad.features import piece_table
+
+
+def test_piece_table():
+    table = piece_table.PieceTable("hello world")
+    assert len(table) == 11
+    assert table.piece_count == 1
+
+    table.insert(5, ",")
+    table.insert(len(table), "!")
+    table.insert(0, ">> ")
+    assert table.get() == ">> hello, world!"
+    assert str(table) == ">> hello, world!"
+
+    table.delete(3, 7)
+    assert table.get() == ">> world!"
+    assert table.get(3, 8) == "world"
+
+
+def test_piece_table__clamps():
+    table = piece_table.PieceTable("abc")
+    table.insert(100, "d")
+    table.delete(-5, 6)
+    table.delete(2, 100)
+    assert table.get() == "bc"
+
+
+def test_snapshot_is_independent():
+    table = piece_table.PieceTable("abc")
+    snapshot = table.snapshot()
+    table.insert(1, "xyz")
+    table.delete(0, 1)
+
+    assert snapshot.get() == "abc"
+    assert table.get() == "xyzbc"
+
+
+def test_iter_chunks():
+    table = piece_table.PieceTable("a" * 10)
+    table.insert(5, "b" * 10)
+
+    assert list(table.iter_chunks(chunk_size=4)) == ["aaaa", "a", "bbbb", "bbbb", "bb", "aaaa", "a"]
+    assert "".join(table.iter_chunks(3, 17, chunk_size=3)) == table.get()[3:17]
+    assert list(table.iter_chunks(5, 5)) == []
+
+
+def test_random_edits():
+    random.seed(7)
+    text = "0123456789" * 5
+    table = piece_table.PieceTable(text)
+
+    for _ in range(500):
+        offset = random.randint(0, len(text))
+        if random.random() < 0.5:
+            inserted = random.choice(["x", "yz", "\n"])
+            text = text[:offset] + inserted + text[offset:]
+            table.insert(offset, inserted)
+        else:
+            length = random.randint(0, 4)
+            text = text[:offset] + text[offset + length :]
+            table.delete(offset, length)
+
+        assert len(table) == len(text)
+    assert table.get() == text
+
+
+def test_slice():
+    table = piece_table.PieceTable("hello world")
+    table.insert(5, ",")
+    piece = table.slice(3, 9)
+
+    table.delete(0, len(table))
+    assert str(piece) == "lo, wo"
+    assert piece.piece_count == 3
+    assert str(piece.slice(1, 4)) == "o, "
+    assert piece.count("o") == 2
+    assert str(table.slice(5, 2)) == ""
+
+
+def test_typing_extends_one_piece():
+    table = piece_table.PieceTable("hello world")
+    for i, character in enumerate(", dear"):
+        table.insert(5 + i, character)
+
+    assert table.get() == "hello, dear world"
+    assert table.piece_count == 3
+
+
+def test_snapshot_survives_add_buffer_growth(monkeypatch):
+    monkeypatch.setattr(piece_table, "ADD_BUFFER_SIZE", 4)
+    table = piece_table.PieceTable()
+    table.insert(0, "ab")
+    snapshot = table.snapshot()
+    table.insert(2, "cd")
+    table.insert(0, "ef")  # the add buffer is full: starts another one
+
+    assert snapshot.get() == "ab"
+    assert table.get() == "efabcd"
+    assert table.piece_count == 2
+    assert table.get(1, 5) == "fabc"
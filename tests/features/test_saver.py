@@ -0,0 +1,121 @@
+import os
+import stat
+import time
+
+import pytest
+
+from notepad.features import compression as compression_formats, saver
+
+
+def test_save(tmp_path):
+    path = tmp_path / "foo.txt"
+    result = saver.save(["hello\n", "world"], path)
+
+    assert path.read_bytes() == b"hello\nworld"
+    assert result.path == path
+    assert result.bytes_written == 11
+    assert result.throughput > 0
+    assert "MB/s" in result.summary
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_save__encoding_and_newline(tmp_path):
+    path = tmp_path / "foo.txt"
+    saver.save(["é\n", "x\n"], path, encoding="utf-16", newline="\r\n", fsync=True)
+
+    assert path.read_bytes().decode("utf-16") == "é\r\nx\r\n"
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "xz"])
+def test_save__compressed(tmp_path, compression):
+    path = tmp_path / "app.log"
+    result = saver.save(["a\n"] * 1000, path, compression=compression, fsync=True)
+
+    assert result.bytes_written == 2000
+    assert path.stat().st_size < 2000
+    assert compression_formats.detect(path) == compression
+    with compression_formats.open_text(path, "utf-8") as f:
+        assert f.read() == "a\n" * 1000
+
+
+@pytest.mark.skipif(os.name != "posix", reason="posix permissions")
+def test_save__keeps_mode(tmp_path):
+    path = tmp_path / "script.sh"
+    path.write_text("old")
+    path.chmod(0o750)
+
+    saver.save(["new"], path)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o750
+    assert path.read_text() == "new"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="posix permissions")
+def test_save__new_file_mode(tmp_path):
+    path = tmp_path / "new.txt"
+
+    saver.save(["new"], path)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~saver.UMASK
+
+
+@pytest.mark.skipif(os.name != "posix", reason="symlinks")
+def test_save__symlink(tmp_path):
+    target = tmp_path / "target.txt"
+    target.write_text("old")
+    link = tmp_path / "link.txt"
+    link.symlink_to(target)
+
+    result = saver.save(["new"], link)
+    assert result.path == link
+    assert link.is_symlink()
+    assert target.read_text() == "new"
+    assert sorted(tmp_path.iterdir()) == [link, target]
+
+
+def test_save__failure_keeps_original(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("original")
+
+    def chunks():
+        yield "partial"
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        saver.save(chunks(), path)
+
+    assert path.read_text() == "original"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_save__replace_if(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("original")
+
+    result = saver.save(["new"], path, replace_if=lambda: False)
+    assert result.bytes_written == 0
+    assert path.read_text() == "original"
+    assert list(tmp_path.iterdir()) == [path]
+
+    saver.save(["new"], path, replace_if=lambda: True)
+    assert path.read_text() == "new"
+
+
+def test_background_save(tmp_path):
+    path = tmp_path / "foo.txt"
+    save = saver.BackgroundSave(iter(["a", "b"]), path).start()
+
+    deadline = time.monotonic() + 5
+    while not save.done:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    assert save.error is None
+    assert save.result.bytes_written == 2
+    assert path.read_text() == "ab"
+
+
+def test_background_save__error(tmp_path):
+    save = saver.BackgroundSave(iter(["a"]), tmp_path / "missing" / "foo.txt").start()
+    save._thread.join(timeout=5)
+
+    assert save.result is None
+    assert isinstance(save.error, OSError)
@@ -0,0 +1,40 @@
+from notepad.features import scheduler
+from tests.common import FakeRoot
+
+
+def test_requests_are_coalesced():
+    root = FakeRoot()
+    updates = scheduler.UpdateScheduler(root)
+    calls = []
+    updates.register("location", lambda: calls.append("location"))
+    updates.register("counts", lambda: calls.append("counts"))
+
+    for _ in range(100):
+        updates.request("location", "event")
+    updates.request("counts")
+
+    assert len(root.after_calls) == 1
+    assert calls == []
+
+    root.run()
+    assert calls == ["location", "counts"]
+
+    root.run()
+    assert calls == ["location", "counts"]
+
+
+def test_cancel_and_unregister():
+    root = FakeRoot()
+    updates = scheduler.UpdateScheduler(root)
+    calls = []
+    updates.register("location", lambda: calls.append("location"))
+
+    updates.request("location")
+    updates.cancel()
+    assert root.after_calls == {}
+
+    updates.request("location")
+    updates.request("unknown")
+    updates.unregister("location")
+    root.run()
+    assert calls == []
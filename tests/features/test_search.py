@@ -0,0 +1,143 @@
+import re
+import time
+
+import pytest
+
+from notepad import document
+from notepad.features import search
+
+
+def test_compile_query_is_cached():
+    query = search.Query("a.b", regex=False)
+    assert search.compile_query(query) is search.compile_query(search.Query("a.b"))
+    assert search.compile_query(query).search("axb") is None
+    assert search.compile_query(query._replace(regex=True)).search("axb")
+
+
+def test_is_valid():
+    assert search.is_valid(search.Query("foo"))
+    assert not search.is_valid(search.Query(""))
+    assert not search.is_valid(search.Query("(", regex=True))
+    assert search.is_valid(search.Query("(", regex=False))
+
+
+def test_iter_line_blocks():
+    blocks = list(search.iter_line_blocks(["ab\nc", "d\ne", "f"]))
+    assert blocks == [(0, "ab\n"), (3, "cd\n"), (6, "ef")]
+
+
+def test_iter_line_blocks__long_line():
+    blocks = list(search.iter_line_blocks(["ab"] * 1000 + ["c\nd", "e\n"]))
+    assert blocks == [(0, "ab" * 1000 + "c\n"), (2002, "de\n")]
+    assert list(search.iter_line_blocks(["\n", ""])) == [(0, "\n")]
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        (search.Query("foo"), [(0, 3), (8, 11), (12, 15)]),
+        (search.Query("foo", match_case=True), [(0, 3), (12, 15)]),
+        (search.Query("^f.o$", regex=True), [(12, 15)]),
+        (search.Query("x*", regex=True), []),
+    ],
+)
+def test_iter_matches(query, expected):
+    text = "foo bar FOO\nfoo"
+    chunks = [text[i : i + 4] for i in range(0, len(text), 4)]
+    assert [tuple(m) for m in search.iter_matches(chunks, query)] == expected
+
+
+def test_find_next_and_previous():
+    doc = document.Document("one two\none two\none")
+    query = search.Query("one")
+
+    assert search.find_next(doc, query, 0) == (0, 3)
+    assert search.find_next(doc, query, 1) == (8, 11)
+    assert search.find_next(doc, query, 16) == (16, 19)
+    assert search.find_next(doc, query, 18) == (0, 3)
+    assert search.find_next(doc, query, 18, wrap=False) is None
+
+    assert search.find_previous(doc, query, 16) == (8, 11)
+    assert search.find_previous(doc, query, 2) == (16, 19)
+    assert search.find_previous(doc, query, 2, wrap=False) is None
+    assert search.find_next(doc, search.Query("missing"), 0) is None
+
+
+def test_find_next__wraps_to_match_around_cursor():
+    doc = document.Document("abcdef\nxyz")
+    assert search.find_next(doc, search.Query("bcd"), 2) == (1, 4)
+    assert search.find_next(doc, search.Query("xyz"), 8) == (7, 10)
+    assert search.find_next(doc, search.Query("bcd"), 2, wrap=False) is None
+
+
+def test_find_previous__long_document(monkeypatch):
+    monkeypatch.setattr(search, "BACKWARD_WINDOW", 16)
+    doc = document.Document("needle\n" + "hay\n" * 100)
+    assert search.find_previous(doc, search.Query("needle"), len(doc)) == (0, 6)
+
+
+def test_replace_all():
+    text = "a foo\nbar\nfoo foo\nbaz\n"
+    result = search.replace_all(text.splitlines(keepends=True), search.Query("foo"), r"\1")
+
+    assert result.count == 3
+    assert (result.start, result.end) == (0, 18)
+    assert result.text == "a \\1\nbar\n\\1 \\1\n"
+    assert text[: result.start] + result.text + text[result.end :] == text.replace("foo", "\\1")
+
+
+def test_replace_all__regex_groups():
+    result = search.replace_all(["x=1\ny=2\n"], search.Query(r"(\w)=(\d)", regex=True), r"\2=\1")
+    assert result.text == "1=x\n2=y\n"
+    assert search.replace_all(["abc"], search.Query("z"), "y") is None
+
+
+def test_search_job():
+    doc = document.Document("ab\n" * 1000)
+    job = search.SearchJob(doc.text.snapshot(), search.Query("b")).start()
+    doc.insert(0, "bbbb")  # does not affect the running job
+
+    deadline = time.monotonic() + 5
+    while not job.done:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    assert len(job.starts) == 1000
+    assert not job.truncated
+    assert list(job.matches_between(4, 8)) == [(4, 5), (7, 8)]
+    assert list(job.matches_between(5, 6)) == []
+
+
+def test_search_job__max_matches():
+    doc = document.Document("b" * 100)
+    job = search.SearchJob(doc.text, search.Query("b"), max_matches=10).start()
+    job._thread.join(timeout=5)
+    assert len(job.starts) == 10
+    assert job.truncated
+
+
+def test_search_job__matches_between_mid_append():
+    job = search.SearchJob(document.Document("").text, search.Query("b"))
+    job.starts.extend([0, 4])
+    job.ends.append(1)  # the worker is between its two appends
+    assert list(job.matches_between(0, 10)) == [(0, 1)]
+
+
+def test_find_job():
+    doc = document.Document("one two\none")
+    job = search.FindJob(search.find_next, doc.snapshot(), search.Query("one"), 1).start()
+    doc.insert(0, "one ")  # does not affect the running job
+    job._thread.join(timeout=5)
+
+    assert job.done
+    assert job.result == (8, 11)
+    assert job.error is None
+
+
+def test_find_job__error():
+    chunks = ["a=1\n"]
+    job = search.FindJob(search.replace_all, chunks, search.Query(r"(\w)=", regex=True), r"\2").start()
+    job._thread.join(timeout=5)
+
+    assert job.done
+    assert isinstance(job.error, re.error)
@@ -0,0 +1,45 @@
+from notepad.features import session
+
+SNAPSHOT = session.Snapshot(
+    "dark",
+    (
+        session.DocumentState("/logs/app.log", cursor=120, top_line=3, wrap="word", zoom=150),
+        session.DocumentState("/logs/big.log", large_file_offset=1 << 30),
+    ),
+)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "notepad" / "session.json"
+    writer = session.SessionWriter(path)
+    writer.write(SNAPSHOT)
+    writer.join()
+
+    assert session.load(path) == SNAPSHOT
+    assert [p.name for p in path.parent.iterdir()] == ["session.json"]
+
+
+def test_unchanged_snapshots_are_not_written(tmp_path):
+    path = tmp_path / "session.json"
+    writer = session.SessionWriter(path)
+    for _ in range(3):
+        writer.write(SNAPSHOT)
+        writer.join()
+    assert writer.writes == 1
+
+    moved = SNAPSHOT._replace(documents=(SNAPSHOT.documents[0]._replace(cursor=121),))
+    writer.write(moved)
+    writer.join()
+    assert writer.writes == 2
+    assert session.load(path) == moved
+
+
+def test_load_missing_or_unreadable(tmp_path):
+    path = tmp_path / "session.json"
+    assert session.load(path) is None
+
+    path.write_text("{not json")
+    assert session.load(path) is None
+
+    path.write_text('{"version": 0, "theme": "light", "documents": []}')
+    assert session.load(path) is None
@@ -25,3 +25,30 @@ def test_short_cut_overlap():
     """No two shortcuts should be used twice"""
     values = tuple(s.key_binding for s in shortcuts.SHORTCUTS.values())
     assert len(values) == len(set(values))
+
+
+def test_shortcut_digit():
+    my_shortcut = shortcuts.Shortcut("ctrl", "0")
+
+    assert my_shortcut.accelerator == "Ctrl+0"
+    assert my_shortcut.key_binding == "<Control-Key-0>"
+
+
+def test_shortcut_function_key():
+    my_shortcut = shortcuts.Shortcut("shift", "f3")
+
+    assert my_shortcut.accelerator == "Shift+F3"
+    assert my_shortcut.key_binding == "<Shift-F3>"
+    assert my_shortcut.stroke == ("shift", "f3")
+
+
+def test_parse():
+    assert shortcuts.parse("Shift+Ctrl+S").stroke == ("ctrl", "shift", "s")
+
+    chord = shortcuts.parse("ctrl+k  ctrl+c")
+    assert isinstance(chord, shortcuts.Chord)
+    assert chord.strokes == (("ctrl", "k"), ("ctrl", "c"))
+    assert chord.accelerator == "Ctrl+K Ctrl+C"
+
+    with pytest.raises(ValueError):
+        shortcuts.parse("ctrl+k ctrl+nope")
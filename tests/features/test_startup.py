@@ -0,0 +1,27 @@
+from unittest import mock
+
+from notepad.features import startup
+
+
+def test_startup_profile():
+    profile = startup.StartupProfile(start=0)
+    with mock.patch("time.perf_counter", side_effect=[0.5, 1.5]):
+        profile.mark("root")
+        profile.mark("menu bar")
+
+    assert profile.phases == [("root", 0.5), ("menu bar", 1.0)]
+    assert profile.total == 1.5
+    assert "menu bar" in profile.report()
+    assert "1500.0 ms" in profile.report()
+
+
+@mock.patch("notepad.features.startup._profile", None)
+def test_disabled_by_default():
+    assert not startup.is_enabled()
+    startup.mark("ignored")
+    assert startup.report() == ""
+
+    startup.enable()
+    startup.mark("root")
+    assert startup.is_enabled()
+    assert "root" in startup.report()
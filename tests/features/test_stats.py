@@ -0,0 +1,147 @@
+import random
+import time
+
+import pytest
+
+from notepad import document
+from notepad.features import piece_table, stats
+
+
+def _words(text: str) -> int:
+    return len(text.split())
+
+
+def _stats(text: str = ""):
+    doc = document.Document(text)
+    doc_stats = stats.DocumentStats(doc)
+    doc.subscribe(doc_stats.edited)
+    if text:
+        doc_stats.recount()
+        _wait(doc_stats)
+    return doc, doc_stats
+
+
+def _wait(doc_stats: stats.DocumentStats):
+    deadline = time.monotonic() + 5
+    while not doc_stats.poll():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize(
+    "chunks, before, expected",
+    [
+        (["foo bar"], "", 2),
+        (["foo", "bar"], "", 1),
+        (["foo ", "bar"], "", 2),
+        (["foo"], "x", 0),
+        (["foo"], " ", 1),
+        ([" foo"], "x", 1),
+        (["", "a\n\tb  "], "", 2),
+    ],
+)
+def test_count_words(chunks, before, expected):
+    assert stats.count_words(chunks, before) == expected
+
+
+@pytest.mark.parametrize(
+    "text, offset, length, inserted",
+    [
+        ("foo bar", 3, 1, ""),  # join two words
+        ("foobar", 3, 0, " "),  # split a word
+        ("foo bar", 0, 7, "x"),
+        ("foo bar", 7, 0, "baz"),  # runs on from the last word
+        ("foo bar", 4, 0, "baz "),
+        ("a b c", 1, 3, ""),
+        ("a b c", 2, 1, "x y"),
+        ("", 0, 0, "one two"),
+    ],
+)
+def test_word_delta(text, offset, length, inserted):
+    doc, doc_stats = _stats(text)
+    doc.replace(offset, length, inserted)
+
+    assert doc_stats.counts.words == _words(doc.get())
+
+
+def test_word_delta__large_removal():
+    text = "word " * (document.LARGE_EDIT_SIZE // 4)
+    doc, doc_stats = _stats(text + "end")
+    doc.delete(1, len(text) - 2)
+
+    assert doc_stats.counts.words == _words(doc.get()) == 2
+
+
+def test_random_edits():
+    rng = random.Random(0)
+    doc, doc_stats = _stats("")
+    for _ in range(500):
+        offset = rng.randint(0, len(doc))
+        if rng.random() < 0.4 and len(doc):
+            doc.delete(offset, rng.randint(1, 5))
+        else:
+            doc.insert(offset, "".join(rng.choice("ab \n") for _ in range(rng.randint(1, 4))))
+        assert doc_stats.counts.words == _words(doc.get())
+
+    assert doc_stats.counts == stats.Counts(len(doc.get().split("\n")), _words(doc.get()), len(doc))
+
+
+def test_recount__edits_while_running():
+    doc, doc_stats = _stats("")
+    doc.insert(0, "one two", notify=False)
+    doc_stats.invalidate()
+    assert doc_stats.counts.words is None
+    assert "counting" in doc_stats.counts.summary
+
+    doc_stats._recount = stats.Recount(piece_table.PieceTable("one two"))  # not started yet
+    doc.insert(7, " three")
+    assert doc_stats.recounting
+    assert not doc_stats.poll()
+
+    doc_stats._recount.start()
+    _wait(doc_stats)
+    assert doc_stats.counts.words == 3
+
+
+def test_recount__cancelled():
+    doc, doc_stats = _stats("a b c")
+    doc_stats.recount()
+    doc_stats.reset()
+
+    assert not doc_stats.recounting
+    assert doc_stats.counts.words == 0
+
+
+def test_selection():
+    doc, doc_stats = _stats("foo bar\nbaz qux\n")
+
+    assert doc_stats.selection(0, 7) == stats.Counts(1, 2, 7)
+    assert doc_stats.selection(0, 10) == stats.Counts(2, 3, 10)
+    assert doc_stats.selection(0, 5) == stats.Counts(1, 2, 5)
+    assert doc_stats.selection(2, 5) == stats.Counts(1, 2, 3)
+    assert doc_stats.selection(5, 5) == stats.Counts(1, 0, 0)
+    assert doc_stats.selection(0, len(doc)) == doc_stats.counts
+    assert doc_stats.selection(1, 14).summary == "2 lines, 4 words, 13 characters"
+
+
+def test_summary__singular():
+    assert stats.Counts(1, 1, 1).summary == "1 line, 1 word, 1 character"
+    assert stats.Counts(1, 0, 0).summary == "1 line, 0 words, 0 characters"
+    assert stats.Counts(1, None, 1_200).summary == "1 line, counting words, 1,200 characters"
+
+
+def test_selection__dragged():
+    rng = random.Random(1)
+    text = "".join(rng.choice("ab \n") for _ in range(300))
+    doc, doc_stats = _stats(text)
+
+    start, end = 100, 100
+    for _ in range(200):
+        if rng.random() < 0.5:
+            end = rng.randint(start, len(text) - 1)
+        else:
+            start = rng.randint(1, end)
+        assert doc_stats.selection(start, end).words == _words(text[start:end])
+
+    doc.insert(0, "x")
+    assert doc_stats.selection(start + 1, end + 1).words == _words(doc.get(start + 1, end + 1))
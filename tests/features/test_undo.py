@@ -0,0 +1,134 @@
+import pytest
+
+from notepad import document
+from notepad.features import undo
+
+
+@pytest.fixture()
+def doc():
+    return document.Document()
+
+
+@pytest.fixture()
+def history(doc):
+    history = undo.UndoHistory(doc)
+    doc.subscribe(history.record)
+    yield history
+    history.clear()
+
+
+def type_text(doc, offset, text):
+    for i, character in enumerate(text):
+        doc.insert(offset + i, character)
+
+
+def revert(doc, history):
+    record = history.undo()
+    with history.suspended():
+        doc.replace(record.offset, len(record.inserted), str(record.removed))
+    return record
+
+
+def reapply(doc, history):
+    record = history.redo()
+    with history.suspended():
+        doc.replace(record.offset, len(record.removed), str(record.inserted))
+    return record
+
+
+def test_keystrokes_merge_into_words(doc, history):
+    type_text(doc, 0, "hello world\nbye")
+
+    assert [str(record.inserted) for record in history._undo] == ["hello ", "world", "\n", "bye"]
+
+    revert(doc, history)
+    revert(doc, history)
+    assert doc.get() == "hello world"
+    reapply(doc, history)
+    assert doc.get() == "hello world\n"
+
+
+def test_deletes_merge(doc, history):
+    doc.insert(0, "one two three")
+    for offset in range(12, 7, -1):  # backspace "three"
+        doc.delete(offset, 1)
+    for _ in range(3):  # delete "two" forwards
+        doc.delete(4, 1)
+
+    assert [str(record.removed) for record in history._undo] == ["", "three", "two"]
+    revert(doc, history)
+    assert doc.get() == "one two "
+
+
+def test_typing_over_selection_is_one_step(doc, history):
+    doc.insert(0, "abc")
+    history.break_merge()
+    doc.delete(0, 3)
+    type_text(doc, 0, "xy")
+
+    assert len(history) == 2
+    revert(doc, history)
+    assert doc.get() == "abc"
+
+
+def test_break_merge(doc, history):
+    type_text(doc, 0, "ab")
+    history.break_merge()
+    type_text(doc, 2, "cd")
+
+    assert len(history) == 2
+
+
+def test_edit_clears_redo(doc, history):
+    doc.insert(0, "a")
+    revert(doc, history)
+    doc.insert(0, "b")
+
+    assert history.redo() is None
+
+
+def test_large_edit_is_referenced(monkeypatch, doc, history):
+    monkeypatch.setattr(document, "LARGE_EDIT_SIZE", 4)
+    doc.insert(0, "hello world")
+    doc.replace(0, 11, "HELLO WORLD")
+
+    record = history._undo[-1]
+    assert isinstance(record.removed, type(doc.text))
+    assert isinstance(record.inserted, type(doc.text))
+    assert record.size == 2 * undo.SLICE_BYTES
+
+    revert(doc, history)
+    assert doc.get() == "hello world"
+
+
+def test_history_spills_to_file(doc):
+    history = undo.UndoHistory(doc, max_bytes=200)
+    doc.subscribe(history.record)
+    for i in range(20):
+        history.break_merge()
+        doc.insert(len(doc), f"line {i}\n")
+
+    assert history._bytes <= 200
+    assert len(history._undo) < 20
+    assert len(history) == 20
+
+    while len(history):
+        revert(doc, history)
+    assert doc.get() == ""
+
+    while history._redo:
+        reapply(doc, history)
+    assert doc.get() == "".join(f"line {i}\n" for i in range(20))
+    history.clear()
+
+
+def test_spilled_history_is_capped(doc):
+    history = undo.UndoHistory(doc, max_bytes=100, max_spill_bytes=100)
+    doc.subscribe(history.record)
+    for i in range(50):
+        history.break_merge()
+        doc.insert(len(doc), "abcdefghij")
+
+    assert history._spill_bytes <= 100
+    assert len(history) < 50
+    history.clear()
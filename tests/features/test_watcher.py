@@ -0,0 +1,152 @@
+import codecs
+
+import pytest
+
+from notepad.features import watcher
+from tests.common import FakeRoot
+
+
+def _append(path, data: bytes):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_tail_appended(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"first\n")
+    tail = watcher.Tail(path, path.stat().st_size, "utf-8")
+    assert tail.read() == watcher.Change("unchanged")
+    assert not tail.changed()
+
+    _append(path, b"second\r\nthi")
+    assert tail.changed()
+    assert tail.read() == watcher.Change("appended", "second\nthi")
+    _append(path, b"rd \xe2\x82")  # a character split between writes
+    assert tail.read() == watcher.Change("appended", "rd ")
+    _append(path, b"\xac\n")
+    assert tail.read() == watcher.Change("appended", "€\n")
+    assert not tail.changed()
+
+
+def test_tail_reads_in_bounded_steps(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"")
+    tail = watcher.Tail(path, 0, "utf-8", read_size=4)
+
+    _append(path, b"abcdefghij")
+    assert tail.read() == watcher.Change("appended", "abcd", more=True)
+    assert tail.read() == watcher.Change("appended", "efgh", more=True)
+    assert tail.read() == watcher.Change("appended", "ij", more=False)
+
+
+def test_tail_truncated(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"a long first line\n")
+    tail = watcher.Tail(path, path.stat().st_size, "utf-8")
+
+    with open(path, "r+b") as f:  # truncated in place, like `> app.log`
+        f.truncate(0)
+        f.write(b"new\n")
+    assert tail.read() == watcher.Change("truncated", "new\n")
+    assert tail.offset == 4
+
+
+def test_tail_rotated_and_missing(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"old\n")
+    tail = watcher.Tail(path, path.stat().st_size, "utf-8")
+
+    path.rename(tmp_path / "app.log.1")
+    assert tail.read() == watcher.Change("missing")
+    path.write_bytes(b"rotated\n")
+    assert tail.read() == watcher.Change("rotated", "rotated\n")
+    assert tail.read() == watcher.Change("unchanged")
+
+
+def test_tail_keeps_byte_order(tmp_path):
+    path = tmp_path / "wide.txt"
+    path.write_bytes(codecs.BOM_UTF16_BE + "a\n".encode("utf-16-be"))
+    tail = watcher.Tail(path, path.stat().st_size, "utf-16")
+
+    _append(path, "b\n".encode("utf-16-be"))
+    assert tail.read() == watcher.Change("appended", "b\n")
+
+
+def test_stat_backend(tmp_path):
+    first, second = tmp_path / "first.log", tmp_path / "second.log"
+    first.write_text("1")
+    backend = watcher.StatBackend()
+    backend.add(first)
+    backend.add(second)
+    assert backend.changed() == set()
+
+    second.write_text("2")
+    assert backend.changed() == {second}
+    assert backend.changed() == set()
+
+    backend.remove(second)
+    second.write_text("22")
+    assert backend.changed() == set()
+
+
+@pytest.fixture
+def inotify():
+    try:
+        backend = watcher.InotifyBackend()
+    except (OSError, AttributeError):
+        pytest.skip("inotify is not available")
+    yield backend
+    backend.close()
+
+
+def test_inotify_backend(tmp_path, inotify):
+    first, second, other = tmp_path / "first.log", tmp_path / "second.log", tmp_path / "other"
+    first.write_text("1")
+    inotify.add(first)
+    inotify.add(second)
+    assert inotify.changed() == set()
+
+    _append(first, b"more")
+    other.write_text("not watched")
+    assert inotify.changed() == {first}
+
+    second.write_text("created")
+    first.rename(tmp_path / "first.log.1")
+    assert inotify.changed() == {first, second}
+
+    inotify.remove(first)
+    inotify.remove(second)
+    second.write_text("again")
+    assert inotify.changed() == set()
+
+
+def test_file_watcher_polls_without_inotify(tmp_path, monkeypatch):
+    def unavailable():
+        raise OSError("no inotify")
+
+    monkeypatch.setattr(watcher, "InotifyBackend", unavailable)
+    root = FakeRoot()
+    files_watcher = watcher.FileWatcher(root)
+    assert not files_watcher.uses_inotify
+
+    path = tmp_path / "app.log"
+    path.write_text("1")
+    calls = []
+    files_watcher.watch(path, calls.append)
+    files_watcher.watch(path, lambda changed: calls.append("second window"))
+    assert len(root.after_calls) == 1
+
+    root.run()
+    assert calls == []
+
+    path.write_text("22")
+    root.run()
+    assert calls == [path.resolve(), "second window"]
+
+    files_watcher.unwatch(path, calls.append)
+    path.write_text("333")
+    root.run()
+    assert calls == [path.resolve(), "second window", "second window"]
+
+    files_watcher.close()
+    assert root.after_calls == {}
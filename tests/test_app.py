@@ -1,14 +1,16 @@
 
+import tkinter as tk
+
 from notepad import app
-from notepad.features import themes
+from notepad.features import fonts, startup, themes
 from tests.common import my_notepad
 
 def test_properties(my_notepad):
     assert my_notepad._is_status_bar_visible
     assert my_notepad._wrap_words
     assert my_notepad._file is None
-    assert my_notepad.status_zoom ==  "100%"
-    assert my_notepad.status_encoding ==  "UTF-8"
+    assert my_notepad.status_zoom.get() == "100%"
+    assert my_notepad.status_encoding.get() == "UTF-8"
     assert my_notepad.theme.get() in themes.CUSTOM_THEME_PARAMS
 
 
@@ -26,5 +28,107 @@ def test_app_has_shortcuts():
     """
     raise NotImplementedError
 
-def test__collect_actions(my_notepad):
-    pass
\ No newline at end of file
+def test_actions(my_notepad):
+    assert "file_save" in my_notepad.actions
+    assert my_notepad.actions.get("file_save").label == "File: Save"
+
+def test_zoom(my_notepad):
+    my_notepad.action_view_zoom_in()
+    my_notepad.action_view_zoom_in()
+    assert my_notepad.status_zoom.get() == "120%"
+
+    my_notepad._helper_apply_zoom()
+    zoomed = my_notepad._text_area.cget("font")
+
+    my_notepad.action_view_restore_default_zoom()
+    my_notepad._helper_apply_zoom()
+    assert my_notepad.status_zoom.get() == "100%"
+    assert my_notepad._text_area.cget("font") != zoomed
+
+def test_wheel_zoom(my_notepad):
+    my_notepad._root.update()
+    my_notepad._text_area.event_generate("<Control-MouseWheel>", delta=120)
+    assert my_notepad._zoom > fonts.DEFAULT_ZOOM
+    assert my_notepad.status_zoom.get() == f"{my_notepad._zoom}%"
+
+def test_wheel_scrolls_large_file(my_notepad, tmp_path, monkeypatch):
+    monkeypatch.setattr(app.constants, "LARGE_FILE_THRESHOLD", 1)
+    path = tmp_path / "big.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)))
+    my_notepad._helper_open_file(path)
+    my_notepad._root.update()
+
+    my_notepad._text_area.event_generate("<MouseWheel>", delta=-120)
+    assert my_notepad._large_file_view.start > 0
+    my_notepad._helper_close_large_file()
+
+def test_large_file_go_to_last_page(my_notepad, tmp_path, monkeypatch):
+    monkeypatch.setattr(app.constants, "LARGE_FILE_THRESHOLD", 1)
+    path = tmp_path / "big.log"
+    text = "".join(f"line {i}\n" for i in range(1000))
+    path.write_text(text)
+    my_notepad._helper_open_file(path)
+
+    my_notepad._helper_show_large_file_line(text.index("line 995\n"))
+    assert my_notepad._text_area.get("insert linestart", "insert lineend") == "line 995"
+    my_notepad._helper_close_large_file()
+
+def test_long_lines_load_every_batch(my_notepad, tmp_path):
+    path = tmp_path / "long.txt"
+    text = "x" * 20_000 + "\n" + "".join(f"line {i}\n" for i in range(100_000))
+    path.write_text(text)
+    my_notepad._helper_open_file(path)
+    while my_notepad._load is not None:
+        my_notepad._root.update()
+
+    assert str(my_notepad._text_area.cget("state")) == "disabled"
+    assert my_notepad._text_area.get("end-2c linestart", "end-1c") == "line 99999\n"
+    assert my_notepad._document.get() == text
+
+def test_follow_change_before_scheduled_read(my_notepad, tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("start\n")
+    my_notepad._helper_open_file(path)
+    while my_notepad._load is not None:
+        my_notepad._root.update()
+    my_notepad._following.set(True)
+    my_notepad._tail.read_size = 4
+    with open(path, "a") as f:
+        f.write("appended\n")
+
+    my_notepad._helper_on_file_changed(path)
+    first = my_notepad._follow_job
+    my_notepad._helper_on_file_changed(path)
+    pending = my_notepad._root.tk.splitlist(my_notepad._root.tk.call("after", "info"))
+    assert first not in pending and my_notepad._follow_job in pending
+    my_notepad._helper_unwatch()
+
+def test_startup_profile_first_paint(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(app.constants, "RECOVERY_DIR", tmp_path / "recovery")
+    monkeypatch.setattr(startup, "_profile", None)
+    startup.enable()
+    n = app.Notepad(root=tk.Tk())
+    try:
+        n._root.update()
+        assert "first paint" in capsys.readouterr().out
+    finally:
+        n._helper_discard_journal()
+        n._manager.watcher.close()
+        n._root.destroy()
+
+def test_stats(my_notepad):
+    my_notepad._text_area.insert("1.0", "foo bar\nbaz")
+    my_notepad._helper_update_stats()
+    assert my_notepad.status_stats.get() == "2 lines, 3 words, 11 characters"
+
+    my_notepad._text_area.tag_add("sel", "1.0", "1.3")
+    my_notepad._helper_update_stats()
+    assert my_notepad.status_stats.get() == "1 line, 1 word, 3 characters selected"
+
+def test_text_errors_reach_tcl(my_notepad):
+    widget = my_notepad._text_area._w
+    assert my_notepad._text_area.tk.eval(f"catch {{{widget} get sel.first sel.last}}") == "1"
+    assert my_notepad._text_area.tk.eval(f"catch {{{widget} delete sel.first sel.last}}") == "1"
+
+    my_notepad._text_area.insert("1.0", "abc")
+    assert my_notepad._document.get() == "abc"
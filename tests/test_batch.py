@@ -0,0 +1,217 @@
+import gzip
+import lzma
+import subprocess
+import sys
+
+import pytest
+
+from notepad import batch
+
+
+def test_process__replace(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(b"foo bar\r\nFOO\r\n")
+
+    result = batch.process(str(path), batch.Options(find="foo", replace="baz"))
+
+    assert result.error is None
+    assert result.changed
+    assert result.matches == 2
+    assert result.bytes_read == 14
+    assert path.read_bytes() == b"baz bar\r\nbaz\r\n"
+
+
+def test_process__regex_groups(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("a=1\nb=2\n")
+
+    batch.process(str(path), batch.Options(find=r"^(\w)=(\d)$", replace=r"\2=\1", regex=True))
+    assert path.read_text() == "1=a\n2=b\n"
+
+
+def test_process__find_only(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("foo foo\nfoo\n")
+    before = path.stat().st_mtime_ns
+
+    result = batch.process(str(path), batch.Options(find="foo"))
+    assert result.matches == 3
+    assert not result.changed
+    assert path.stat().st_mtime_ns == before
+
+
+def test_process__unchanged_is_not_rewritten(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("nothing to strip\n")
+    inode = path.stat().st_ino
+
+    result = batch.process(str(path), batch.Options(strip_trailing_whitespace=True))
+    assert not result.changed
+    assert path.stat().st_ino == inode
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_process__strip_trailing_whitespace(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(b"a  \r\nb\t\nc \n  d  ")
+
+    result = batch.process(str(path), batch.Options(strip_trailing_whitespace=True, chunk_size=2))
+    assert result.stripped == 4
+    assert path.read_bytes() == b"a\r\nb\nc\n  d"
+
+
+@pytest.mark.parametrize("newline, expected", [("lf", b"a\nb\nc\n"), ("crlf", b"a\r\nb\r\nc\r\n"), ("cr", b"a\rb\rc\r")])
+def test_process__newline(tmp_path, newline, expected):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(b"a\r\nb\nc\r")
+
+    result = batch.process(str(path), batch.Options(newline=newline, chunk_size=1))
+    assert result.changed
+    assert path.read_bytes() == expected
+
+
+def test_process__newline_already_normalized(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(b"a\r\nb\r\n")
+
+    assert not batch.process(str(path), batch.Options(newline="crlf")).changed
+
+
+def test_process__encoding(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes("café\n".encode("cp1252"))
+
+    result = batch.process(str(path), batch.Options(encoding="utf-8"))
+    assert result.changed
+    assert path.read_bytes() == "café\n".encode("utf-8")
+
+
+def test_process__gzip(tmp_path):
+    path = tmp_path / "app.log.gz"
+    path.write_bytes(gzip.compress(b"error  \n" * 1000))
+
+    result = batch.process(str(path), batch.Options(find="error", replace="warning", strip_trailing_whitespace=True))
+    assert result.matches == 1000
+    assert result.bytes_read == 8000
+    assert gzip.decompress(path.read_bytes()) == b"warning\n" * 1000
+
+
+def test_process__check(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("foo\n")
+
+    result = batch.process(str(path), batch.Options(find="foo", replace="bar", check=True))
+    assert result.changed
+    assert path.read_text() == "foo\n"
+
+
+def test_process__binary_and_errors(tmp_path):
+    binary = tmp_path / "foo.bin"
+    binary.write_bytes(b"\x00\x01\x02")
+    assert batch.process(str(binary), batch.Options()).skipped == "binary"
+
+    result = batch.process(str(tmp_path / "missing.txt"), batch.Options())
+    assert result.error
+
+
+@pytest.mark.parametrize(
+    "name, data",
+    [
+        ("a.xz", lzma.compress(b"text\n" * 100)[:-20] + b"\0" * 20),  # LZMAError
+        ("b.gz", gzip.compress(b"text\n" * 100)[:10] + b"\xff" * 40),  # zlib.error
+        ("c.gz", gzip.compress(b"text\n" * 100)[:-10]),  # EOFError
+    ],
+)
+def test_process__corrupt_compressed(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+
+    result = batch.process(str(path), batch.Options(strip_trailing_whitespace=True))
+    assert result.error
+    assert path.read_bytes() == data
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_iter_files(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "a.txt").write_text("")
+    (tmp_path / "b.py").write_text("")
+    (tmp_path / "sub" / "c.txt").write_text("")
+    (tmp_path / ".git" / "d.txt").write_text("")
+
+    files = list(batch.iter_files([str(tmp_path)], "*.txt"))
+    assert files == [str(tmp_path / "a.txt"), str(tmp_path / "sub" / "c.txt")]
+    assert list(batch.iter_files([str(tmp_path / "b.py")], "*.txt")) == [str(tmp_path / "b.py")]
+
+
+def test_run__pool(tmp_path):
+    paths = []
+    for i in range(8):
+        path = tmp_path / f"{i}.txt"
+        path.write_text(f"{i} \n")
+        paths.append(str(path))
+
+    results = list(batch.run(paths, batch.Options(strip_trailing_whitespace=True), jobs=2))
+    assert [result.path for result in results] == paths
+    assert all(result.changed for result in results)
+    assert (tmp_path / "3.txt").read_text() == "3\n"
+
+
+def test_main(tmp_path, capsys):
+    (tmp_path / "a.txt").write_text("foo\n")
+    (tmp_path / "b.txt").write_text("bar\n")
+
+    assert batch.main(["--find", "foo", "--replace", "baz", "--check", "--jobs", "1", str(tmp_path)]) == 1
+    assert (tmp_path / "a.txt").read_text() == "foo\n"
+    out = capsys.readouterr().out
+    assert "would change" in out
+    assert "2 files, 1 changed, 0 skipped, 0 errors" in out
+
+    assert batch.main(["--find", "foo", "--replace", "baz", "--quiet", str(tmp_path)]) == 0
+    assert (tmp_path / "a.txt").read_text() == "baz\n"
+    assert batch.main([str(tmp_path / "missing.txt")]) == 2
+
+
+def test_main__invalid_arguments(tmp_path):
+    with pytest.raises(SystemExit):
+        batch.main(["--replace", "x", str(tmp_path)])
+    with pytest.raises(SystemExit):
+        batch.main(["--find", "(", "--regex", str(tmp_path)])
+    with pytest.raises(SystemExit):
+        batch.main(["--encoding", "nope", str(tmp_path)])
+
+
+def test_batch_never_imports_tkinter(tmp_path):
+    (tmp_path / "a.txt").write_text("foo  \n")
+    code = (
+        "import runpy, sys\n"
+        f"sys.argv = ['notepad', 'batch', '--strip-trailing-whitespace', {str(tmp_path)!r}]\n"
+        "try:\n"
+        "    runpy.run_module('notepad', run_name='__main__')\n"
+        "except SystemExit as e:\n"
+        "    assert e.code == 0, e.code\n"
+        "assert 'tkinter' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+    assert (tmp_path / "a.txt").read_text() == "foo\n"
+
+
+def test_process__find_only_never_writes(tmp_path, monkeypatch):
+    path = tmp_path / "foo.txt"
+    path.write_text("foo\n")
+
+    def save(*args, **kwargs):
+        raise PermissionError("read only")
+
+    monkeypatch.setattr(batch.saver, "save", save)
+    result = batch.process(str(path), batch.Options(find="foo"))
+
+    assert result.error is None
+    assert result.matches == 1
+
+
+def test_options_edits():
+    assert not batch.Options(find="foo").edits
+    assert batch.Options(find="foo", replace="").edits
+    assert batch.Options(newline="lf").edits
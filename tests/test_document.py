@@ -0,0 +1,81 @@
+from notepad import document
+
+
+def test_document_edits_notify():
+    doc = document.Document("hello\nworld")
+    edits = []
+    doc.subscribe(edits.append)
+
+    doc.insert(5, "!")
+    doc.delete(0, 1)
+    doc.replace(0, 4, "J")
+    doc.insert(0, "")
+
+    assert doc.get() == "J!\nworld"
+    assert edits == [
+        document.Edit(5, "", "!"),
+        document.Edit(0, "h", ""),
+        document.Edit(0, "ello", "J"),
+    ]
+
+    doc.unsubscribe(edits.append)
+    doc.insert(0, "x", notify=True)
+    assert len(edits) == 3
+
+
+def test_document_indexes():
+    doc = document.Document("ab\ncde\n")
+
+    assert doc.offset(1, 0) == 0
+    assert doc.offset(1, 100) == 2
+    assert doc.offset(2, 1) == 4
+    assert doc.offset(3, 0) == 7
+    assert doc.offset(10, 0) == len(doc)
+    assert doc.index(4) == "2.1"
+
+    doc.insert(1, "\n")
+    assert doc.offset(3, 0) == 4
+    assert doc.index(len(doc)) == "4.0"
+
+
+def test_iter_blocks():
+    text = "".join(f"line {i}\n" for i in range(100))
+    doc = document.Document(text)
+
+    blocks = list(doc.iter_blocks(block_size=50))
+    assert "".join(block for _, block in blocks) == text
+    assert all(block.endswith("\n") for _, block in blocks)
+    assert [offset for offset, _ in blocks][:2] == [0, len(blocks[0][1])]
+    assert "".join(block for _, block in doc.iter_blocks(10, 30, block_size=7)) == text[10:30]
+
+
+def test_line():
+    doc = document.Document("ab\ncd\n")
+    assert [doc.line(line) for line in range(3)] == ["ab", "cd", ""]
+
+
+def test_large_removal_is_referenced(monkeypatch):
+    monkeypatch.setattr(document, "LARGE_EDIT_SIZE", 4)
+    doc = document.Document("hello\nworld")
+    edits = []
+    doc.subscribe(edits.append)
+
+    doc.replace(2, 6, "y")
+    doc.delete(0, 2)
+
+    assert doc.get() == "yrld"
+    assert str(edits[0].removed) == "llo\nwo"
+    assert edits[0].removed.count("\n") == 1
+    assert edits[1].removed == "he"
+
+
+def test_snapshot():
+    doc = document.Document("ab\ncd")
+    snapshot = doc.snapshot()
+    doc.insert(0, "x\n")
+    doc.delete(len(doc) - 1, 1)
+
+    assert snapshot.get() == "ab\ncd"
+    assert snapshot.index(4) == "2.1"
+    assert doc.index(4) == "2.2"
+    assert doc.get() == "x\nab\nc"
@@ -0,0 +1,37 @@
+import pytest
+
+from notepad import manager
+from tests.common import my_notepad
+
+
+@pytest.fixture()
+def window_manager():
+    m = manager.WindowManager()
+    yield m
+    if m.windows:
+        m.root.destroy()
+
+
+def test_windows_share_one_root(window_manager):
+    first = window_manager.open_window()
+    second = window_manager.open_window()
+
+    assert len(window_manager.windows) == 2
+    assert first._root.winfo_toplevel() is not second._root.winfo_toplevel()
+    assert first._manager is second._manager
+    assert first.theme is second.theme
+    assert window_manager.window_for(second._text_area) is second
+
+
+def test_close_window(window_manager):
+    first = window_manager.open_window()
+    second = window_manager.open_window()
+
+    window_manager.close_window(first)
+    assert list(window_manager.windows.values()) == [second]
+    assert window_manager.root.winfo_exists()
+
+
+def test_standalone_notepad_adopts_root(my_notepad):
+    assert my_notepad._manager.root is my_notepad._root
+    assert my_notepad._manager.window_for(my_notepad._text_area) is my_notepad
@@ -1,18 +1,14 @@
-from unittest import mock
 import tkinter as tk
 import pytest
 
 from notepad import menu
-from notepad.features import shortcuts
+from notepad.features import actions, keymap, shortcuts
 from tests.common import my_notepad
 
 
 @pytest.fixture()
 def my_notepad_with_bindings(my_notepad):
-    def mocked_collect_actions():
-        return {}
-
-    my_notepad._collect_actions = mocked_collect_actions
+    my_notepad.actions = actions.Registry()
 
     my_binding = tk.BooleanVar() 
 
@@ -21,13 +17,13 @@ def my_notepad_with_bindings(my_notepad):
     yield my_notepad
 
 
-@mock.patch("notepad.features.shortcuts.SHORTCUTS", {})
 def test_menu_option_simple(my_notepad_with_bindings):
+    my_notepad_with_bindings._manager.keymap = keymap.Keymap({})
     mo = menu.MenuOption("foo", "baz", my_notepad_with_bindings)
 
     assert mo.menu_label == "foo"
     assert mo.option_label == "baz"
-    assert mo.actions == {}
+    assert len(mo.actions) == 0
     assert mo.lookup_key == "foo_baz"
     assert mo.command == mo.action_not_implemented
     assert mo._default_args.get("label") == "baz"
@@ -44,10 +40,8 @@ def test_menu_option_simple(my_notepad_with_bindings):
     mo.action_not_implemented()
 
 
-@mock.patch(
-    "notepad.features.shortcuts.SHORTCUTS", {"foo_shortcut": shortcuts.Shortcut("ctrl", "f")}
-)
 def test_menu_option_with_shortcut(my_notepad_with_bindings):
+    my_notepad_with_bindings._manager.keymap = keymap.Keymap({"foo_shortcut": shortcuts.Shortcut("ctrl", "f")})
     mo = menu.MenuOption("foo", "shortcut", my_notepad_with_bindings)
 
     assert mo.has_shortcut is True
@@ -58,8 +52,8 @@ def test_menu_option_with_shortcut(my_notepad_with_bindings):
     assert mo.widget_function == "add_command"
 
 
-@mock.patch("notepad.features.shortcuts.SHORTCUTS", {})
 def test_menu_option_with_variable_binding(my_notepad_with_bindings):
+    my_notepad_with_bindings._manager.keymap = keymap.Keymap({})
     mo = menu.MenuOption("foo", "variable binding", my_notepad_with_bindings)
 
     assert mo.lookup_key == "foo_variable_binding"
@@ -69,3 +63,10 @@ def test_menu_option_with_variable_binding(my_notepad_with_bindings):
     assert mo.args.get("onvalue") is True
     assert mo.args.get("offvalue") is False
     assert mo.widget_function == "add_checkbutton"
+
+
+def test_menu_option_with_chord(my_notepad_with_bindings):
+    my_notepad_with_bindings._manager.keymap = keymap.Keymap({"foo_chord": shortcuts.parse("ctrl+k ctrl+c")})
+    mo = menu.MenuOption("foo", "chord", my_notepad_with_bindings)
+
+    assert mo.args.get("accelerator") == "Ctrl+K Ctrl+C"
@@ -3,6 +3,7 @@ from notepad import window, constants
 def test_get_title():
     assert window.get_title("foo") == f"foo - {constants.APP_NAME}"
     assert window.get_title() == f"{constants.DEFAULT_UNNAMED_TITLE} - {constants.APP_NAME}"
+    assert window.get_title("foo", dirty=True) == f"*foo - {constants.APP_NAME}"
 
 def test_window_dimension():
     w = window.WindowDimension(height=50, width=100)